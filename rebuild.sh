@@ -1,2 +1,2 @@
 #!/bin/zsh
-pyinstaller --onefile --windowed --icon=src/sensorIcon.icns --noconfirm --name OpenOBS-PyGUI src/main.py
\ No newline at end of file
+pyinstaller --onefile --windowed --icon=src/sensorIcon.icns --noconfirm --collect-submodules plots --collect-submodules calibrators --name OpenOBS-PyGUI src/main.py
\ No newline at end of file
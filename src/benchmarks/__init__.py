@@ -0,0 +1 @@
+"""Benchmarks of the acquisition and rendering hot paths. See __main__.py."""
@@ -0,0 +1,110 @@
+"""Runs the benchmarks and writes the results as JSON.
+
+    python -m benchmarks [--quick] [--only GROUP ...] [--output FILE]
+                         [--compare BASELINE] [--threshold RATIO]
+
+Run from the src directory. With --compare, each result is matched by id to
+the baseline file and the exit status is 1 if any got slower by more than
+the threshold ratio.
+"""
+
+import argparse
+import datetime
+import importlib
+import json
+import platform
+import subprocess
+import sys
+
+import matplotlib
+
+matplotlib.use("Agg")  # Before any plot module is imported
+
+GROUPS = ["protocol", "pipeline", "plots", "serial_link", "startup"]
+
+
+def _metadata() -> dict:
+    import numpy as np
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def _slowdown(new: dict, old: dict):
+    """Ratio of new to old cost, above 1 when slower, or None if not comparable."""
+    if "seconds" in new and "seconds" in old:
+        return new["seconds"]["median"] / old["seconds"]["median"]
+    if "items_per_second" in new and "items_per_second" in old:
+        return old["items_per_second"] / new["items_per_second"]
+    return None
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> list[str]:
+    """Prints the change of every result in the baseline and returns the
+    ids of those that regressed."""
+    old = {entry["id"]: entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        if entry["id"] not in old:
+            continue
+        ratio = _slowdown(entry, old[entry["id"]])
+        if ratio is None:
+            continue
+        flag = ""
+        if ratio > threshold:
+            regressions.append(entry["id"])
+            flag = "  REGRESSION"
+        print(f"{ratio:6.2f}x  {entry['id']}{flag}", file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the OpenOBS hot paths.")
+    parser.add_argument("--quick", action="store_true", help="fewer, shorter cases")
+    parser.add_argument("--only", nargs="+", choices=GROUPS, default=GROUPS)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--compare", help="JSON from an earlier run to compare to")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    results = []
+    for group in args.only:
+        print(f"Running {group}...", file=sys.stderr)
+        module = importlib.import_module(f"benchmarks.{group}")
+        results += module.run(quick=args.quick)
+
+    report = {"metadata": _metadata(), "results": results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmarks regressed.", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import time
+
+import numpy as np
+
+
+def repeat(fn, min_time: float = 0.2, min_rounds: int = 5, max_rounds: int = 1000):
+    """Seconds taken by each call of `fn`, calling it for at least `min_time`."""
+    fn()  # Warm up caches and lazy setup
+    times = []
+    start = time.perf_counter()
+    while len(times) < max_rounds and (
+        len(times) < min_rounds or time.perf_counter() - start < min_time
+    ):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def summarize(seconds) -> dict:
+    seconds = np.asarray(seconds, dtype=float)
+    return {
+        "min": float(seconds.min()),
+        "median": float(np.median(seconds)),
+        "mean": float(seconds.mean()),
+        "p95": float(np.percentile(seconds, 95)),
+        "max": float(seconds.max()),
+    }
+
+
+def entry(group: str, name: str, params: dict = None) -> dict:
+    """The fields identifying a benchmark; `id` is unique within a run."""
+    params = params or {}
+    label = ",".join(f"{k}={v}" for k, v in params.items())
+    return {
+        "id": f"{group}.{name}" + (f"[{label}]" if label else ""),
+        "group": group,
+        "name": name,
+        "params": params,
+    }
+
+
+def result(group: str, name: str, seconds, params: dict = None, items: int = None):
+    """A benchmark result. `seconds` holds one timing per round; when each
+    round processes `items` items, their throughput is included too."""
+    fields = entry(group, name, params)
+    fields["rounds"] = len(seconds)
+    fields["seconds"] = summarize(seconds)
+    if items:
+        fields["items_per_round"] = items
+        fields["items_per_second"] = items / fields["seconds"]["median"]
+    return fields
+
+
+def skipped(group: str, name: str, reason: str, params: dict = None):
+    fields = entry(group, name, params)
+    fields["skipped"] = reason
+    return fields
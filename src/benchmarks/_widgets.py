@@ -0,0 +1,99 @@
+"""Stand-ins for the Tk widgets and variables the plots create.
+
+Plots and calibrators build their controls in their constructors, which
+needs a display. Installing these in their modules lets them be built on any
+machine; only the calls the plots make are implemented, and the benchmarks
+then drive the plots through the variables and the listbox selection.
+"""
+
+import types
+from tkinter import constants
+
+
+class Var:
+    def __init__(self, master=None, value=None, name=None):
+        self._value = "" if value is None else value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+    def trace_add(self, *args):
+        pass
+
+
+class Widget:
+    """Accepts any widget method and does nothing."""
+
+    def __init__(self, *args, **kwargs):
+        self._items = {}
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+    def __getitem__(self, key):
+        return self._items.setdefault(key, Widget())
+
+    def __setitem__(self, key, value):
+        self._items[key] = value
+
+
+class Listbox(Widget):
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.items = []
+        self.selection = ()
+
+    def insert(self, index, *items):
+        self.items.extend(items)
+
+    def delete(self, first, last=None):
+        self.items.clear()
+        self.selection = ()
+
+    def curselection(self):
+        return self.selection
+
+    def selection_clear(self, first, last=None):
+        self.selection = ()
+
+
+class _Module(types.SimpleNamespace):
+    def __getattr__(self, name):
+        return Widget  # Any widget class not listed
+
+
+def _show_error(title, message, **kwargs):
+    raise RuntimeError(f"{title}: {message}")
+
+
+tk = _Module(
+    StringVar=Var,
+    IntVar=Var,
+    DoubleVar=Var,
+    BooleanVar=Var,
+    Listbox=Listbox,
+    **{name: getattr(constants, name) for name in dir(constants) if name.isupper()},
+)
+ttk = _Module()
+messagebox = types.SimpleNamespace(
+    showerror=_show_error, showwarning=_show_error, showinfo=lambda *a, **k: None
+)
+filedialog = types.SimpleNamespace(
+    asksaveasfilename=lambda **kwargs: "", askopenfilename=lambda **kwargs: ""
+)
+
+
+def install(*modules):
+    """Replaces the tkinter names used by each module with the stand-ins."""
+    for module in modules:
+        for name, stand_in in (
+            ("tk", tk),
+            ("ttk", ttk),
+            ("messagebox", messagebox),
+            ("filedialog", filedialog),
+        ):
+            if hasattr(module, name):
+                setattr(module, name, stand_in)
@@ -0,0 +1,64 @@
+"""Parsing data sentences and draining the queue into the data buffer, as
+the reader thread and process_data_queue do."""
+
+import numpy as np
+
+from calibrators.derived_channels import DerivedChannel, DerivedChannels
+from util.batch_queue import BatchQueue
+from util.data_generator import DataGenerator
+from util.data_parser import DataParser
+from util.ring_buffer import RingBuffer
+
+from ._timing import repeat, result
+
+GROUP = "pipeline"
+DRAIN_CHUNK_ROWS = 2000  # As in main.py
+
+
+def run(quick: bool = False) -> list[dict]:
+    min_time = 0.1 if quick else 0.5
+    n = 5000 if quick else 20000
+    results = []
+    for sensor in ("VCNL4010", "AS7265X"):
+        generator = DataGenerator(sensor, seed=0, start_time=1.7e9)
+        payloads = [line[5:] for line in generator.lines(n)]
+        parser = DataParser(generator.headers)
+
+        # Rows per parse call range from a slow trickle to a large backlog.
+        for rows_per_read in (1, 100, 5000):
+            reads = [
+                payloads[i : i + rows_per_read]
+                for i in range(0, len(payloads), rows_per_read)
+            ]
+            times = repeat(lambda: [parser.parse(read) for read in reads], min_time)
+            params = {"sensor": sensor, "rows_per_read": rows_per_read}
+            results.append(result(GROUP, "parse", times, params, n))
+
+        # The reader adding one calibrated column to each block it queues,
+        # then the drain loop of process_data_queue
+        block, _ = parser.parse(payloads)
+        derived = DerivedChannels()
+        source = generator.headers[2]
+        derived.channels = [
+            DerivedChannel("cal", source, "linear", {"coefficients": [0.5, 1.0]})
+        ]
+        names = derived.bind(generator.headers)
+        buffer = RingBuffer(generator.headers + names, capacity=50000)
+        data_queue = BatchQueue(max_rows=2 * n)
+        for rows_per_block in (10, 1000):
+            blocks = np.array_split(block, max(1, n // rows_per_block))
+
+            def drain():
+                for b in blocks:
+                    data_queue.put(derived.apply(b))
+                while True:
+                    taken = data_queue.get_all(DRAIN_CHUNK_ROWS)
+                    if not taken:
+                        break
+                    merged = taken[0] if len(taken) == 1 else np.concatenate(taken)
+                    buffer.append(merged)
+
+            times = repeat(drain, min_time)
+            params = {"sensor": sensor, "rows_per_block": rows_per_block}
+            results.append(result(GROUP, "drain", times, params, n))
+    return results
@@ -0,0 +1,125 @@
+"""Per-frame latency of the plots and calibrators, drawn with Agg.
+
+Each frame appends the rows that arrive between frames at 100 Hz and 10
+frames per second, then times `update` and, if it marked the view dirty,
+`render`. Agg has no window, so a blit only costs the drawing into the
+canvas and not the copy to the screen.
+"""
+
+import time
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import calibrators.single_variable_linear
+import plots.real_time_spectrum_plot
+import plots.scatter_plot
+import plots.time_series_plot
+from calibrators.single_variable_linear import SingleVariableLinear
+from plots.real_time_spectrum_plot import RealTimeSpectrumPlot
+from plots.scatter_plot import ScatterPlot
+from plots.time_series_plot import TimeSeriesPlot
+from util.data_generator import DataGenerator
+from util.ring_buffer import RingBuffer
+
+from . import _widgets
+from ._timing import result
+
+GROUP = "plots"
+ROWS_PER_FRAME = 10
+FIGURE_SIZE = (8, 4)  # Inches at 100 dpi, about the size of the plot tab
+
+_widgets.install(
+    plots.time_series_plot,
+    plots.scatter_plot,
+    plots.real_time_spectrum_plot,
+    calibrators.single_variable_linear,
+)
+
+
+def _make_view(view_class, sensor: str, window: int):
+    """A plot or calibrator on an Agg canvas over a buffer of `window` samples."""
+    generator = DataGenerator(sensor, seed=0, start_time=1.7e9)
+    data = RingBuffer(generator.headers, capacity=window + 1000)
+    data.append(generator.block(window))
+    fig = Figure(figsize=FIGURE_SIZE, dpi=100)
+    ax = fig.add_subplot()
+    canvas = FigureCanvasAgg(fig)
+    view = view_class(canvas, fig, ax, _widgets.Widget(), data)
+    canvas.draw()
+    return view, generator
+
+
+def _time_frames(view, generator, n_frames: int) -> dict:
+    blocks = [generator.block(ROWS_PER_FRAME) for _ in range(n_frames + 3)]
+    timings = {"update": [], "render": [], "frame": []}
+    for i, block in enumerate(blocks):
+        view.data.append(block)
+        t0 = time.perf_counter()
+        view.update()
+        t1 = time.perf_counter()
+        if view.dirty:
+            view.render()
+        t2 = time.perf_counter()
+        if i >= 3:  # The first frames redraw everything once
+            timings["update"].append(t1 - t0)
+            timings["render"].append(t2 - t1)
+            timings["frame"].append(t2 - t0)
+    return timings
+
+
+def _results(name: str, params: dict, timings: dict) -> list[dict]:
+    return [result(GROUP, f"{name}.{stage}", times, params) for stage, times in timings.items()]
+
+
+def run(quick: bool = False) -> list[dict]:
+    n_frames = 10 if quick else 50
+    windows = (1000, 10000) if quick else (1000, 10000, 100000)
+    results = []
+
+    for window in windows:
+        for channels in (1, 4) if quick else (1, 4, 16):
+            for decimation in ("Min/Max", "LTTB", "Off"):
+                view, generator = _make_view(TimeSeriesPlot, "AS7265X", window)
+                view.num_samples_var.set(str(window))
+                view._get_num_samples()
+                view.decimation_var.set(decimation)
+                view.update()  # Fills the column list
+                view.time_series_listbox.selection = tuple(range(2, 2 + channels))
+                params = {"window": window, "channels": channels, "decimation": decimation}
+                results += _results("TimeSeriesPlot", params, _time_frames(view, generator, n_frames))
+
+        for colour in ("None", "Density"):
+            view, generator = _make_view(ScatterPlot, "AS7265X", window)
+            view.num_samples_var.set(str(window))
+            view._get_num_samples()
+            view.update()  # Fills the variable choices
+            view.x_var.set("A410")
+            view.y_var.set("B410")
+            view.color_mode_var.set(colour)
+            params = {"window": window, "colour": colour}
+            results += _results("ScatterPlot", params, _time_frames(view, generator, n_frames))
+
+    for spectra in (1, 10, 50):
+        view, generator = _make_view(RealTimeSpectrumPlot, "AS7265X", 1000)
+        view.num_spectra_var.set(str(spectra))
+        view._get_num_spectra()
+        params = {"spectra": spectra}
+        results += _results("RealTimeSpectrumPlot", params, _time_frames(view, generator, n_frames))
+
+    for standards in (1, 10):
+        view, generator = _make_view(SingleVariableLinear, "VCNL4010", 1000)
+        view.update()  # Fills the variable choices
+        view.var_name.set("backscatter")
+        for standard in range(standards):
+            view.calibration_target.set(str(standard))
+            view._toggle_recording()
+            view.data.append(generator.block(100))
+            view.update()
+            if standard < standards - 1:
+                view._toggle_recording()
+        if standards > 1:
+            view._fit_lm()
+        params = {"standards": standards}
+        results += _results("SingleVariableLinear", params, _time_frames(view, generator, n_frames))
+    return results
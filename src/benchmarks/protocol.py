@@ -0,0 +1,76 @@
+"""Checksums, sentence extraction and framing of the serial stream."""
+
+from util.data_generator import DataGenerator
+from util.line_framer import LineFramer
+from util.serial_comm import SerialCommunicator
+from util.xor_checksum import calculate_checksum, validate_checksum
+
+from ._timing import repeat, result
+
+GROUP = "protocol"
+START_TIME = 1.7e9  # Fixed clock so every run sends the same bytes
+
+
+def _messages(sensor: str, n: int, framed: bool) -> list[str]:
+    generator = DataGenerator(sensor, rate_hz=100, seed=0, start_time=START_TIME)
+    return generator.messages(n) if framed else generator.lines(n)
+
+
+def _communicator(sensor: str) -> SerialCommunicator:
+    com = SerialCommunicator(lambda *args: None, lambda: None)
+    generator = DataGenerator(sensor, seed=0)
+    com.handle_message(generator.headers_sentence())
+    com.control_queue.get()
+    return com
+
+
+def run(quick: bool = False) -> list[dict]:
+    n = 2000 if quick else 10000
+    min_time = 0.1 if quick else 0.5
+    results = []
+    for sensor in ("VCNL4010", "AS7265X"):
+        framed = _messages(sensor, n, framed=True)
+        plain = _messages(sensor, n, framed=False)
+        sentences = [m[1 : m.rindex("*")] for m in framed]
+        params = {"sensor": sensor}
+
+        times = repeat(lambda: [calculate_checksum(s) for s in sentences], min_time)
+        results.append(result(GROUP, "calculate_checksum", times, params, n))
+        times = repeat(lambda: [validate_checksum(m) for m in framed], min_time)
+        results.append(result(GROUP, "validate_checksum", times, params, n))
+
+        com = _communicator(sensor)
+        for label, messages in (("framed", framed), ("plain", plain)):
+            times = repeat(lambda: [com.get_sentence(m) for m in messages], min_time)
+            results.append(
+                result(GROUP, "get_sentence", times, {**params, "format": label}, n)
+            )
+
+        # The reader thread's work per read, without the port itself
+        stream = "".join(m + "\r\n" for m in plain).encode("ascii")
+        for chunk in (64, 4096):
+            chunks = [stream[i : i + chunk] for i in range(0, len(stream), chunk)]
+
+            def frame():
+                framer = LineFramer()
+                for data in chunks:
+                    framer.feed(data)
+
+            def read_loop():
+                framer = LineFramer()
+                for data in chunks:
+                    payloads = []
+                    for message in framer.feed(data):
+                        payload = com.handle_message(message)
+                        if payload is not None:
+                            payloads.append(payload)
+                    if payloads:
+                        com.queue_data(payloads)
+                com.data_queue.clear()
+
+            chunk_params = {**params, "read_bytes": chunk}
+            times = repeat(frame, min_time)
+            results.append(result(GROUP, "line_framer", times, chunk_params, n))
+            times = repeat(read_loop, min_time)
+            results.append(result(GROUP, "read_loop", times, chunk_params, n))
+    return results
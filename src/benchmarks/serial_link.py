@@ -0,0 +1,62 @@
+"""The whole reader path, from bytes on a pty to parsed blocks on the queue."""
+
+import os
+import time
+
+from util.serial_comm import SerialCommunicator
+
+from ._timing import entry, skipped
+
+GROUP = "serial"
+HANDSHAKE_TIMEOUT = 5.0
+
+
+def _stream(sensor: str, rate_hz: float, baudrate: int, seconds: float) -> dict:
+    from util.device_emulator import DeviceEmulator
+
+    emulator = DeviceEmulator(sensor=sensor, rate_hz=rate_hz, baudrate=baudrate, seed=0)
+    com = SerialCommunicator(lambda *args: None, lambda: None)
+    com.open_connection(emulator.start(), baudrate=baudrate)
+    try:
+        deadline = time.perf_counter() + HANDSHAKE_TIMEOUT
+        while not emulator.streaming:
+            if time.perf_counter() > deadline:
+                raise TimeoutError("Emulator did not finish the handshake.")
+            while not com.control_queue.empty():
+                command = com.control_queue.get().split(",", 1)[0]
+                if command == "OPENOBS":
+                    com.send_serial_message("OPENOBS")
+                elif command == "SENSOR":
+                    com.send_serial_message("SET,0,1,0")
+            time.sleep(0.01)
+
+        rows = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            rows += sum(len(block) for block in com.data_queue.get_all())
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - start
+    finally:
+        com.close_connection()
+        emulator.stop()
+    return {
+        "rows_per_second": rows / elapsed,
+        "bytes_per_second": emulator.bytes_sent / elapsed,
+        "samples_dropped_by_device": emulator.samples_dropped,
+    }
+
+
+def run(quick: bool = False) -> list[dict]:
+    seconds = 1.0 if quick else 3.0
+    results = []
+    for sensor, rate_hz in (("VCNL4010", 20000), ("AS7265X", 2000)):
+        params = {"sensor": sensor, "rate_hz": rate_hz, "baudrate": 10000000}
+        name = "emulator_throughput"
+        if not hasattr(os, "openpty"):
+            results.append(skipped(GROUP, name, "No pseudo-terminals here.", params))
+            continue
+        fields = entry(GROUP, name, params)
+        fields.update(_stream(sensor, rate_hz, params["baudrate"], seconds))
+        fields["items_per_second"] = fields["rows_per_second"]
+        results.append(fields)
+    return results
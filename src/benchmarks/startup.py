@@ -0,0 +1,23 @@
+"""Import time of the modules loaded before the window appears."""
+
+from util.import_report import import_times, total_time
+
+from ._timing import result, skipped
+
+GROUP = "startup"
+MODULES = ["util.serial_comm", "plots", "calibrators", "sensors", "main"]
+
+
+def run(quick: bool = False) -> list[dict]:
+    rounds = 3 if quick else 7
+    results = []
+    for module in MODULES:
+        params = {"module": module}
+        try:
+            # A fresh interpreter every round, so nothing is already imported
+            times = [total_time(import_times(module)) for _ in range(rounds)]
+        except ImportError as e:
+            results.append(skipped(GROUP, "import", str(e), params))
+            continue
+        results.append(result(GROUP, "import", times, params))
+    return results
@@ -1,17 +1,37 @@
+import importlib
+
 from ._base_calibrator import BaseCalibrator
-from .single_variable_linear import SingleVariableLinear
+
+# Module, class and valid sensors ("any" or a list) of every calibrator. A
+# module is only imported once a sensor it supports connects.
+CALIBRATORS = [
+    ("single_variable_linear", "SingleVariableLinear", "any"),
+    ("multi_channel", "MultiChannelCalibrator", "any"),
+]
+
+
+def _load(module_name: str, class_name: str) -> type[BaseCalibrator]:
+    module = importlib.import_module(f".{module_name}", __name__)
+    return getattr(module, class_name)
+
+
+def __getattr__(name: str):
+    # Keeps `from calibrators import SingleVariableLinear` working lazily
+    for module_name, class_name, _ in CALIBRATORS:
+        if name == class_name:
+            return _load(module_name, class_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_valid_calibrations(sensor_type: str) -> dict[str, BaseCalibrator]:
     """
     Returns a list of plot classes that are valid for the given sensor type.
     """
-    cal_classes = [SingleVariableLinear]
     valid_cals = {}
 
-    for cal_class in cal_classes:
-        valid_sensors = cal_class._valid_sensors
+    for module_name, class_name, valid_sensors in CALIBRATORS:
         if sensor_type in valid_sensors or valid_sensors == "any":
+            cal_class = _load(module_name, class_name)
             valid_cals[cal_class._name] = cal_class
 
     return valid_cals
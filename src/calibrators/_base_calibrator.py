@@ -1,25 +1,42 @@
 from abc import ABC, abstractmethod
-from tkinter import ttk
-from matplotlib.figure import Figure
-from matplotlib.axes import Axes
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from typing import TYPE_CHECKING
+
+from util.ring_buffer import RingBuffer
+from util.diagnostics import timed
+
+if TYPE_CHECKING:  # Not needed to apply saved models without a display
+    from tkinter import ttk
+    from matplotlib.figure import Figure
+    from matplotlib.axes import Axes
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 
 class BaseCalibrator(ABC):
-    _valid_sensors = "any"  # Can specify a list, e.g. ['VCNL4010','ExampleSensor2']
     _name = "base"
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Time every implementation for the Diagnostics tab
+        for method in ("update", "render"):
+            if method in cls.__dict__:
+                timed_method = timed(f"calibrator.{method}")(cls.__dict__[method])
+                setattr(cls, method, timed_method)
+
     def __init__(
         self,
-        canvas: FigureCanvasTkAgg,
-        fig: Figure,
-        ax: Axes,
-        controls_frame: ttk.Frame,
+        canvas: "FigureCanvasTkAgg",
+        fig: "Figure",
+        ax: "Axes",
+        controls_frame: "ttk.Frame",
+        data: RingBuffer,
     ):
         self.canvas = canvas
         self.fig = fig
         self.ax = ax
         self.controls_frame = controls_frame
+        self.data = data  # Shared sample store owned by the app
+        self.dirty = False  # Plot changed since the last render
+        self.request_render = lambda: None  # Set by the app's render scheduler
 
         self.ax.clear()
         self._setup_controls()
@@ -35,6 +52,21 @@ class BaseCalibrator(ABC):
         pass
 
     @abstractmethod
-    def update(self, data: list[dict]):
-        """Adds data into memory, plots it, etc."""
+    def update(self):
+        """Reads new samples from `self.data` and stores what it needs.
+
+        Call `_redraw` when the plot should change rather than drawing here;
+        `update` also runs while the calibration tab is hidden.
+        """
         pass
+
+    def _redraw(self):
+        """Marks the plot for drawing on the next frame."""
+        self.dirty = True
+        self.request_render()
+
+    @timed("calibrator.render")
+    def render(self):
+        """Draws pending changes. Override to rebuild artists before drawing."""
+        self.dirty = False
+        self.canvas.draw_idle()
@@ -0,0 +1,84 @@
+import numpy as np
+
+
+def weighted_line(x: np.ndarray, t: np.ndarray, w: np.ndarray):
+    """Weighted least-squares t = slope * x + intercept for every channel.
+
+    x and w are (n_channels, n_samples), t is (n_samples,). Solved in closed
+    form from weighted sums, so all channels are fitted at once.
+    """
+    sw = w.sum(axis=1)
+    sx = (w * x).sum(axis=1)
+    st = (w * t).sum(axis=1)
+    sxx = (w * x * x).sum(axis=1)
+    sxt = (w * x * t).sum(axis=1)
+    denom = sw * sxx - sx * sx
+    if np.any(denom <= 0):
+        raise ValueError("A selected channel does not vary between standards.")
+    slope = (sw * sxt - sx * st) / denom
+    intercept = (st - slope * sx) / sw
+    return slope, intercept
+
+
+def fit_linear(x: np.ndarray, t: np.ndarray) -> dict:
+    valid = np.isfinite(x).astype(float)
+    slope, intercept = weighted_line(np.nan_to_num(x), t, valid)
+    return {"coefficients": np.stack([slope, intercept])}
+
+
+def fit_polynomial(x: np.ndarray, t: np.ndarray, degree: int) -> dict:
+    """Polynomial in the standardized reading, solved as one batched system."""
+    center = np.nanmean(x, axis=1)
+    scale = np.nanstd(x, axis=1)
+    scale[scale == 0] = 1
+    z = np.nan_to_num((x - center[:, None]) / scale[:, None])
+    valid = np.isfinite(x)
+
+    # Vandermonde matrices (channels, samples, degree + 1), highest power first
+    powers = np.arange(degree, -1, -1)
+    vander = z[..., np.newaxis] ** powers * valid[..., np.newaxis]
+    gram = np.einsum("csi,csj->cij", vander, vander)
+    rhs = np.einsum("csi,s->ci", vander, t)
+    coefficients = np.linalg.solve(gram, rhs[..., np.newaxis])[..., 0]
+    return {"coefficients": coefficients.T, "center": center, "scale": scale}
+
+
+def fit_power_law(x: np.ndarray, t: np.ndarray) -> dict:
+    """t = a * x ** b, fitted as a line in log-log space."""
+    valid = (x > 0) & (t > 0)
+    if not np.any(valid):
+        raise ValueError("A power law needs positive readings and standards.")
+    log_x = np.log(np.where(valid, x, 1))
+    log_t = np.log(np.where(t > 0, t, 1))
+    b, log_a = weighted_line(log_x, log_t, valid.astype(float))
+    return {"coefficients": np.stack([np.exp(log_a), b])}
+
+
+def fit_huber(x: np.ndarray, t: np.ndarray, k: float = 1.345, iterations: int = 20):
+    """Robust line fit by iteratively reweighted least squares (Huber loss)."""
+    valid = np.isfinite(x)
+    x = np.nan_to_num(x)
+    w = valid.astype(float)
+    slope, intercept = weighted_line(x, t, w)
+    for _ in range(iterations):
+        residuals = t - (slope[:, None] * x + intercept[:, None])
+        # Robust residual scale per channel from the median absolute deviation
+        mad = np.median(np.abs(residuals), axis=1)
+        scale = np.maximum(1.4826 * mad, np.finfo(float).eps)
+        u = np.abs(residuals) / (k * scale[:, None])
+        w = np.where(u <= 1, 1.0, 1.0 / np.maximum(u, 1)) * valid
+        slope, intercept = weighted_line(x, t, w)
+    return {"coefficients": np.stack([slope, intercept])}
+
+
+def apply_model(model_type: str, params: dict, x: np.ndarray) -> np.ndarray:
+    """Evaluates a fitted channel model on readings `x`."""
+    coefficients = params["coefficients"]
+    if model_type in ("linear", "huber"):
+        return coefficients[0] * x + coefficients[1]
+    if model_type == "polynomial":
+        return np.polyval(coefficients, (x - params["center"]) / params["scale"])
+    if model_type == "power_law":
+        with np.errstate(invalid="ignore"):
+            return coefficients[0] * np.power(x, coefficients[1])
+    raise ValueError(f"Unknown model type: {model_type}")
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+class RunningStats:
+    """Running moments for fitting y = m * x + b without keeping the samples.
+
+    Holds n, the means of x and y, their sums of squared deviations (M2) and
+    the co-moment Σ(x - x̄)(y - ȳ), updated as in Welford's algorithm so large
+    offsets don't cancel. Adding samples, merging two sets of moments and
+    fitting the line are all constant time.
+    """
+
+    __slots__ = ("n", "mean_x", "mean_y", "m2x", "m2y", "cxy")
+
+    def __init__(self, n=0, mean_x=0.0, mean_y=0.0, m2x=0.0, m2y=0.0, cxy=0.0):
+        self.n = n
+        self.mean_x = mean_x
+        self.mean_y = mean_y
+        self.m2x = m2x
+        self.m2y = m2y
+        self.cxy = cxy
+
+    def add(self, x: float, y: np.ndarray):
+        """Adds samples `y` that were all measured at the same `x`."""
+        y = np.asarray(y, dtype=float)
+        y = y[np.isfinite(y)]
+        if len(y):
+            mean = float(y.mean())
+            m2 = float(np.dot(y - mean, y - mean))
+            merged = self + RunningStats(len(y), float(x), mean, 0.0, m2, 0.0)
+            for name in self.__slots__:
+                setattr(self, name, getattr(merged, name))
+
+    def __add__(self, other: "RunningStats") -> "RunningStats":
+        """Combines two sets of moments (Chan et al.'s parallel update)."""
+        n = self.n + other.n
+        if not self.n or not other.n:
+            source = other if other.n else self
+            return RunningStats(*(getattr(source, name) for name in self.__slots__))
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        weight = self.n * other.n / n
+        return RunningStats(
+            n,
+            self.mean_x + dx * other.n / n,
+            self.mean_y + dy * other.n / n,
+            self.m2x + other.m2x + dx * dx * weight,
+            self.m2y + other.m2y + dy * dy * weight,
+            self.cxy + other.cxy + dx * dy * weight,
+        )
+
+    @property
+    def mean(self) -> float:
+        return self.mean_y if self.n else np.nan
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation of y."""
+        if self.n < 2:
+            return np.nan
+        return float(np.sqrt(max(self.m2y / (self.n - 1), 0.0)))
+
+    def fit(self) -> tuple[float, float]:
+        """Least-squares slope and intercept of y against x."""
+        if self.n < 2 or self.m2x <= 0:
+            raise ValueError("At least two distinct x values are needed to fit.")
+        m = self.cxy / self.m2x
+        b = self.mean_y - m * self.mean_x
+        return m, b
+
+    def residual_sum_of_squares(self, m: float, b: float) -> float:
+        """Σ(y - m * x - b)², expanded around the means."""
+        offset = self.mean_y - m * self.mean_x - b
+        rss = self.m2y - 2 * m * self.cxy + m * m * self.m2x + self.n * offset**2
+        return max(rss, 0.0)
+
+    def r_squared(self, m: float, b: float) -> float:
+        if self.m2y <= 0:
+            return np.nan
+        return 1 - self.residual_sum_of_squares(m, b) / self.m2y
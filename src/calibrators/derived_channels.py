@@ -0,0 +1,97 @@
+import json
+import os
+
+import numpy as np
+
+from ._models import apply_model
+
+
+class DerivedChannel:
+    """A column computed from a sensor column with a saved calibration model."""
+
+    def __init__(self, name: str, source: str, model_type: str, params: dict):
+        self.name = name
+        self.source = source
+        self.model_type = model_type
+        self.params = {k: np.asarray(v, dtype=float) for k, v in params.items()}
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        return apply_model(self.model_type, self.params, values)
+
+
+def load_calibration(file_path: str) -> list[DerivedChannel]:
+    """Reads a model saved by one of the calibrators.
+
+    Single-variable models map the standard to the reading, so they are
+    inverted here to give the standard from the reading. Multi-channel models
+    already predict the standard and are used as saved.
+    """
+    with open(file_path) as json_file:
+        model = json.load(json_file)
+
+    unit = model.get("unit") or os.path.splitext(os.path.basename(file_path))[0]
+    if "channels" in model:
+        return [
+            DerivedChannel(f"{source}_{unit}", source, model["model_type"], params)
+            for source, params in model["channels"].items()
+        ]
+
+    slope = model["model"]["slope"]
+    intercept = model["model"]["intercept"]
+    if not slope:
+        raise ValueError("Model has a zero slope and cannot be inverted.")
+    source = model["variable"]
+    coefficients = [1 / slope, -intercept / slope]
+    return [
+        DerivedChannel(
+            f"{source}_{unit}", source, "linear", {"coefficients": coefficients}
+        )
+    ]
+
+
+class DerivedChannels:
+    """Calibrated columns appended to each batch of parsed samples.
+
+    The derived values are computed once per batch, vectorized over all rows,
+    so every consumer downstream (plots, calibrators, the log file) sees them
+    as ordinary columns. The binding is replaced as a whole so `apply` can run
+    on the reader thread while the GUI rebinds.
+    """
+
+    def __init__(self):
+        self.channels = []
+        # Header count, channels whose source column is present, and the
+        # index of each of those source columns
+        self._binding = (0, [], [])
+
+    def load(self, file_path: str) -> list[str]:
+        """Adds the channels in a saved model file, replacing any of the same name."""
+        new_channels = load_calibration(file_path)
+        names = {ch.name for ch in new_channels}
+        self.channels = [ch for ch in self.channels if ch.name not in names]
+        self.channels.extend(new_channels)
+        return [ch.name for ch in new_channels]
+
+    def clear(self):
+        self.channels = []
+        self._binding = (0, [], [])
+
+    def bind(self, headers: list[str]) -> list[str]:
+        """Matches channels to the sensor headers and returns the derived names.
+
+        Channels whose source column is not in `headers` are skipped.
+        """
+        active = [ch for ch in self.channels if ch.source in headers]
+        sources = [headers.index(ch.source) for ch in active]
+        self._binding = (len(headers), active, sources)
+        return [ch.name for ch in active]
+
+    def apply(self, block: np.ndarray) -> np.ndarray:
+        """Appends the derived columns to a (n_samples, n_headers) block."""
+        n_headers, active, sources = self._binding
+        if not sources:
+            return block
+        if block.shape[1] != n_headers:
+            raise ValueError("Block does not match the bound headers.")
+        derived = [ch.apply(block[:, i]) for ch, i in zip(active, sources)]
+        return np.column_stack([block] + derived)
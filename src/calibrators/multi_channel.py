@@ -0,0 +1,326 @@
+from ._base_calibrator import BaseCalibrator
+from ._models import (
+    apply_model,
+    fit_huber,
+    fit_linear,
+    fit_polynomial,
+    fit_power_law,
+)
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+import numpy as np
+import json
+
+MODEL_TYPES = {
+    "Linear": "linear",
+    "Polynomial": "polynomial",
+    "Power law": "power_law",
+    "Robust linear (Huber)": "huber",
+}
+
+
+class MultiChannelCalibrator(BaseCalibrator):
+    """Calibrates many channels against the same set of standards at once.
+
+    Every channel is recorded while a standard is measured, so one pass over
+    the standards is enough for all of them. Each model predicts the standard
+    from a channel's reading and is fitted for all selected channels together
+    with vectorized NumPy operations.
+    """
+
+    _name = "Multi-Channel"
+
+    def __init__(self, *args):
+        self.columns = []
+        self.calibration_target = tk.StringVar()
+        self.unit_name = tk.StringVar()
+        self.model_name = tk.StringVar(value="Linear")
+        self.degree_var = tk.IntVar(value=2)
+        self.recording_key = None
+        self.records = {}  # Recording for each calibration standard
+        self.samples_seen = 0  # Value of data.total when last updated
+        self.model = None  # Last fit, as saved to file
+        self.artists = {}  # Channel: (mean points, fitted curve), reused each render
+        self.legend_channels = None  # Channels shown in the current legend
+        super().__init__(*args)
+
+    def _setup_axes(self):
+        """Set up the axes with labels and grid."""
+        self.ax.set_xlabel("Standard")
+        self.ax.set_ylabel("Measured Value")
+        self.ax.grid(True, linestyle=":", alpha=0.6)
+
+    def _setup_controls(self):
+        # Channel selection
+        selection_frame = ttk.Frame(self.controls_frame)
+        selection_frame.grid(row=0, column=0, rowspan=2, sticky="ns")
+        tk.Label(selection_frame, text="Channels:").grid(row=0, column=0, sticky="w")
+        self.channel_listbox = tk.Listbox(
+            selection_frame, selectmode="multiple", height=6, exportselection=False
+        )
+        self.channel_listbox.grid(row=1, column=0, sticky="ns")
+        ttk.Button(
+            selection_frame,
+            text="Select All",
+            command=lambda: self.channel_listbox.selection_set(0, tk.END),
+        ).grid(row=2, column=0)
+
+        # Model choice
+        model_frame = ttk.Frame(self.controls_frame)
+        model_frame.grid(row=0, column=1, sticky="ew", padx=5)
+        tk.Label(model_frame, text="Model:").grid(row=0, column=0, sticky="w")
+        ttk.Combobox(
+            model_frame,
+            textvariable=self.model_name,
+            state="readonly",
+            values=list(MODEL_TYPES),
+        ).grid(row=0, column=1, sticky="ew")
+        tk.Label(model_frame, text="Degree:").grid(row=1, column=0, sticky="w")
+        tk.Spinbox(
+            model_frame, from_=1, to=5, width=4, textvariable=self.degree_var
+        ).grid(row=1, column=1, sticky="w")
+
+        # Buttons for starting and stopping the calibration recordings
+        recording_frame = ttk.Frame(self.controls_frame)
+        recording_frame.grid(row=1, column=1, padx=5)
+        tk.Label(recording_frame, text="Cal. Value").grid(row=0, column=0, sticky="w")
+        tk.Entry(recording_frame, textvariable=self.calibration_target).grid(
+            row=0, column=1
+        )
+        tk.Label(recording_frame, text="Unit").grid(row=1, column=0, sticky="w")
+        tk.Entry(recording_frame, textvariable=self.unit_name).grid(row=1, column=1)
+        self.btn_record = ttk.Button(
+            recording_frame, text="Begin Recording", command=self._toggle_recording
+        )
+        self.btn_record.grid(row=2, column=0, columnspan=2)
+        ttk.Button(recording_frame, text="Fit Model", command=self._fit).grid(
+            row=3, column=0
+        )
+        self.btn_save = ttk.Button(
+            recording_frame, text="Save Model", command=self._save_model
+        )
+        self.btn_save.grid(row=3, column=1)
+        self.btn_save.config(state="disabled")
+
+        self.controls_frame.columnconfigure(1, weight=1)
+        model_frame.columnconfigure(1, weight=1)
+
+    def _update_variable_choices(self):
+        # Recordings are kept by column name, so they carry over as columns
+        # are added (e.g. by loading a calibration) or reordered.
+        selected = set(self._selected_channels())
+        self.columns = list(self.data.columns)
+        self.samples_seen = 0  # The buffer starts over with the new columns
+        self._remove_artists(list(self.artists))
+        self.legend_channels = None
+        self.channel_listbox.delete(0, tk.END)
+        for i, col in enumerate(self.columns):
+            self.channel_listbox.insert(tk.END, col)
+            if col in selected:
+                self.channel_listbox.selection_set(i)
+
+    def _selected_channels(self) -> list[str]:
+        return [self.columns[i] for i in self.channel_listbox.curselection()]
+
+    def _toggle_recording(self):
+        if self.recording_key is not None:
+            # Stop recording
+            self.recording_key = None
+            self.btn_record.config(text="Begin Recording")
+            return
+
+        channels = self._selected_channels()
+        if not channels:
+            messagebox.showerror("No Channels", "Select the channels to record.")
+            return
+        try:
+            self.recording_key = float(self.calibration_target.get())
+        except ValueError:
+            messagebox.showerror(
+                "Invalid Input",
+                "Invalid calibration value. Please enter a numeric value.",
+            )
+            return
+
+        # Replace any earlier recording of this standard
+        self.records[self.recording_key] = Recording(channels)
+        self.samples_seen = self.data.total
+        self.btn_record.config(text="Stop Recording")
+
+    def update(self):
+        if self.columns != self.data.columns:
+            self._update_variable_choices()
+
+        new_samples = self.data.since(self.samples_seen)
+        self.samples_seen = self.data.total
+
+        # No need to update the plot or store data not used for calibration.
+        if self.recording_key is None:
+            return
+
+        if new_samples.shape[1]:
+            self.records[self.recording_key].add(new_samples, self.data)
+        self._redraw()
+
+    def render(self):
+        self.dirty = False
+        self._plot_records()
+
+    def _fit(self):
+        channels = self._selected_channels()
+        if not channels or len(self.records) < 2:
+            messagebox.showerror(
+                "No Data",
+                "Select channels and record at least two standards before fitting.",
+            )
+            return
+
+        missing = [
+            ch
+            for ch in channels
+            if any(ch not in r.totals for r in self.records.values())
+        ]
+        if missing:
+            messagebox.showerror(
+                "No Data",
+                f"Not recorded for every standard: {', '.join(missing)}",
+            )
+            return
+
+        model_type = MODEL_TYPES[self.model_name.get()]
+        try:
+            # Stack every recorded sample: x holds readings, t the standards.
+            x = np.concatenate(
+                [r.samples(channels) for r in self.records.values()], axis=1
+            )
+            t = np.concatenate(
+                [np.full(r.n, key) for key, r in self.records.items()]
+            )
+            if model_type == "linear":
+                params = fit_linear(x, t)
+            elif model_type == "polynomial":
+                params = fit_polynomial(x, t, self.degree_var.get())
+            elif model_type == "power_law":
+                params = fit_power_law(x, t)
+            else:
+                params = fit_huber(x, t)
+        except (ValueError, np.linalg.LinAlgError) as e:
+            messagebox.showerror("Fit Failed", f"Could not fit the model:\n{e}")
+            return
+
+        self.model = {
+            "type": self._name,
+            "model_type": model_type,
+            "unit": self.unit_name.get(),
+            "channels": {
+                ch: {k: np.asarray(v)[..., i].tolist() for k, v in params.items()}
+                for i, ch in enumerate(channels)
+            },
+            "standards": {
+                key: {"n": r.n, "mean": {ch: r.mean(ch) for ch in r.totals}}
+                for key, r in self.records.items()
+            },
+        }
+        self.btn_save.config(state="normal")
+        self._plot_records()
+
+    def _save_model(self):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            title="Save Model As",
+        )
+        if not file_path:
+            return
+
+        with open(file_path, "w") as json_file:
+            json.dump(self.model, json_file, indent=4)
+
+    def _remove_artists(self, channels: list[str]):
+        for ch in channels:
+            for artist in self.artists.pop(ch):
+                artist.remove()
+
+    def _plot_records(self):
+        """Plots each channel's mean reading per standard and its fitted curve.
+
+        Each channel keeps its two lines between renders; only their data is
+        replaced, and lines are added or removed as the selection changes.
+        """
+        channels = self._selected_channels()
+        self._remove_artists([ch for ch in self.artists if ch not in channels])
+
+        standards = np.array(list(self.records.keys()))
+        order = np.argsort(standards)
+        recordings = list(self.records.values())
+        records = [recordings[i] for i in order]
+
+        for ch in channels:
+            if ch not in self.artists:
+                points = self.ax.plot([], [], "o", label=ch)[0]
+                fit_line = self.ax.plot([], [], color=points.get_color())[0]
+                self.artists[ch] = (points, fit_line)
+            points, fit_line = self.artists[ch]
+            readings = np.array([r.mean(ch) for r in records])
+            points.set_data(standards[order], readings)
+
+            fit = self.model["channels"].get(ch) if self.model else None
+            if fit is not None and np.isfinite(readings).any():
+                # The model maps readings to standards, so draw it sideways.
+                curve = np.linspace(np.nanmin(readings), np.nanmax(readings), 50)
+                predicted = apply_model(self.model["model_type"], fit, curve)
+                fit_line.set_data(predicted, curve)
+            else:
+                fit_line.set_data([], [])
+
+        # The legend only changes with the selection
+        if channels != self.legend_channels:
+            self.legend_channels = channels
+            legend = self.ax.get_legend()
+            if legend is not None:
+                legend.remove()
+            if channels and len(channels) <= 12:
+                self.ax.legend(loc="upper left", fontsize="small")
+
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
+
+
+class Recording:
+    """Samples of the recorded channels for one calibration standard.
+
+    Only the channels selected when recording began are kept, by name, so the
+    recording outlives changes to the other columns. Running sums give each
+    channel's mean for plotting; the samples are only joined when fitting.
+    """
+
+    def __init__(self, channels: list[str]):
+        self.chunks = {ch: [] for ch in channels}
+        self.totals = {ch: 0.0 for ch in channels}
+        self.n = 0
+
+    def add(self, samples: np.ndarray, data):
+        """Adds the recorded channels of (n_columns, n) `samples` from `data`."""
+        if any(ch not in data for ch in self.chunks):
+            return  # A recorded channel is gone; keep the channels in step
+        for ch in self.chunks:
+            # The shared buffer reuses its memory, so keep a copy.
+            values = samples[data.index(ch)].copy()
+            self.chunks[ch].append(values)
+            self.totals[ch] += float(values.sum())
+        self.n += samples.shape[1]
+
+    def mean(self, channel: str) -> float:
+        if channel not in self.totals or not self.n:
+            return np.nan
+        return self.totals[channel] / self.n
+
+    def samples(self, channels: list[str]) -> np.ndarray:
+        """(len(channels), n) array of every recorded sample."""
+        for ch in channels:
+            if len(self.chunks[ch]) > 1:
+                self.chunks[ch] = [np.concatenate(self.chunks[ch])]
+        return np.array(
+            [self.chunks[ch][0] if self.chunks[ch] else np.empty(0) for ch in channels]
+        )
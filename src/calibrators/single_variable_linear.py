@@ -1,4 +1,5 @@
 from ._base_calibrator import BaseCalibrator
+from ._running_stats import RunningStats
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import numpy as np
@@ -6,18 +7,20 @@ import json
 
 
 class SingleVariableLinear(BaseCalibrator):
-    _valid_sensors = "any"
     _name = "Single Value Linear"
 
     def __init__(self, *args):
         self.var_choices = []
         self.calibration_target = tk.StringVar()
         self.recording_key = None
-        self.records = {}
+        self.records = {}  # RunningStats for each calibration standard
+        self.samples_seen = 0  # Value of data.total when last updated
         self.var_name = tk.StringVar()
         self.unit_name = tk.StringVar()
         self.m = None
         self.b = None
+        self.points = None  # Error bar artists for the recorded standards
+        self.fit_line = None
         super().__init__(*args)
 
     def _setup_axes(self):
@@ -84,7 +87,8 @@ class SingleVariableLinear(BaseCalibrator):
                 self.records.pop(self.recording_key, None)
 
                 # Initialize a new record
-                self.records[self.recording_key] = []
+                self.records[self.recording_key] = RunningStats()
+                self.samples_seen = self.data.total
                 self.btn_record.config(text="Stop Recording")
 
             except ValueError:
@@ -100,17 +104,16 @@ class SingleVariableLinear(BaseCalibrator):
             )
             return
 
-        # Perform linear regression
-        x, y = self._get_data_arrays()
-        A = np.vstack([x, np.ones(len(x))]).T
-        self.m, self.b = np.linalg.lstsq(A, y, rcond=None)[0]
+        # Perform linear regression from the running sums
+        try:
+            self.m, self.b = self._total_stats().fit()
+        except ValueError as e:
+            messagebox.showerror("Not Enough Data", str(e))
+            return
 
         # Enable the save button after fitting
         self.btn_save.config(state="normal")
-
-        y_hat = self.m * x + self.b
-        self.ax.plot(x, y_hat, c="red")
-        self.canvas.draw()
+        self._plot_records()
 
     def _save_model(self):
         file_path = filedialog.asksaveasfilename(
@@ -121,52 +124,90 @@ class SingleVariableLinear(BaseCalibrator):
         if not file_path:
             return
 
-        # Save raw data and model coefficients
+        # Save per-standard summaries and model coefficients
+        total = self._total_stats()
         data_to_save = {
             "type": self._name,
             "variable": self.var_name.get(),
             "unit": self.unit_name.get(),
             "model": {"slope": self.m, "intercept": self.b},
-            "raw_data": self.records,
+            "r_squared": total.r_squared(self.m, self.b),
+            "standards": {
+                key: {"n": stats.n, "mean": stats.mean, "std": stats.std}
+                for key, stats in self.records.items()
+            },
         }
 
         with open(file_path, "w") as json_file:
             json.dump(data_to_save, json_file, indent=4)
 
-    def update(self, data_list: list[dict]):
-        if len(self.var_choices) == 0:
-            self.var_choices = list(data_list[0].keys())
+    def update(self):
+        if self.var_choices != self.data.columns:
+            self.var_choices = list(self.data.columns)
             self._update_variable_choices()
 
+        new_samples = self.data.since(self.samples_seen)
+        self.samples_seen = self.data.total
+
         # No need to update the plot or store data not used for calibration.
         if self.recording_key is None:
             return
 
-        # Collect data
-        for data in data_list:
-            if self.var_name.get() in data:
-                value = data[self.var_name.get()]
-                if self.recording_key not in self.records:
-                    self.records[self.recording_key] = []
-                self.records[self.recording_key].append(value)
-
-        # Clear all existing scatter plots on axes
-        for collection in self.ax.collections:
-            collection.remove()
-
-        # Reset the color cycle
-        self.ax.set_prop_cycle(None)
-
-        x, y = self._get_data_arrays()
-        self.ax.scatter(x, y, alpha=0.7)
-        self.canvas.draw()
-
-    def _get_data_arrays(self):
-        """Helper function for getting arrays instead of dict"""
-        x = []
-        y = []
-        for key, values in self.records.items():
-            x.extend([key] * len(values))
-            y.extend(values)
-
-        return np.array(x), np.array(y)
+        # Fold the new samples into the running sums for this standard.
+        if self.var_name.get() in self.data and new_samples.shape[1]:
+            values = new_samples[self.data.index(self.var_name.get())]
+            self.records[self.recording_key].add(self.recording_key, values)
+
+        if self.m is not None:
+            try:
+                self.m, self.b = self._total_stats().fit()
+            except ValueError:
+                pass  # Keep the last fit until there is enough data again
+        self._redraw()
+
+    def render(self):
+        self.dirty = False
+        self._plot_records()
+
+    def _total_stats(self) -> RunningStats:
+        return sum(self.records.values(), RunningStats())
+
+    def _plot_records(self):
+        """Plots each standard's mean and standard deviation, and the fit.
+
+        The error bars and fit line are made once and then only given new data.
+        """
+        if self.points is None:
+            # One placeholder point, since no caps are made for empty data
+            self.points = self.ax.errorbar(
+                [np.nan], [np.nan], yerr=[0], fmt="o", capsize=4, alpha=0.7
+            )
+            self.fit_line = self.ax.plot([], [], c="red")[0]
+
+        x = np.array(list(self.records.keys()))
+        stats = list(self.records.values())
+        y = np.array([s.mean for s in stats])
+        err = np.array([s.std if s.n > 1 else 0 for s in stats])
+        data_line, (cap_low, cap_high), (bars,) = self.points
+        data_line.set_data(x, y)
+        cap_low.set_data(x, y - err)
+        cap_high.set_data(x, y + err)
+        bars.set_segments(
+            [[(xi, lo), (xi, hi)] for xi, lo, hi in zip(x, y - err, y + err)]
+        )
+
+        if self.m is not None and len(x):
+            x_fit = np.array([x.min(), x.max()])
+            self.fit_line.set_data(x_fit, self.m * x_fit + self.b)
+            total = self._total_stats()
+            rms = np.sqrt(total.residual_sum_of_squares(self.m, self.b) / total.n)
+            self.ax.set_title(
+                f"y = {self.m:.4g}x + {self.b:.4g}   "
+                f"R² = {total.r_squared(self.m, self.b):.4f}   RMS = {rms:.4g}"
+            )
+        else:
+            self.fit_line.set_data([], [])
+
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
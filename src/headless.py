@@ -0,0 +1,333 @@
+"""Logs OpenOBS sensors to disk without a display.
+
+    python headless.py --port PORT [PORT ...] [--config FILE]
+                       [--output-dir DIR] [--interval SECONDS] [--start TIME]
+                       [--set NAME=VALUE ...] [--calibration FILE ...]
+                       [--duration SECONDS] [--baudrate BAUD] [--fsync] [--verbose]
+
+Installed with pip, the same runs as `openobs-headless`. Each port gets its
+own reader thread and log file; the handshake is answered and the settings
+sent without waiting for anyone. Options can also come from a JSON config
+file with the same names, e.g. {"port": ["/dev/ttyUSB0"], "interval": 5,
+"set": {"led_current": 50}}; options on the command line take precedence.
+Neither tkinter nor matplotlib is imported.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+from util.serial_comm import SerialCommunicator
+from util.session import LoggerSession
+from util.file_writer import check_log_file
+from util.batch_queue import DROP_OLDEST
+from sensors.settings import settings_words
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "OpenOBS", "data")
+DEFAULT_INTERVAL = 5  # Seconds between samples, as in the GUI; 0 is continuous
+BAUDRATE = 250000
+POLL_SECONDS = 0.5  # Longest wait between checks when no sentence arrives
+STATUS_SECONDS = 60.0  # Interval of the progress line of each logger
+QUEUE_ROWS = 1000  # Rows kept after writing; nothing reads them here
+LOG_FLUSH_ROWS = 1000
+LOG_FLUSH_SECONDS = 5.0
+
+
+class HeadlessLogger:
+    """One sensor on one serial port, logged to a file with no GUI.
+
+    Control sentences are handled by the LoggerSession shared with
+    OpenOBSApp, on the thread calling `poll`. Rows are written by the data
+    queue's tap on the reader thread, so none are lost however slowly `poll`
+    runs.
+    """
+
+    def __init__(
+        self,
+        port: str,
+        output_dir: str,
+        interval: int = DEFAULT_INTERVAL,
+        start: datetime.datetime = None,
+        settings: dict = None,
+        calibrations: list[str] = (),
+        baudrate: int = BAUDRATE,
+        fsync: bool = False,
+        verbose: bool = False,
+        wake: threading.Event = None,
+    ):
+        self.port = port
+        self.output_dir = output_dir
+        self.interval = interval
+        self.start = start
+        self.settings = settings or {}
+        self.baudrate = baudrate
+        self.fsync = fsync
+        self.verbose = verbose
+        self.wake = wake or threading.Event()  # Set when a sentence is queued
+
+        self.ser_com = SerialCommunicator(self.log_text, self.wake.set)
+        self.ser_com.debug = verbose
+        data_queue = self.ser_com.data_queue
+        data_queue.max_rows = QUEUE_ROWS
+        data_queue.policy = DROP_OLDEST
+
+        self.session = LoggerSession(self.ser_com, self.log_text)
+        self.session.sensor_callback = self.on_sensor_type
+        for file_path in calibrations:
+            names = self.session.derived_channels.load(file_path)
+            self.log_text(f"Calibrated columns: {', '.join(names)}", "center")
+
+        self.log_file_path = None
+        self.failed = False  # Set on errors that stop this logger
+        self.last_status = time.monotonic()
+
+    def open(self) -> bool:
+        self.ser_com.open_connection(self.port, baudrate=self.baudrate)
+        return self.ser_com.is_open
+
+    def close(self):
+        if self.ser_com.is_open:
+            self.ser_com.close_connection()
+        writer = self.session.stop_file_logging()
+        if writer:
+            writer.close()
+            self.log_text(
+                f"Wrote {writer.rows_written} rows to {self.log_file_path}"
+                + (f" ({writer.rows_dropped} dropped)" if writer.rows_dropped else ""),
+                "center",
+            )
+            self.check_log_file()
+
+    def check_log_file(self):
+        """Reads the file back to make sure every section of rows follows its
+        header. Any problem fails this logger."""
+        try:
+            problems = check_log_file(self.log_file_path)
+        except (IOError, OSError) as e:
+            problems = [f"Could not read it back: {e}"]
+        for problem in problems:
+            self.log_error(f"Log file check: {problem}")
+        if problems:
+            self.failed = True
+
+    @property
+    def running(self) -> bool:
+        return self.ser_com.is_open and not self.failed
+
+    def poll(self):
+        """Handles queued control sentences and discards the display copy of
+        the data, which is already on its way to the file."""
+        self.session.process_control_queue()
+        self.ser_com.data_queue.get_all()
+
+        now = time.monotonic()
+        writer = self.session.log_file_writer
+        if writer and now - self.last_status >= STATUS_SECONDS:
+            self.last_status = now
+            self.log_text(
+                f"{writer.rows_written} rows written, {writer.backlog} waiting, "
+                f"{writer.rows_dropped} dropped",
+                "center",
+            )
+
+    def log_text(self, message: str, justification: str = "left", tag: str = None):
+        # Data rows and raw traffic ("left") are only shown with --verbose
+        if justification == "left" and tag != "error" and not self.verbose:
+            return
+        stamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        stream = sys.stderr if tag == "error" else sys.stdout
+        print(f"{stamp} {self.port}: {message}", file=stream, flush=True)
+
+    def log_error(self, message):
+        self.log_text(message, "center", "error")
+
+    def on_sensor_type(self, sensor_type):
+        # Open the file before the device starts sending data
+        if self.session.log_file_writer is None and not self.open_log_file():
+            return
+        self.send_settings()
+
+    def send_settings(self):
+        try:
+            sensor_words = settings_words(self.session.sensor_type, self.settings)
+        except ValueError as e:
+            self.log_error(f"Cannot send settings: {e}")
+            self.failed = True
+            return
+
+        delay_start = 0
+        if self.start is not None:
+            delay_start = (self.start - datetime.datetime.now()).total_seconds()
+            if delay_start < 0:
+                self.log_error("Warning: Start time is in the past. Delay set to 0.")
+                delay_start = 0
+
+        self.session.send_settings(self.interval, delay_start, sensor_words)
+
+    def open_log_file(self) -> bool:
+        """Opens a new file named after the device and the current time."""
+        stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        device = self.session.serial_number or os.path.basename(self.port)
+        file_path = os.path.join(self.output_dir, f"OpenOBS_{device}_{stamp}.txt")
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self.session.start_file_logging(
+                file_path,
+                flush_rows=LOG_FLUSH_ROWS,
+                flush_interval=LOG_FLUSH_SECONDS,
+                fsync=self.fsync,
+            )
+        except (IOError, OSError) as e:
+            self.log_error(f"Could not open file for logging: {e}")
+            self.failed = True
+            return False
+        self.log_file_path = file_path
+        self.log_text(f"Logging to file: {file_path}", "center")
+        return True
+
+
+def run(loggers: list[HeadlessLogger], wake: threading.Event, duration: float = None):
+    """Polls the loggers until they all stop, `duration` seconds pass, or
+    the process is interrupted. Returns False if any logger failed."""
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        stop.set()
+        wake.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    deadline = time.monotonic() + duration if duration else None
+    try:
+        while not stop.is_set():
+            wake.wait(POLL_SECONDS)
+            wake.clear()
+            for logger in loggers:
+                logger.poll()
+            if not any(logger.running for logger in loggers):
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+    finally:
+        for logger in loggers:
+            logger.close()
+    return not any(logger.failed or not logger.log_file_path for logger in loggers)
+
+
+def parse_start(text: str) -> datetime.datetime:
+    try:
+        return datetime.datetime.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Not a date and time: {text!r}")
+
+
+def parse_setting(text: str) -> tuple[str, str]:
+    name, sep, value = text.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"Expected NAME=VALUE, got {text!r}")
+    return name.strip(), value.strip()
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Log OpenOBS sensors to disk without a display."
+    )
+    parser.add_argument("--config", help="JSON file of default options")
+    parser.add_argument("--port", nargs="+", help="serial port of each sensor")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=DEFAULT_INTERVAL,
+        help="seconds between samples, 0 for continuous",
+    )
+    parser.add_argument(
+        "--start", type=parse_start, help="delayed start, e.g. 2025-06-01T08:00"
+    )
+    parser.add_argument(
+        "--set",
+        nargs="+",
+        type=parse_setting,
+        default=[],
+        metavar="NAME=VALUE",
+        help="sensor settings, e.g. led_current=50 (see sensors/settings.py)",
+    )
+    parser.add_argument(
+        "--calibration", nargs="+", default=[], help="saved models to apply"
+    )
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--baudrate", type=int, default=BAUDRATE)
+    parser.add_argument("--fsync", action="store_true", help="force rows onto disk")
+    parser.add_argument("--verbose", action="store_true", help="show all traffic")
+    return parser
+
+
+def load_config(parser: argparse.ArgumentParser, file_path: str) -> dict:
+    """Reads options from a JSON file, checked against the parser's. Text
+    values such as "start" are converted like the command line's."""
+    try:
+        with open(file_path) as json_file:
+            config = json.load(json_file)
+    except (IOError, OSError, ValueError) as e:
+        parser.error(f"Could not read config file: {e}")
+
+    known = set(vars(parser.parse_args([]))) - {"config"}
+    defaults = {}
+    for key, value in config.items():
+        dest = key.replace("-", "_")
+        if dest not in known:
+            parser.error(f"Unknown option in config file: {key}")
+        if dest == "port" and isinstance(value, str):
+            value = [value]
+        elif dest == "set" and isinstance(value, dict):
+            value = list(value.items())
+        defaults[dest] = value
+    return defaults
+
+
+def main():
+    parser = make_parser()
+    args, _ = parser.parse_known_args()
+    if args.config:
+        parser.set_defaults(**load_config(parser, args.config))
+    args = parser.parse_args()
+    if not args.port:
+        parser.error("No serial port given (--port or in the config file).")
+    if args.interval < 0:
+        parser.error("The interval cannot be negative.")
+
+    wake = threading.Event()
+    loggers = []
+    for port in args.port:
+        try:
+            logger = HeadlessLogger(
+                port,
+                args.output_dir,
+                interval=args.interval,
+                start=args.start,
+                settings=dict(args.set),
+                calibrations=args.calibration,
+                baudrate=args.baudrate,
+                fsync=args.fsync,
+                verbose=args.verbose,
+                wake=wake,
+            )
+        except (IOError, OSError, ValueError, KeyError) as e:
+            parser.error(f"Could not load calibration: {e}")
+        loggers.append(logger)
+
+    opened = [logger for logger in loggers if logger.open()]
+    if not opened:
+        sys.exit(1)
+    ok = run(opened, wake, args.duration)
+    sys.exit(0 if ok and len(opened) == len(loggers) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,26 @@
+import time
+
+STARTED = time.perf_counter()  # For the startup time in the Diagnostics tab
+
 import sys
+import os
+import collections
+import threading
 import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
-from PIL import Image, ImageTk
-import serial
-import serial.tools.list_ports
-import time
 import datetime
-from tkcalendar import DateEntry
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import subprocess
+import numpy as np
 
 from util.serial_comm import SerialCommunicator
 from util.test_comm import TestCommunicator
+from util.data_generator import SCHEMAS
+from util.ring_buffer import RingBuffer
+from util.batch_queue import POLICIES, DECIMATE
+from util.render_scheduler import RenderScheduler
+from util.session import LoggerSession
+from util.diagnostics import diagnostics, PERCENTILES
+from util.profiling import profiler, MemorySnapshots
 from sensors import make_sensor_obj
 from plots import get_valid_plots
 from calibrators import get_valid_calibrations
@@ -24,6 +32,32 @@ OFF_CURRENT = 0.05
 ON_TIME = 0.96
 TEXT_COLUMNS = 60  # Adjusted for typical Python font widths
 UPDATE_INTERVAL_MS = 100  # Adjust the interval as needed
+MIN_UPDATE_INTERVAL_MS = 5  # Poll interval while a backlog is being worked off
+MAX_UPDATE_INTERVAL_MS = 500  # Poll interval after a long time without data
+DRAIN_BUDGET_MS = 20  # Time spent taking rows off the queue per tick
+DRAIN_BUDGET_ROWS = 20000  # ...and the most rows taken per tick
+DRAIN_CHUNK_ROWS = 2000  # Rows ingested per step within a tick
+PLOT_INTERVAL_MS = 100  # Plots and calibrators take in new data at most this often
+MAX_FPS = 10  # Most frames drawn per second for the visible figure
+DATA_BUFFER_SAMPLES = 50000  # Samples kept in memory until the sample rate is known
+# History kept once the rate is known from SET, enough to fill a plot window of
+# an hour (the longest worth drawing at screen resolution)...
+DATA_BUFFER_SECONDS = 3600
+DATA_BUFFER_MAX_BYTES = 32 * 2**20  # ...as long as it fits in this much memory
+DATA_BUFFER_MIN_SAMPLES = 1000
+CONTINUOUS_RATE_HZ = 100  # Expected sample rate with no measurement interval
+LOG_MAX_LINES = 1000  # Lines kept in the serial log widget
+LOG_FLUSH_MS = 100  # How often pending log lines are written to the widget
+LOG_FLUSH_ROWS = 1000  # Flush the log file after this many rows...
+LOG_FLUSH_SECONDS = 5.0  # ...or after this many seconds, whichever is first
+LOG_FSYNC = False  # Force flushed rows onto the disk (slower, survives power loss)
+LOG_CLOSE_POLL_MS = 100  # How often to check whether the log file has been closed
+DATA_QUEUE_ROWS = 20000  # Rows held for display while the GUI is busy
+DATA_QUEUE_POLICY = DECIMATE  # What to do with rows beyond that (see util.batch_queue)
+DIAGNOSTICS_INTERVAL_MS = 1000  # Refresh interval of the Diagnostics tab
+# Profiles and memory snapshots taken in debug mode are saved here
+PROFILE_DIR = os.path.join(os.path.expanduser("~"), "OpenOBS", "profiles")
+MEMORY_SNAPSHOT_INTERVAL_MS = 3600 * 1000  # Between automatic memory snapshots
 
 
 class OpenOBSApp(tk.Tk):
@@ -41,10 +75,9 @@ class OpenOBSApp(tk.Tk):
 
         self.title("OpenOBS Python GUI")
         
-        # Set the window icon if available
+        # Set the window icon if available (Tk reads PNG itself, no need for PIL)
         try:
-            im = Image.open("./src/sensorIcon.png")
-            photo = ImageTk.PhotoImage(im)
+            photo = tk.PhotoImage(file="./src/sensorIcon.png")
             self.wm_iconphoto(True, photo)
         except Exception as e:
             print(f"Could not set window icon: {e}")
@@ -52,10 +85,19 @@ class OpenOBSApp(tk.Tk):
         self.geometry(f"{window_width}x{window_height}")
 
         # --- Member Variables ---
-        self.ser_com = SerialCommunicator(self.log_text, self.process_received_sentence)
-        self.sensor_type = None
+        self.ser_com = SerialCommunicator(
+            self.log_text, self.notify_control_message, messagebox.showerror
+        )
+        self.control_event_pending = False
+        # Device protocol and file logging, shared with the headless runner
+        self.session = LoggerSession(self.ser_com, self.log_text)
+        self.session.handshake_callback = self.show_serial_number
+        self.session.sensor_callback = self.on_sensor_type
+        self.session.settings_callback = self.on_settings_accepted
+        self.session.columns_callback = self.reset_data_buffer
         self.sensor = None
         self.plot = None
+        self.cal = None
         # Store interval settings separately
         self.interval_setting_hour = tk.IntVar(value=0)
         self.interval_setting_min = tk.IntVar(value=0)
@@ -64,16 +106,25 @@ class OpenOBSApp(tk.Tk):
         self.cb_delay_var = tk.BooleanVar()
         self.battery_mah = tk.IntVar(value=2000)
         self.custom_battery_mah = tk.StringVar(value="2000")
-        self.data_headers = []
+        self.data_buffer = RingBuffer(capacity=DATA_BUFFER_SAMPLES)
         self.debug_mode = tk.BooleanVar(value=False)  # Add debug mode variable
+        self.debug_mode.trace_add("write", lambda *args: self.update_debug_mode())
+        self.debug_enabled = False  # Plain copy of debug_mode, safe to read anywhere
+        self.update_interval = UPDATE_INTERVAL_MS  # Adapted to the data rate
+        self.data_job = None  # Pending after() call for process_data_queue
+        self.refresh_pending = False  # New data the plots have not shown yet
+        self.rows_since_refresh = 0
+        self.expected_rate = None  # Samples per second, from the last SET sent
+        self.last_refresh = 0.0
+        # Lines waiting to be written to the serial log widget
+        self.log_buffer = collections.deque(maxlen=LOG_MAX_LINES)
         self.use_test_comm = tk.BooleanVar(
             value=False
         )  # Add TestCommunicator toggle variable
+        self.test_sensor = tk.StringVar(value="VCNL4010")
+        self.test_rate = tk.StringVar(value="100")
 
-        # File logging attributes
-        self.log_file_path = None
-        self.is_logging_to_file = False
-        self.log_file_object = None
+        self.queue_policy = tk.StringVar(value=DATA_QUEUE_POLICY)
 
         # --- Style ---
         style = ttk.Style(self)
@@ -101,6 +152,8 @@ class OpenOBSApp(tk.Tk):
         # Replace the log_frame with a Notebook widget containing tabs for the log and plot
         notebook = ttk.Notebook(self)
         notebook.grid(row=0, column=1, rowspan=3, padx=10, pady=5, sticky="nsew")
+        # Only the figure on the selected tab is drawn
+        self.render_scheduler = RenderScheduler(notebook, MAX_FPS)
 
         # Create a frame for the serial log tab
         log_tab = ttk.Frame(notebook)
@@ -120,11 +173,20 @@ class OpenOBSApp(tk.Tk):
         plot_tab = ttk.Frame(notebook)
         notebook.add(plot_tab, text="Plot")
         self.configure_plot_types(plot_tab)
+        self.render_scheduler.add(plot_tab, lambda: self.plot)
 
         # Initialize a frame for the plotting tab
         calibrate_tab = ttk.Frame(notebook)
         notebook.add(calibrate_tab, text="Calibrate")
         self.configure_calibration_types(calibrate_tab)
+        self.render_scheduler.add(calibrate_tab, lambda: self.cal)
+
+        # Timing of each stage from the serial port to the screen
+        self.notebook = notebook
+        notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed, add="+")
+        self.diagnostics_tab = ttk.Frame(notebook)
+        notebook.add(self.diagnostics_tab, text="Diagnostics")
+        self.configure_diagnostics_tab(self.diagnostics_tab)
 
         # Configure grid expansions
         self.grid_rowconfigure(0, weight=0)  # connection_frame
@@ -144,7 +206,6 @@ class OpenOBSApp(tk.Tk):
         self.cb_ports.bind(
             "<Button-1>", self.update_ports_list
         )  # Update list on dropdown click
-        self.update_ports_list()  # Initial population
 
         self.btn_connect = ttk.Button(
             connection_frame, text="Connect", command=self.toggle_connection
@@ -171,6 +232,8 @@ class OpenOBSApp(tk.Tk):
             command=self.toggle_file_logging,
         )
         self.btn_toggle_file_log.pack(padx=5, pady=5, fill=tk.X)
+        self.lbl_file_backlog = ttk.Label(file_logging_frame, text="")
+        self.lbl_file_backlog.pack(padx=5, anchor="w")
 
         # --- Settings Frame ---
         # Reorganize Settings into Data Logger and Measurements
@@ -266,14 +329,9 @@ class OpenOBSApp(tk.Tk):
         )
         self.cb_delay.pack(side=tk.LEFT, padx=(0, 5))
 
-        # Date Entry (requires tkcalendar)
-        self.dtp_start_date = DateEntry(
-            delay_group, width=10, state=tk.DISABLED, date_pattern="MM/dd/yyyy"
-        )
-        self.dtp_start_date.pack(side=tk.LEFT, padx=(5, 0))
-        self.dtp_start_date.bind(
-            "<<DateEntrySelected>>", lambda e: self.update_battery()
-        )
+        # Date Entry (requires tkcalendar, made once the window is up)
+        self.dtp_start_date = None
+        self.delay_group = delay_group
 
         # Start Time Entry (Using Spinboxes)
         self.start_time_hour_var = tk.IntVar(value=datetime.datetime.now().hour)
@@ -353,37 +411,168 @@ class OpenOBSApp(tk.Tk):
             command=self.toggle_communicator,
         )
         self.cb_use_test_comm.pack(anchor="w")
+        test_frame = ttk.Frame(debug_frame)
+        test_frame.pack(anchor="w")
+        ttk.Label(test_frame, text="Test sensor:").pack(side=tk.LEFT)
+        ttk.Combobox(
+            test_frame,
+            textvariable=self.test_sensor,
+            values=list(SCHEMAS),
+            state="readonly",
+            width=10,
+        ).pack(side=tk.LEFT, padx=5)
+        ttk.Label(test_frame, text="Rate (Hz):").pack(side=tk.LEFT)
+        ttk.Entry(test_frame, textvariable=self.test_rate, width=8).pack(
+            side=tk.LEFT, padx=5
+        )
+
+        queue_frame = ttk.Frame(debug_frame)
+        queue_frame.pack(anchor="w")
+        ttk.Label(queue_frame, text="When the display falls behind:").pack(side=tk.LEFT)
+        cb_queue_policy = ttk.Combobox(
+            queue_frame,
+            textvariable=self.queue_policy,
+            values=POLICIES,
+            state="readonly",
+            width=12,
+        )
+        cb_queue_policy.pack(side=tk.LEFT, padx=5)
+        cb_queue_policy.bind("<<ComboboxSelected>>", self.configure_data_queue)
+        self.lbl_queue_stats = ttk.Label(debug_frame, text="")
+        self.lbl_queue_stats.pack(anchor="w")
+        self.configure_data_queue()
+
+        # Profiling tools, shown in debug mode
+        self.memory_snapshots = MemorySnapshots()
+        self.memory_job = None  # Pending after() call for the next snapshot
+        self.auto_snapshot = tk.BooleanVar(value=False)
+        self.profiling_frame = ttk.Frame(debug_frame)
+        self.btn_profile = ttk.Button(
+            self.profiling_frame, text="Start Profiling", command=self.toggle_profiling
+        )
+        self.btn_profile.pack(side=tk.LEFT, padx=5)
+        ttk.Button(
+            self.profiling_frame,
+            text="Memory Snapshot",
+            command=self.take_memory_snapshot,
+        ).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(
+            self.profiling_frame,
+            text="Hourly",
+            variable=self.auto_snapshot,
+            command=self.toggle_auto_snapshot,
+        ).pack(side=tk.LEFT, padx=5)
+
+        self.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.bind("<<ControlMessage>>", self.process_control_queue)
 
         # Periodically process the data queue
-        self.after(UPDATE_INTERVAL_MS, self.process_data_queue)
+        self.schedule_data_processing(UPDATE_INTERVAL_MS)
+        self.after(LOG_FLUSH_MS, self.flush_log)
+        # The rest waits until the window has been drawn
+        self.after_idle(self.finish_startup)
 
-    def process_data_queue(self):
-        """Process data from the serial communicator's queue."""
-        queue_size = self.ser_com.data_queue.qsize()
-        if queue_size > 50:  # Example threshold for a warning
-            self.log_error(f"Warning: Serial queue size is high ({queue_size} items).")
-
-        data_list = []
-        while not self.ser_com.data_queue.empty():
-            sentence = self.ser_com.data_queue.get()
-            parts = sentence.split(",")
-
-            if parts[0] != "DATA":
-                self.log_error(f"Non data message passed to data queue: {sentence}")
-                return
-            
-            data = {k: float(p) for k, p in zip(self.data_headers, parts[1:])}
-            data_list.append(data)
-            self.log_text(",".join(parts[1:]), "left")
+    def finish_startup(self):
+        """Builds what was left out to show the window sooner."""
+        diagnostics.record("startup.window", time.perf_counter() - STARTED)
+        from tkcalendar import DateEntry  # Imports babel, which is slow
 
-        if data_list:
-            self.plot.update(data_list)
-            self.cal.update(data_list)
+        self.dtp_start_date = DateEntry(
+            self.delay_group, width=10, state=tk.DISABLED, date_pattern="MM/dd/yyyy"
+        )
+        self.dtp_start_date.pack(side=tk.LEFT, padx=(5, 0), after=self.cb_delay)
+        self.dtp_start_date.bind(
+            "<<DateEntrySelected>>", lambda e: self.update_battery()
+        )
+        self.update_ports_list()  # Initial population
+        diagnostics.record("startup.total", time.perf_counter() - STARTED)
 
-        # Schedule the next queue processing
-        self.after(UPDATE_INTERVAL_MS, self.process_data_queue)
+    def schedule_data_processing(self, delay_ms: int):
+        """(Re)schedules process_data_queue, replacing any pending call."""
+        if self.data_job is not None:
+            self.after_cancel(self.data_job)
+        self.data_job = self.after(delay_ms, self.process_data_queue)
+
+    def process_data_queue(self):
+        """Process data from the serial communicator's queue.
+
+        Rows are taken off the queue in chunks until the time or row budget
+        for this tick is spent, so a backlog is worked off over several short
+        ticks instead of one long one. Plots and calibrators take in the new
+        rows at most every PLOT_INTERVAL_MS however often data is ingested,
+        and the render scheduler decides when the visible one is drawn.
+        """
+        self.data_job = None
+        # Normally handled on <<ControlMessage>>; this catches anything missed
+        self.process_control_queue()
+
+        deadline = time.perf_counter() + DRAIN_BUDGET_MS / 1000
+        data_queue = self.ser_com.data_queue
+        n_rows = 0
+        with diagnostics.timer("gui.drain"):
+            while n_rows < DRAIN_BUDGET_ROWS and time.perf_counter() < deadline:
+                blocks = data_queue.get_all(DRAIN_CHUNK_ROWS)
+                if not blocks:
+                    break
+                n_rows += sum(len(block) for block in blocks)
+                self.ingest_blocks(blocks)
+        diagnostics.count("gui.rows", n_rows)
+
+        now = time.perf_counter()
+        # Also refresh before unseen rows could be overwritten in the buffer,
+        # since calibrators read everything added since their last update.
+        if self.refresh_pending and (
+            now - self.last_refresh >= PLOT_INTERVAL_MS / 1000
+            or self.rows_since_refresh >= self.data_buffer.capacity // 2
+        ):
+            self.refresh_pending = False
+            self.rows_since_refresh = 0
+            self.last_refresh = now
+            if self.plot is not None:
+                self.plot.update()
+            if self.cal is not None:
+                self.cal.update()
+
+        self.update_queue_stats()
+        if self.session.log_file_writer:
+            self.update_file_backlog()
+
+        # Come back quickly while behind, and gradually less often when idle.
+        if len(data_queue):
+            self.update_interval = MIN_UPDATE_INTERVAL_MS
+        elif n_rows:
+            self.update_interval = UPDATE_INTERVAL_MS
+        else:
+            self.update_interval = min(
+                MAX_UPDATE_INTERVAL_MS, int(self.update_interval * 1.5)
+            )
+        delay = self.update_interval
+        if self.refresh_pending:
+            # Don't leave new data off the plots for longer than necessary
+            delay = min(delay, PLOT_INTERVAL_MS)
+        self.schedule_data_processing(delay)
+
+    def ingest_blocks(self, blocks: list[np.ndarray]):
+        """Adds parsed blocks, already including their derived columns, to the
+        data buffer."""
+        good = []
+        for block in blocks:
+            if block.shape[1] != len(self.data_buffer.columns):
+                # Parsed before the GUI saw the matching HEADERS sentence
+                self.log_error(f"Dropped {len(block)} samples that do not match headers.")
+                continue
+            good.append(block)
+        if not good:
+            return
+
+        block = good[0] if len(good) == 1 else np.concatenate(good)
+        self.data_buffer.append(block)
+        self.refresh_pending = True
+        self.rows_since_refresh += len(block)
 
     def update_ports_list(self, event=None):
+        import serial.tools.list_ports  # Imported when first needed
+
         ports = [port.device for port in serial.tools.list_ports.comports()]
         self.cb_ports["values"] = ports
         if ports:
@@ -408,6 +597,8 @@ class OpenOBSApp(tk.Tk):
 
             self.serial_log.config(state=tk.NORMAL)  # Enable writing
             self.serial_log.delete("1.0", tk.END)  # Clear log
+            self.serial_log.config(state=tk.DISABLED)
+            self.log_buffer.clear()
             self.ser_com.open_connection(port)
 
             if self.ser_com.is_open:
@@ -417,19 +608,18 @@ class OpenOBSApp(tk.Tk):
                 self.tb_sn.config(state=tk.DISABLED)
 
                 # Clear any leftover data in the serial queue
-                while not self.ser_com.data_queue.empty():
-                    self.ser_com.data_queue.get()
+                self.ser_com.data_queue.clear()
+                self.ser_com.data_queue.reset_stats()
 
-                # Start processing the data queue
-                self.after(UPDATE_INTERVAL_MS, self.process_data_queue)
+                # Start processing the data queue at the normal rate
+                self.update_interval = UPDATE_INTERVAL_MS
+                self.schedule_data_processing(UPDATE_INTERVAL_MS)
 
         else:
             self.ser_com.close_connection()
             if not self.ser_com.is_open:
                 self.btn_connect.config(text="Connect")
-
-                # Stop processing the data queue
-                self.after_cancel(self.process_data_queue)
+                # process_data_queue keeps polling, backing off while idle
 
     def toggle_continuous(self):
         is_continuous = self.cb_continuous_var.get()
@@ -514,15 +704,12 @@ class OpenOBSApp(tk.Tk):
         self.update_battery()  # Update if validation passed or not custom
 
     def send_settings(self):
-        if not self.connected:
+        if not self.session.connected:
             messagebox.showwarning(
                 "Not Connected", "Connect to the device before sending settings."
             )
             return
 
-        # Get current timestamp (Unix epoch seconds)
-        current_time = int(time.time())
-
         # Get interval in seconds from Spinboxes
         measure_interval = 0
         if not self.cb_continuous_var.get():
@@ -542,12 +729,11 @@ class OpenOBSApp(tk.Tk):
         if delay_start is None:
             return  # Error handled in get_delay_seconds
 
-        settings_sentence = f"SET,{current_time},{measure_interval},{int(delay_start)},"
-        sensor_words = self.sensor.get_settings_words()
-        settings_sentence += ",".join(sensor_words)
+        # One sample per interval, or the sensor's own rate when continuous
+        self.expected_rate = 1 / measure_interval if measure_interval else CONTINUOUS_RATE_HZ
 
-        self.ser_com.send_serial_message(settings_sentence)
-        self.log_text("Settings sent, awaiting confirmation...", "center")
+        sensor_words = self.sensor.get_settings_words()
+        self.session.send_settings(measure_interval, delay_start, sensor_words)
 
     # --- Core Logic ---
     def get_delay_seconds(self):
@@ -587,71 +773,181 @@ class OpenOBSApp(tk.Tk):
             )
             return None  # Indicate error
 
-    def process_received_sentence(self, sentence: str):
-        """Processes a complete message received from the serial port."""
-        parts = sentence.split(",")
-
-        command = parts[0].upper()  # Make comparison case-insensitive
-        if command == "OPENOBS":
-            # Send acknowledgment back to the datalogger immediately
-            self.ser_com.send_serial_message("OPENOBS")
-
-            # Device sends serial number as handshake (Ex. $OPENOBS,446*50)
-            self.connected = True  # Confirm connection on valid OPENOBS
-            self.log_text("Device handshake received.", "center")
-
-            self.tb_sn.config(state=tk.NORMAL)
-            self.tb_sn.delete(0, tk.END)
-            self.tb_sn.insert(0, parts[1])
-            self.tb_sn.config(state=tk.DISABLED)
-
-        elif command == "SENSOR" or command == "READY":
-            # Device sends sensor configuration type after handshake.
-            if command == "READY":
-                # For backwards compatibility
-                self.sensor_type = "VCNL4010"
-                self.data_headers = ["time","millis","ambient_light","backscatter","pressure","water_temp","battery"]
+    def notify_control_message(self):
+        """Called from the reader thread after it queues a control sentence.
+
+        Only one wake-up event is posted until the queue has been drained, so
+        a burst of sentences costs the reader a single cross-thread call.
+        """
+        if not self.control_event_pending:
+            self.control_event_pending = True
+            try:
+                self.event_generate("<<ControlMessage>>", when="tail")
+            except (tk.TclError, RuntimeError):
+                pass  # Window closing; the data loop drains the queue anyway
+
+    def process_control_queue(self, event=None):
+        """Handles every control sentence queued by the reader thread."""
+        self.control_event_pending = False
+        self.session.process_control_queue()
+
+    def show_serial_number(self, serial_number):
+        self.tb_sn.config(state=tk.NORMAL)
+        self.tb_sn.delete(0, tk.END)
+        self.tb_sn.insert(0, serial_number or "")
+        self.tb_sn.config(state=tk.DISABLED)
+
+    def on_sensor_type(self, sensor_type):
+        self.configure_sensor_settings()
+        self.btn_send_settings.config(state=tk.NORMAL)
+        self.log_text("Send settings when ready", "center")
+
+    def on_settings_accepted(self):
+        self.btn_send_settings.config(state=tk.DISABLED)  # Disable after success
+
+    def reset_data_buffer(self, columns):
+        """Sets up the data buffer for the sensor headers plus any calibrated
+        columns derived from them."""
+        self.data_buffer.reset(columns, capacity=self.get_buffer_capacity(len(columns)))
+
+    def get_buffer_capacity(self, n_columns: int) -> int:
+        """Samples to keep in memory, from the expected rate and a memory cap.
+
+        The buffer stores two float64 values per sample and column.
+        """
+        if self.expected_rate is None:
+            return DATA_BUFFER_SAMPLES
+        wanted = int(self.expected_rate * DATA_BUFFER_SECONDS)
+        affordable = DATA_BUFFER_MAX_BYTES // (16 * max(1, n_columns))
+        return max(DATA_BUFFER_MIN_SAMPLES, min(wanted, affordable))
+
+    def configure_data_queue(self, event=None):
+        """Applies the backlog policy and file tap to the communicator's queue."""
+        data_queue = self.ser_com.data_queue
+        data_queue.max_rows = DATA_QUEUE_ROWS
+        data_queue.policy = self.queue_policy.get()
+        self.session.attach(self.ser_com)  # Logs rows to file from the reader
+
+    def update_queue_stats(self):
+        data_queue = self.ser_com.data_queue
+        text = f"Display queue: {len(data_queue)} rows (peak {data_queue.high_water})"
+        if data_queue.rows_dropped:
+            text += f", {data_queue.rows_dropped} dropped"
+        if data_queue.rows_decimated:
+            text += f", {data_queue.rows_decimated} decimated"
+        self.lbl_queue_stats.config(text=text)
+
+    def configure_diagnostics_tab(self, diagnostics_tab):
+        # Read through self.ser_com, which is replaced when switching to test mode
+        gauges = {
+            "queue.rows": lambda: len(self.ser_com.data_queue),
+            "queue.peak_rows": lambda: self.ser_com.data_queue.high_water,
+            "queue.dropped_rows": lambda: self.ser_com.data_queue.rows_dropped,
+            "buffer.samples": lambda: len(self.data_buffer),
+            "render.frames": lambda: self.render_scheduler.frames,
+        }
+        for name, read in gauges.items():
+            diagnostics.add_gauge(name, read)
+
+        columns = ["count"] + [f"p{q}" for q in PERCENTILES] + ["max"]
+        self.diagnostics_tree = ttk.Treeview(
+            diagnostics_tab, columns=columns, height=20
+        )
+        self.diagnostics_tree.heading("#0", text="Stage")
+        for column in columns:
+            heading = column if column == "count" else f"{column} (ms)"
+            self.diagnostics_tree.heading(column, text=heading)
+            self.diagnostics_tree.column(column, width=80, anchor="e")
+        self.diagnostics_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        buttons_frame = ttk.Frame(diagnostics_tab)
+        buttons_frame.pack(anchor="w", padx=5, pady=5)
+        for file_format in ("json", "csv"):
+            ttk.Button(
+                buttons_frame,
+                text=f"Export {file_format.upper()}",
+                command=lambda f=file_format: self.export_diagnostics(f),
+            ).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Reset", command=diagnostics.reset).pack(
+            side=tk.LEFT, padx=5
+        )
+        self.diagnostics_snapshot = None
+        self.after(DIAGNOSTICS_INTERVAL_MS, self.update_diagnostics)
+
+    def update_diagnostics(self):
+        """Refreshes the Diagnostics tab while it is shown."""
+        self.after(DIAGNOSTICS_INTERVAL_MS, self.update_diagnostics)
+        if self.notebook.select() != str(self.diagnostics_tab):
+            return
+
+        snapshot = diagnostics.snapshot()
+        self.diagnostics_snapshot = snapshot
+        tree = self.diagnostics_tree
+        tree.delete(*tree.get_children())
+        stages = tree.insert("", tk.END, text="Latency", open=True)
+        for name, summary in snapshot["stages"].items():
+            values = [summary["count"]] + [
+                f"{summary[key] * 1000:.3f}"
+                for key in [f"p{q}" for q in PERCENTILES] + ["max"]
+            ]
+            tree.insert(stages, tk.END, text=name, values=values)
+        counters = tree.insert(
+            "", tk.END, text="Counters (total, per second)", open=True
+        )
+        for name, counter in snapshot["counters"].items():
+            values = [counter["total"], f"{counter['per_second']:.0f}/s"]
+            tree.insert(counters, tk.END, text=name, values=values)
+        gauges = tree.insert("", tk.END, text="Gauges", open=True)
+        for name, value in snapshot["gauges"].items():
+            tree.insert(gauges, tk.END, text=name, values=[value])
+
+    def export_diagnostics(self, file_format: str):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=f".{file_format}",
+            filetypes=[
+                (f"{file_format.upper()} files", f"*.{file_format}"),
+                ("All files", "*.*"),
+            ],
+            title="Export Diagnostics",
+        )
+        if not file_path:
+            return
+        try:
+            if file_format == "json":
+                diagnostics.export_json(file_path, self.diagnostics_snapshot)
             else:
-                self.sensor_type = parts[1].strip()
-
-            self.configure_sensor_settings()
-            self.btn_send_settings.config(state=tk.NORMAL)
-            self.log_text(f"Sensor configured: {self.sensor_type}", "center")
-            self.log_text("Send settings when ready", "center")
-
-        elif command == "SET" and len(parts) > 1 and parts[1].upper() == "SUCCESS":
-            # Device sends $SET,SUCCESS*2D after receiving valid settings
-            self.btn_send_settings.config(state=tk.DISABLED)  # Disable after success
-            self.log_text("Settings Received Successfully", "center")
-
-        elif command == "FILE" and len(parts) > 1 and parts[1].upper() == "OPEN":
-            # Device sends $FILE,OPEN,FILENAME.TXT*XX
-            filename = parts[2] if len(parts) > 2 else "UNKNOWN"
-            self.log_text(f"Logging to ({filename}) ", "center")
-            self.log_text("--- Sample Readings ---", "center")
-
-        elif command == "HEADERS":
-            # Store headers for later use
-            self.data_headers = parts[1:]  # Store headers for later use
-            self.log_text(f"Headers: {', '.join(self.data_headers)}", "center")
-
-            if self.is_logging_to_file and self.log_file_object:
-                try:
-                    self.log_file_object.write(",".join(parts[1:]) + "\n")
-                    self.log_file_object.flush()
-                except IOError as e:
-                    self.log_error(f"File logging error: {e}")
+                diagnostics.export_csv(file_path, self.diagnostics_snapshot)
+        except IOError as e:
+            messagebox.showerror("Export Error", f"Could not write {file_path}: {e}")
+            return
+        self.log_text(f"Diagnostics exported to {file_path}", "center", "info")
 
-        # Handle potential error messages
-        elif command == "SDINIT" and len(parts) > 1 and parts[1] == "0":
-            self.log_error("SD Card Error: Initialization failed!")
-            self.log_error("Check for missing or corrupted SD card.")
+    def load_calibration(self):
+        """Loads saved calibration models to apply to incoming data."""
+        file_paths = filedialog.askopenfilenames(
+            title="Load Calibration Models",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+        )
+        for file_path in file_paths:
+            try:
+                names = self.session.derived_channels.load(file_path)
+                self.log_text(f"Loaded calibration: {', '.join(names)}", "center")
+            except (IOError, ValueError, KeyError) as e:
+                messagebox.showerror(
+                    "Calibration Error", f"Could not load {file_path}:\n{e}"
+                )
+        if file_paths:
+            self.session.set_data_columns()
+            self.update_derived_label()
 
-        elif command == "CLKINIT" and len(parts) > 1 and parts[1] == "0":
-            self.log_error("RTC Error: Clock initialization failed!")
+    def clear_calibrations(self):
+        self.session.derived_channels.clear()
+        self.session.set_data_columns()
+        self.update_derived_label()
 
-        else:
-            self.log_error(f"Unknown serial message {sentence}")
+    def update_derived_label(self):
+        names = [ch.name for ch in self.session.derived_channels.channels]
+        self.lbl_derived.config(text="\n".join(names) if names else "None loaded")
 
     def update_battery(self):
         """Calculates and displays the estimated battery life."""
@@ -793,28 +1089,108 @@ class OpenOBSApp(tk.Tk):
             self.log_error(f"Upload Failed: {e}")
 
     def log_text(self, message: str, justification: str = "left", tag: str = None):
-        """Appends text to the serial log Text widget."""
-        if not self.debug_mode.get() and tag == "debug":
+        """Queues text for the serial log widget.
+
+        Lines are only buffered here and written to the widget in one batch by
+        flush_log, so this is cheap to call often and from any thread.
+        """
+        if tag == "debug" and not self.debug_enabled:
             return  # Skip printing raw serial messages if debug mode is off
+        self.log_buffer.append((message, justification, tag))
+
+    def flush_log(self):
+        """Writes all pending log lines to the widget with a single insert."""
         try:
-            # Ensure widget exists and is valid before trying to modify
-            if not self.serial_log.winfo_exists():
+            if self.log_buffer and self.serial_log.winfo_exists():
+                args = []
+                for _ in range(len(self.log_buffer)):
+                    message, justification, tag = self.log_buffer.popleft()
+                    args += [message + "\n", self._get_tag(justification, tag)]
+
+                self.serial_log.config(state=tk.NORMAL)  # Enable writing
+                self.serial_log.insert(tk.END, *args)
+
+                # Trim the oldest lines beyond the limit
+                n_lines = int(self.serial_log.index("end-1c").split(".")[0])
+                if n_lines > LOG_MAX_LINES:
+                    self.serial_log.delete("1.0", f"{n_lines - LOG_MAX_LINES}.0")
+
+                self.serial_log.see(tk.END)  # Scroll to the bottom
+                self.serial_log.config(state=tk.DISABLED)  # Disable writing
+        except tk.TclError as e:
+            # Handle cases where the widget might be destroyed during shutdown
+            print(f"Error updating log widget: {e}")
+            return
+
+        self.after(LOG_FLUSH_MS, self.flush_log)
+
+    def update_debug_mode(self):
+        self.debug_enabled = self.debug_mode.get()
+        self.ser_com.debug = self.debug_enabled
+        if self.debug_enabled:
+            self.profiling_frame.pack(anchor="w")
+            return
+
+        # Profiling and tracing slow everything down, so end them with debug mode
+        self.profiling_frame.pack_forget()
+        if profiler.active:
+            self.toggle_profiling()
+        self.auto_snapshot.set(False)
+        self.toggle_auto_snapshot()
+        if self.memory_snapshots.tracing:
+            self.memory_snapshots.stop()
+            self.log_text("Stopped memory tracing.", "center", "info")
+
+    def toggle_profiling(self):
+        """Starts or stops profiling the GUI and reader threads."""
+        if not profiler.active:
+            try:
+                profiler.start()
+            except ValueError as e:
+                self.log_error(f"Could not start profiling: {e}")
                 return
+            self.btn_profile.config(text="Stop Profiling")
+            self.log_text("Profiling started.", "center", "info")
+            return
 
-            self.serial_log.config(state=tk.NORMAL)  # Enable writing
+        self.btn_profile.config(text="Start Profiling")
+        try:
+            paths = profiler.stop(PROFILE_DIR)
+        except OSError as e:
+            self.log_error(f"Could not save profile: {e}")
+            return
+        self.log_text(f"Profile saved to {paths[-1]}", "center", "info")
 
-            # Insert the message with the appropriate tag and justification
-            jtag = self._get_tag(justification, tag)
-            self.serial_log.insert(tk.END, message + "\n", jtag)
+    def take_memory_snapshot(self):
+        starting = not self.memory_snapshots.tracing
+        try:
+            paths = self.memory_snapshots.take(PROFILE_DIR)
+        except OSError as e:
+            self.log_error(f"Could not save memory snapshot: {e}")
+            return
+        if starting:
+            self.log_text(
+                "Memory tracing started; later snapshots show growth since now.",
+                "center",
+                "info",
+            )
+        self.log_text(f"Memory snapshot saved to {paths[0]}", "center", "info")
+
+    def toggle_auto_snapshot(self):
+        if self.memory_job is not None:
+            self.after_cancel(self.memory_job)
+            self.memory_job = None
+        if self.auto_snapshot.get():
+            self.take_memory_snapshot()
+            self.memory_job = self.after(
+                MEMORY_SNAPSHOT_INTERVAL_MS, self.repeat_memory_snapshot
+            )
 
-            self.serial_log.see(tk.END)  # Scroll to the bottom
-            self.serial_log.config(state=tk.DISABLED)  # Disable writing
-            self.update_idletasks()  # Ensure log updates immediately
-        except tk.TclError as e:
-            # Handle cases where the widget might be destroyed during shutdown
-            print(f"Error updating log widget: {e}")
-        except Exception as e:
-            print(f"Unexpected error logging: {e}")
+    def repeat_memory_snapshot(self):
+        self.take_memory_snapshot()
+        self.memory_job = self.after(
+            MEMORY_SNAPSHOT_INTERVAL_MS, self.repeat_memory_snapshot
+        )
 
     def log_error(self, message):
         self.log_text(message, "center", "error")
@@ -852,11 +1228,27 @@ class OpenOBSApp(tk.Tk):
         self.plot_settings_frame = ttk.Frame(plot_controls_frame)
         self.plot_settings_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
-        # Create a matplotlib figure and axis and add it to the plot tab
-        self.plot_fig, self.plot_ax = plt.subplots()  # figsize=(8, 4))
-        self.plot_canvas = FigureCanvasTkAgg(self.plot_fig, master=plot_tab)
-        self.plot_canvas_widget = self.plot_canvas.get_tk_widget()
-        self.plot_canvas_widget.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # The matplotlib figure is made the first time the tab is shown
+        self.plot_tab = plot_tab
+        self.plot_canvas = None
+
+    def on_tab_changed(self, event=None):
+        """Makes the figure of the plot or calibration tab when first shown."""
+        from util.timed_canvas import make_figure  # Imports matplotlib
+
+        tab = self.notebook.select()
+        if tab == str(self.plot_tab) and self.plot_canvas is None:
+            with diagnostics.timer("gui.make_figure"):
+                figure = make_figure(self.plot_tab)
+            self.plot_fig, self.plot_ax, self.plot_canvas = figure
+            if self.sensor is not None:
+                self.update_plot_settings()
+        elif tab == str(self.cal_tab) and self.cal_canvas is None:
+            with diagnostics.timer("gui.make_figure"):
+                figure = make_figure(self.cal_tab)
+            self.cal_fig, self.cal_ax, self.cal_canvas = figure
+            if self.sensor is not None:
+                self.update_calibration_settings()
 
     def update_plot_types(self):
         self.plot_types = get_valid_plots(self.sensor.name)
@@ -869,14 +1261,29 @@ class OpenOBSApp(tk.Tk):
         self.update_plot_settings()
 
     def update_plot_settings(self, event=None):
+        if self.plot_canvas is None:
+            return  # The plot is made along with its figure
+
         for widget in self.plot_settings_frame.winfo_children():
             widget.destroy()
 
+        if self.plot is not None:
+            self.plot.close()
+
         plot_name = self.plot_type_var.get()
         plot_class = self.plot_types[plot_name]
         self.plot = plot_class(
-            self.plot_canvas, self.plot_fig, self.plot_ax, self.plot_settings_frame
+            self.plot_canvas,
+            self.plot_fig,
+            self.plot_ax,
+            self.plot_settings_frame,
+            self.data_buffer,
         )
+        self.plot.request_render = self.render_scheduler.request
+        self.plot.dirty = True  # Show the cleared axes even without data
+        if len(self.data_buffer):
+            self.plot.update()  # Show the history that is already buffered
+        self.render_scheduler.request()
 
     def configure_calibration_types(self, calibrate_tab):
         # Layout the controls in the plotting tab
@@ -903,15 +1310,23 @@ class OpenOBSApp(tk.Tk):
         )
         btn_cal_reset.pack()
 
+        # Saved models applied to incoming data as extra columns
+        derived_frame = ttk.LabelFrame(
+            cal_controls_frame, text="Applied Models", padding=(10, 5)
+        )
+        derived_frame.pack(side=tk.RIGHT, fill=tk.Y)
+        ttk.Button(derived_frame, text="Load", command=self.load_calibration).pack()
+        ttk.Button(derived_frame, text="Clear", command=self.clear_calibrations).pack()
+        self.lbl_derived = ttk.Label(derived_frame, text="None loaded")
+        self.lbl_derived.pack()
+
         # Area for specific plot type settings
         self.cal_settings_frame = ttk.Frame(cal_controls_frame)
         self.cal_settings_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
-        # Create a matplotlib figure and axis and add it to the cal tab
-        self.cal_fig, self.cal_ax = plt.subplots()  # figsize=(8, 4))
-        self.cal_canvas = FigureCanvasTkAgg(self.cal_fig, master=calibrate_tab)
-        self.cal_canvas_widget = self.cal_canvas.get_tk_widget()
-        self.cal_canvas_widget.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # The matplotlib figure is made the first time the tab is shown
+        self.cal_tab = calibrate_tab
+        self.cal_canvas = None
 
     def update_calibration_types(self):
         self.cal_types = get_valid_calibrations(self.sensor.name)
@@ -924,25 +1339,35 @@ class OpenOBSApp(tk.Tk):
         self.update_calibration_settings()
 
     def update_calibration_settings(self, event=None):
+        if self.cal_canvas is None:
+            return  # The calibrator is made along with its figure
+
         for widget in self.cal_settings_frame.winfo_children():
             widget.destroy()
 
         cal_name = self.cal_type_var.get()
         cal_class = self.cal_types[cal_name]
         self.cal = cal_class(
-            self.cal_canvas, self.cal_fig, self.cal_ax, self.cal_settings_frame
+            self.cal_canvas,
+            self.cal_fig,
+            self.cal_ax,
+            self.cal_settings_frame,
+            self.data_buffer,
         )
+        self.cal.request_render = self.render_scheduler.request
+        self.cal.dirty = True
+        self.render_scheduler.request()
 
     def configure_sensor_settings(self):
         for widget in self.sensors_frame.winfo_children():
             widget.destroy()
 
-        self.sensor = make_sensor_obj(self.sensor_type, self.sensors_frame)
+        self.sensor = make_sensor_obj(self.session.sensor_type, self.sensors_frame)
         self.update_plot_types()
         self.update_calibration_types()
 
     def toggle_file_logging(self):
-        if not self.is_logging_to_file:
+        if self.session.log_file_writer is None:
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".txt",
                 filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
@@ -950,59 +1375,120 @@ class OpenOBSApp(tk.Tk):
             )
             if file_path:
                 try:
-                    self.log_file_object = open(file_path, "w")
-                    self.log_file_path = file_path
-                    self.is_logging_to_file = True
-                    self.btn_toggle_file_log.config(text="Stop Logging to File")
-                    self.log_text(
-                        f"Logging to file: {self.log_file_path}", "center", "info"
+                    self.session.start_file_logging(
+                        file_path,
+                        flush_rows=LOG_FLUSH_ROWS,
+                        flush_interval=LOG_FLUSH_SECONDS,
+                        fsync=LOG_FSYNC,
                     )
+                    self.btn_toggle_file_log.config(text="Stop Logging to File")
+                    self.log_text(f"Logging to file: {file_path}", "center", "info")
                 except IOError as e:
                     messagebox.showerror(
                         "File Error", f"Could not open file for logging:\n{e}"
                     )
-                    self.log_file_path = None
-                    self.log_file_object = None
             else:  # User cancelled
                 return
         else:
-            if self.log_file_object:
-                try:
-                    self.log_file_object.close()
-                except IOError as e:
-                    messagebox.showerror("File Error", f"Error closing log file:\n{e}")
-            self.log_text(
-                f"Stopped logging to file: {self.log_file_path}", "center", "info"
-            )
-            self.is_logging_to_file = False
-            self.log_file_object = None
-            self.log_file_path = None
+            self.close_log_file()
             self.btn_toggle_file_log.config(text="Start Logging to File")
+            self.update_file_backlog()
+
+    def close_log_file(self, then=None):
+        """Stops logging and closes the file on a background thread.
+
+        Writing out the backlog can take seconds, so the Tk thread only polls
+        until it is done and then reports the result. `then` is called with
+        the report once the file is closed.
+        """
+        writer = self.session.stop_file_logging()
+        if writer is None:
+            if then:
+                then(None)
+            return
+
+        self.log_text(f"Stopped logging to file: {writer.file_path}", "center", "info")
+        closer = threading.Thread(target=writer.close, daemon=True)
+        closer.start()
+        self._report_log_file_closed(closer, writer, then)
+
+    def _report_log_file_closed(self, closer, writer, then):
+        if closer.is_alive():
+            self.after(
+                LOG_CLOSE_POLL_MS, self._report_log_file_closed, closer, writer, then
+            )
+            return
+
+        if writer.closed:
+            message = (
+                f"Closed log file: {writer.file_path} ({writer.rows_written} rows"
+            )
+            if writer.rows_dropped:
+                message += f", {writer.rows_dropped} dropped"
+            message += ")"
+            self.log_text(message, "center", "info")
+        else:
+            message = f"Log file {writer.file_path} was not closed in time."
+            self.log_error(message)
+        if then:
+            then(message)
+
+    def update_file_backlog(self):
+        """Shows how many rows are waiting to be written to the log file."""
+        writer = self.session.log_file_writer
+        if writer:
+            text = f"Write backlog: {writer.backlog} rows"
+            if writer.rows_dropped:
+                text += f" ({writer.rows_dropped} dropped)"
+        else:
+            text = ""
+        self.lbl_file_backlog.config(text=text)
 
     def toggle_communicator(self):
         """Switches between TestCommunicator and SerialCommunicator based on the checkbox state."""
         if self.use_test_comm.get():
+            try:
+                rate_hz = float(self.test_rate.get())
+                if not rate_hz > 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror(
+                    "Input Error", "Test rate must be a positive number."
+                )
+                self.use_test_comm.set(False)
+                return
             self.ser_com = TestCommunicator(
-                self.log_text, self.process_received_sentence
+                self.log_text,
+                self.notify_control_message,
+                messagebox.showerror,
+                sensor=self.test_sensor.get(),
+                rate_hz=rate_hz,
             )
+            self.ser_com.debug = self.debug_enabled
+            self.configure_data_queue()
             self.log_text("Switched to TestCommunicator.", "center", "info")
         else:
             self.ser_com = SerialCommunicator(
-                self.log_text, self.process_received_sentence
+                self.log_text, self.notify_control_message, messagebox.showerror
             )
+            self.ser_com.debug = self.debug_enabled
+            self.configure_data_queue()
             self.log_text("Switched to SerialCommunicator.", "center", "info")
 
     def on_closing(self):
         """Handles window close event."""
-        self.ser_com.close_connection()
+        if profiler.active:
+            self.toggle_profiling()  # Keep what was profiled so far
+        if self.ser_com.is_open:
+            self.ser_com.close_connection()
 
-        if self.is_logging_to_file and self.log_file_object:
-            try:
-                self.log_file_object.close()
-                print(f"Closed log file: {self.log_file_path}")
-            except IOError as e:
-                print(f"Error closing log file on exit: {e}")
+        # Hide the window while the log file's backlog is written out
+        self.withdraw()
+        self.close_log_file(then=self._finish_closing)
 
+    def _finish_closing(self, message):
+        if message:
+            print(message)
         self.destroy()  # Close the Tkinter window
 
 
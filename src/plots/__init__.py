@@ -1,19 +1,39 @@
+import importlib
+
 from ._base_plot import BasePlot
-from .time_series_plot import TimeSeriesPlot
-from .scatter_plot import ScatterPlot
-from .real_time_spectrum_plot import RealTimeSpectrumPlot
+
+# Module, class and valid sensors ("any" or a list) of every plot. A module
+# is only imported once a sensor it supports connects.
+PLOTS = [
+    ("time_series_plot", "TimeSeriesPlot", "any"),
+    ("scatter_plot", "ScatterPlot", "any"),
+    ("real_time_spectrum_plot", "RealTimeSpectrumPlot", ["AS7265X"]),
+    ("spectral_waterfall_plot", "SpectralWaterfallPlot", ["AS7265X"]),
+]
+
+
+def _load(module_name: str, class_name: str) -> type[BasePlot]:
+    module = importlib.import_module(f".{module_name}", __name__)
+    return getattr(module, class_name)
+
+
+def __getattr__(name: str):
+    # Keeps `from plots import TimeSeriesPlot` working without eager imports
+    for module_name, class_name, _ in PLOTS:
+        if name == class_name:
+            return _load(module_name, class_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_valid_plots(sensor_type: str) -> dict[str, BasePlot]:
     """
     Returns a list of plot classes that are valid for the given sensor type.
     """
-    plot_classes = [TimeSeriesPlot, ScatterPlot, RealTimeSpectrumPlot]
     valid_plots = {}
 
-    for plot_class in plot_classes:
-        valid_sensors = plot_class._valid_sensors
+    for module_name, class_name, valid_sensors in PLOTS:
         if sensor_type in valid_sensors or valid_sensors == "any":
+            plot_class = _load(module_name, class_name)
             valid_plots[plot_class._name] = plot_class
 
     return valid_plots
@@ -1,25 +1,45 @@
 from abc import ABC, abstractmethod
 from tkinter import ttk
-from matplotlib.figure import Figure
-from matplotlib.axes import Axes
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from typing import TYPE_CHECKING
+
+from util.ring_buffer import RingBuffer
+from util.diagnostics import timed
+
+if TYPE_CHECKING:  # matplotlib is imported when the first figure is made
+    from matplotlib.figure import Figure
+    from matplotlib.axes import Axes
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 
 class BasePlot(ABC):
-    _valid_sensors = "any"  # Can specify a list, e.g. ['VCNL4010','ExampleSensor2']
     _name = "base"
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Time every implementation for the Diagnostics tab
+        for method in ("update", "render"):
+            if method in cls.__dict__:
+                timed_method = timed(f"plot.{method}")(cls.__dict__[method])
+                setattr(cls, method, timed_method)
+
     def __init__(
         self,
-        canvas: FigureCanvasTkAgg,
-        fig: Figure,
-        ax: Axes,
+        canvas: "FigureCanvasTkAgg",
+        fig: "Figure",
+        ax: "Axes",
         controls_frame: ttk.Frame,
+        data: RingBuffer,
     ):
         self.canvas = canvas
         self.fig = fig
         self.ax = ax
         self.controls_frame = controls_frame
+        self.data = data  # Shared sample store owned by the app
+        self._callback_ids = []  # Canvas callbacks to release in close()
+        self._background = None  # Axes pixels without animated artists
+        self.dirty = False  # Artists changed since the last render
+        self._full_redraw = False  # Next render must redraw the whole canvas
+        self.request_render = lambda: None  # Set by the app's render scheduler
 
         self.ax.clear()
         self._setup_controls()
@@ -36,6 +56,53 @@ class BasePlot(ABC):
         pass
 
     @abstractmethod
-    def update(self, data: list[dict]):
-        """Update the plot with new data."""
+    def update(self):
+        """Update the plot with new data from `self.data`."""
         pass
+
+    def _animated_artists(self) -> list:
+        """Artists drawn with animated=True that are blitted in _redraw."""
+        return []
+
+    def _enable_blitting(self):
+        """Caches the static background after every full draw of the canvas."""
+        self._callback_ids.append(self.canvas.mpl_connect("draw_event", self._on_draw))
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self._animated_artists():
+            self.ax.draw_artist(artist)
+
+    def _redraw(self, full: bool = False):
+        """Marks the plot for drawing on the next frame.
+
+        `full` is needed when anything other than the animated artists changed,
+        such as the axes limits or the legend.
+        """
+        self.dirty = True
+        self._full_redraw |= full
+        self.request_render()
+
+    @timed("plot.render")
+    def render(self):
+        """Draws pending changes, blitting only the animated artists when possible."""
+        full = self._full_redraw
+        self.dirty = False
+        self._full_redraw = False
+        if full or self._background is None or not self.canvas.supports_blit:
+            # Don't blit onto the old background before the new one is cached
+            self._background = None
+            self.canvas.draw_idle()  # Re-caches the background in _on_draw
+        else:
+            self.canvas.restore_region(self._background)
+            self._draw_animated()
+            self.canvas.blit(self.ax.bbox)
+
+    def close(self):
+        """Releases canvas callbacks before the plot is replaced."""
+        for cid in self._callback_ids:
+            self.canvas.mpl_disconnect(cid)
+        self._callback_ids = []
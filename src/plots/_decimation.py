@@ -0,0 +1,207 @@
+import numpy as np
+
+from util.ring_buffer import RingBuffer
+
+
+def group_reduce(ufunc, values: np.ndarray, group: int) -> np.ndarray:
+    """Reduces consecutive groups of `group` samples along the last axis.
+
+    A trailing partial group is included. With np.fmin/np.fmax, NaNs are
+    ignored unless a whole group is NaN, which keeps gaps visible.
+    """
+    n = values.shape[-1]
+    n_groups = -(-n // group)
+    pad = n_groups * group - n
+    if pad:
+        filler = np.full(values.shape[:-1] + (pad,), np.nan)
+        values = np.concatenate((values, filler), axis=-1)
+    return ufunc.reduce(values.reshape(values.shape[:-1] + (n_groups, group)), axis=-1)
+
+
+def interleave(mins: np.ndarray, maxs: np.ndarray) -> np.ndarray:
+    """Alternates min and max along the last axis, for drawing an envelope."""
+    return np.stack((mins, maxs), axis=-1).reshape(mins.shape[:-1] + (-1,))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of about `n_out` points chosen by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept and the rest are split into
+    equal buckets. Each bucket keeps the point forming the largest triangle
+    with the means of its neighbouring buckets. Using the previous bucket's
+    mean, rather than its chosen point, lets every bucket be solved at once.
+    """
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    n_buckets = n_out - 2
+    size = (n - 2) // n_buckets
+    start = n - 1 - n_buckets * size  # Extra points go to the first bucket's side
+    xb = x[start : n - 1].reshape(n_buckets, size)
+    yb = y[start : n - 1].reshape(n_buckets, size)
+
+    finite = np.isfinite(yb)
+    count = finite.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = np.where(finite, xb, 0).sum(axis=1) / count
+        y_mean = np.where(finite, yb, 0).sum(axis=1) / count
+
+    ax = np.concatenate(([x[0]], x_mean[:-1]))[:, None]
+    ay = np.concatenate(([y[0]], y_mean[:-1]))[:, None]
+    cx = np.concatenate((x_mean[1:], [x[-1]]))[:, None]
+    cy = np.concatenate((y_mean[1:], [y[-1]]))[:, None]
+    area = np.abs((ax - cx) * (yb - ay) - (ax - xb) * (cy - ay))
+    # An all-NaN bucket keeps a NaN point, so the gap is still drawn.
+    area = np.where(np.isnan(area), -1.0, area)
+
+    chosen = area.argmax(axis=1) + start + np.arange(n_buckets) * size
+    return np.concatenate(([0], chosen, [n - 1]))
+
+
+class _Level:
+    def __init__(self, size: int, buffer: RingBuffer):
+        self.size = size  # Samples per bin
+        self.buffer = buffer  # One row of (min..., max...) per complete bin
+        self.next_bin = 0  # Running number of the next bin to complete
+
+    @property
+    def first_bin(self) -> int:
+        return self.next_bin - len(self.buffer)
+
+
+class MinMaxLevels:
+    """Min and max of every buffer column over bins of factor, factor², ... samples.
+
+    Bins are aligned to the running sample number. On each update the finest
+    level is extended from the newly appended samples and every coarser level
+    from the one below it, so the cost is proportional to the new data. A
+    window of any length is then reduced by reading a single level plus at
+    most one partial bin of raw samples at each end.
+    """
+
+    def __init__(self, data: RingBuffer, factor: int = 4, min_bins: int = 256):
+        self.data = data
+        self.factor = factor
+        self.min_bins = min_bins  # Coarsest level still has this many bins
+        self.levels = []
+        self.columns = None
+        self.capacity = None
+        self.samples_seen = 0  # Value of data.total when last updated
+
+    def _reset(self):
+        self.columns = list(self.data.columns)
+        self.capacity = self.data.capacity
+        n_cols = len(self.columns)
+        names = [f"min{i}" for i in range(n_cols)] + [f"max{i}" for i in range(n_cols)]
+
+        self.levels = []
+        size = self.factor
+        while self.capacity // size >= self.min_bins:
+            buffer = RingBuffer(names, capacity=self.capacity // size + 1)
+            self.levels.append(_Level(size, buffer))
+            size *= self.factor
+
+        # Start with the first complete bin of the samples already buffered.
+        oldest = self.data.total - len(self.data)
+        for level in self.levels:
+            level.next_bin = -(-oldest // level.size)
+
+    def update(self):
+        if (
+            self.columns != self.data.columns
+            or self.capacity != self.data.capacity
+            or self.data.total < self.samples_seen
+        ):
+            self._reset()
+        self.samples_seen = self.data.total
+
+        n_cols = len(self.columns)
+        below = None
+        for level in self.levels:
+            if below is None:
+                # Finest level, binned from the raw samples
+                group = level.size
+                first = -(-(self.data.total - len(self.data)) // group) * group
+                stop = self.data.total // group * group
+                source_stop = self.data.total
+            else:
+                group = self.factor
+                first = -(-below.first_bin // group) * group
+                stop = below.next_bin // group * group
+                source_stop = below.next_bin
+
+            start = level.next_bin * group
+            if start < first:
+                # Updates fell too far behind; the level restarts with a gap.
+                level.buffer.reset(level.buffer.columns)
+                start = first
+                level.next_bin = start // group
+            if stop > start:
+                if below is None:
+                    rows = self.data.view(source_stop - start)[:, : stop - start]
+                    mins = group_reduce(np.fmin, rows, group)
+                    maxs = group_reduce(np.fmax, rows, group)
+                else:
+                    rows = below.buffer.view(source_stop - start)[:, : stop - start]
+                    mins = group_reduce(np.fmin, rows[:n_cols], group)
+                    maxs = group_reduce(np.fmax, rows[n_cols:], group)
+                level.buffer.append(np.concatenate((mins, maxs)).T)
+            level.next_bin = max(level.next_bin, stop // group)
+            below = level
+
+    def envelope(self, n: int, n_bins: int, rows: list[int]):
+        """Min and max of the newest `n` samples of `rows`, in about `n_bins` bins.
+
+        Returns (starts, mins, maxs), where `starts` is the sample number at
+        which each bin begins and `mins` and `maxs` are (len(rows), n_out).
+        """
+        rows = list(rows)
+        total = self.data.total
+        n = min(n, len(self.data))
+        first = total - n
+
+        level = None
+        for candidate in reversed(self.levels):
+            b0 = -(-first // candidate.size)
+            if (
+                n // candidate.size >= n_bins
+                and candidate.first_bin <= b0
+                and candidate.next_bin > b0
+            ):
+                level = candidate
+                break
+
+        if level is None:
+            values = self.data.view(n)[rows]
+            group = max(1, -(-n // n_bins))
+            starts = first + np.arange(-(-n // group)) * group
+            return (
+                starts,
+                group_reduce(np.fmin, values, group),
+                group_reduce(np.fmax, values, group),
+            )
+
+        size = level.size
+        b0 = -(-first // size)
+        b1 = level.next_bin
+        bins = level.buffer.view(b1 - b0)
+        n_cols = len(self.columns)
+        group = max(1, -(-(b1 - b0) // n_bins))
+        mins = group_reduce(np.fmin, bins[rows], group)
+        maxs = group_reduce(np.fmax, bins[[n_cols + r for r in rows]], group)
+        starts = (b0 + np.arange(mins.shape[1]) * group) * size
+
+        # Partial bins at either end come straight from the raw samples.
+        window = self.data.view(n)[rows]
+        head = window[:, : b0 * size - first]
+        tail = window[:, b1 * size - first :]
+        if head.shape[1]:
+            mins = np.column_stack((np.fmin.reduce(head, axis=1), mins))
+            maxs = np.column_stack((np.fmax.reduce(head, axis=1), maxs))
+            starts = np.concatenate(([first], starts))
+        if tail.shape[1]:
+            mins = np.column_stack((mins, np.fmin.reduce(tail, axis=1)))
+            maxs = np.column_stack((maxs, np.fmax.reduce(tail, axis=1)))
+            starts = np.concatenate((starts, [b1 * size]))
+        return starts, mins, maxs
@@ -0,0 +1,170 @@
+import numpy as np
+
+from util.ring_buffer import RingBuffer
+
+# Units offered for a plot window, in seconds. None means a count of samples.
+WINDOW_UNITS = {"samples": None, "seconds": 1, "minutes": 60, "hours": 3600}
+GAP_FACTOR = 5  # A gap is a step this many times longer than the usual one
+BOOT_TOLERANCE = 0.005  # Stored times are corrected if the boot time moves more
+
+
+class SampleTimes:
+    """Timestamps, in seconds, of the samples in a RingBuffer.
+
+    Uses the `time` (RTC seconds) and `millis` (milliseconds since boot)
+    columns. With both, the boot time is the largest lower bound given by
+    `time - millis / 1000`. It restarts when millis goes backwards after a
+    reboot and tightens each time the clock ticks over; when it moves, the
+    stored times of the current run are shifted to match. Without `time`,
+    runs are joined end to end.
+
+    The timestamps are kept in a buffer of the same capacity, extended from
+    the new samples only, so the newest samples of both line up. Gaps in the
+    timing are remembered as the sample numbers that follow them.
+    """
+
+    def __init__(self, data: RingBuffer):
+        self.data = data
+        self.times = RingBuffer(["t"], capacity=data.capacity)
+        self.columns = None
+        self.samples_seen = 0  # Value of data.total when last updated
+        self.boot = -np.inf  # Epoch seconds at millis == 0 for the current run
+        self.run_start = 0  # Sample number where the current run began
+        self.offset = 0.0  # Added to millis / 1000 when there is no clock
+        self.last_millis = np.inf
+        self.last_time = np.nan
+        self.typical_step = np.nan  # Usual time between samples
+        self.gaps = np.empty(0, dtype=np.int64)
+
+    @property
+    def available(self) -> bool:
+        return "time" in self.data or "millis" in self.data
+
+    def _reset(self):
+        self.columns = list(self.data.columns)
+        self.times.reset(["t"], capacity=self.data.capacity)
+        self.samples_seen = self.data.total - len(self.data)
+        self.boot = -np.inf
+        self.run_start = self.samples_seen
+        self.offset = 0.0
+        self.last_millis = np.inf
+        self.last_time = np.nan
+        self.typical_step = np.nan
+        self.gaps = np.empty(0, dtype=np.int64)
+
+    def update(self):
+        if (
+            self.columns != self.data.columns
+            or self.times.capacity != self.data.capacity
+            or self.data.total < self.samples_seen
+        ):
+            self._reset()
+        if not self.available:
+            self.samples_seen = self.data.total
+            return
+
+        n_new = self.data.total - self.samples_seen
+        if n_new > len(self.data):
+            # Samples were overwritten before they were seen; start over.
+            self._reset()
+            n_new = len(self.data)
+        self.samples_seen = self.data.total
+        if n_new <= 0:
+            return
+
+        new = self.data.view(n_new)
+        t = self._timestamps(new)
+        self._find_gaps(t)
+        self.times.append(t[:, None])
+        self.last_time = t[-1]
+
+    def _timestamps(self, new: np.ndarray) -> np.ndarray:
+        if "millis" not in self.data:
+            return new[self.data.index("time")].copy()
+
+        millis = new[self.data.index("millis")]
+        # A new run starts wherever millis goes backwards.
+        restart = np.diff(millis, prepend=self.last_millis) < 0
+        run = np.cumsum(restart)
+        self.last_millis = millis[-1]
+        seconds = millis / 1000
+
+        if "time" not in self.data:
+            t = seconds + self.offset
+            for i in np.flatnonzero(restart):
+                previous = self.last_time if i == 0 else t[i - 1]
+                if np.isfinite(previous):
+                    self.offset = previous - seconds[i]
+                    t[i:] = seconds[i:] + self.offset
+            return t
+
+        # Best lower bound on the boot time of each run in this block
+        lower = new[self.data.index("time")] - seconds
+        starts = np.concatenate(([0], np.flatnonzero(restart[1:]) + 1))
+        if restart[0]:
+            run = run - 1  # No sample belongs to the previous run
+        boot = np.maximum.reduceat(lower, starts)
+        first = self.data.total - len(millis)
+
+        if not restart[0]:
+            boot[0] = max(boot[0], self.boot)
+            shift = boot[0] - self.boot
+            if np.isfinite(shift) and shift > BOOT_TOLERANCE:
+                stored = self.times.view()[0]
+                n_run = min(len(stored), first - self.run_start)
+                if n_run > 0:
+                    stored[-n_run:] += shift
+                self.last_time += shift
+        if restart.any():
+            self.run_start = first + np.flatnonzero(restart)[-1]
+        self.boot = boot[-1]
+        return boot[run] + seconds
+
+    def _find_gaps(self, t: np.ndarray):
+        steps = np.diff(t, prepend=self.last_time)
+        positive = steps[steps > 0]
+        if len(positive) >= 10:
+            self.typical_step = float(np.median(positive))
+        elif len(positive) and not np.isfinite(self.typical_step):
+            self.typical_step = float(positive.min())
+        if np.isfinite(self.typical_step):
+            found = np.flatnonzero(steps > GAP_FACTOR * self.typical_step)
+            first = self.data.total - len(t)
+            oldest = self.data.total - len(self.data)
+            self.gaps = np.concatenate((self.gaps[self.gaps >= oldest], first + found))
+
+    def at(self, sample_numbers: np.ndarray) -> np.ndarray:
+        """Timestamps of the given running sample numbers."""
+        times = self.times.view()[0]
+        return times[np.asarray(sample_numbers) - (self.data.total - len(times))]
+
+    def count_since(self, seconds: float) -> int:
+        """Number of newest samples within `seconds` of the newest one."""
+        times = self.times.view()[0]
+        if not len(times):
+            return 0
+        return len(times) - int(np.searchsorted(times, times[-1] - seconds, side="left"))
+
+
+def break_gaps(sample_numbers: np.ndarray, gaps: np.ndarray, *arrays):
+    """Inserts NaN before the points that follow a gap so lines are broken there.
+
+    `sample_numbers` gives the sample each point came from, in order, and each
+    of `arrays` holds a value per point. Returns the arrays with NaNs added.
+    """
+    gaps = gaps[(gaps > sample_numbers[0]) & (gaps <= sample_numbers[-1])]
+    if not len(gaps):
+        return arrays
+    positions = np.unique(np.searchsorted(sample_numbers, gaps, side="left"))
+    return tuple(np.insert(np.asarray(a, dtype=float), positions, np.nan) for a in arrays)
+
+
+def parse_window(text: str, unit: str) -> float:
+    """Reads a window length, raising ValueError unless it is positive.
+
+    Sample counts must be whole numbers; time spans may be fractional.
+    """
+    value = int(text) if WINDOW_UNITS[unit] is None else float(text)
+    if not value > 0:
+        raise ValueError("Window must be positive.")
+    return value
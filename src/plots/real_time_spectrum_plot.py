@@ -4,19 +4,55 @@ import tkinter as tk
 from tkinter import ttk
 
 
+BANDS = [410,435,460,485,510,535,560,585,610,645,680,705,730,760,810,860,900,940]  # fmt: skip
+FWHM = 30.0  # Width of each band's response (nm)
+WAVELENGTHS = np.arange(350, 1000, step=1)  # Grid the spectrum is drawn on
+
+
 class RealTimeSpectrumPlot(BasePlot):
-    _valid_sensors = ["AS7265X"]
     _name = "Real-Time Spectrum"
 
     def __init__(self, *args):
-        self.bands = [410,435,460,485,510,535,560,585,610,645,680,705,730,760,810,860,900,940]  # fmt: skip
+        self.bands = BANDS
         self.colors = [wavelength_to_rgb(b) for b in self.bands]
-        self.data_memory = {}
         self.spec_type = ""
         self.band_prefix = ""
+        self.band_indices = None  # Buffer columns of the selected bands
+        self.columns = []
+        self.num_spectra = 1
+        self.num_spectra_var = tk.StringVar(value=str(self.num_spectra))
+
+        # Each band's Gaussian response over the wavelength grid, computed once
+        # so a spectrum is a single product with the band amplitudes.
+        sigma = FWHM / (2 * np.sqrt(2 * np.log(2)))
+        bands = np.array(self.bands, dtype=float)[:, np.newaxis]
+        self.basis = np.exp(-((WAVELENGTHS - bands) ** 2) / (2 * sigma**2))
 
         super().__init__(*args)
 
+        # Persistent artists, updated in place every frame.
+        self.history_lines = []  # Older spectra, most recent first
+        self.band_lines = [
+            self.ax.plot(
+                WAVELENGTHS,
+                np.zeros_like(WAVELENGTHS, dtype=float),
+                color=color,
+                linewidth=2,
+                alpha=0.7,
+                animated=True,
+            )[0]
+            for color in self.colors
+        ]
+        self.spectrum_line = self.ax.plot(
+            WAVELENGTHS,
+            np.zeros_like(WAVELENGTHS, dtype=float),
+            color="black",
+            linewidth=2,
+            animated=True,
+        )[0]
+        self.ax.set_xlim(WAVELENGTHS[0], WAVELENGTHS[-1])
+        self._enable_blitting()
+
     def _setup_controls(self):
         self.spectrum_type_var = tk.StringVar(value="Ambient")
         self.spectrum_type_menu = ttk.Combobox(
@@ -27,7 +63,19 @@ class RealTimeSpectrumPlot(BasePlot):
         )
         self.spectrum_type_menu.pack(side=tk.LEFT, fill=tk.X, expand=True)
         self.spectrum_type_menu.bind("<<ComboboxSelected>>", self.stale_type_update)
-        self.stale_type_update()
+
+        tk.Label(self.controls_frame, text="Spectra shown:").pack(side=tk.LEFT)
+        num_spectra_spinbox = tk.Spinbox(
+            self.controls_frame,
+            from_=1,
+            to=50,
+            width=4,
+            textvariable=self.num_spectra_var,
+            command=self._get_num_spectra,
+        )
+        num_spectra_spinbox.pack(side=tk.LEFT)
+        num_spectra_spinbox.bind("<Return>", lambda event: self._get_num_spectra())
+        self._set_spectrum_type()
 
     def _setup_axes(self):
         """Set up the axes with labels and grid."""
@@ -35,48 +83,92 @@ class RealTimeSpectrumPlot(BasePlot):
         self.ax.set_ylabel("Irradiance W/m²")
         self.ax.grid(True, linestyle=":", alpha=0.6)
 
+    def _animated_artists(self):
+        return self.history_lines + self.band_lines + [self.spectrum_line]
+
+    def _get_num_spectra(self):
+        try:
+            self.num_spectra = max(1, int(self.num_spectra_var.get()))
+        except ValueError:
+            self.num_spectra_var.set(str(self.num_spectra))
+            return
+
+        # Keep one faded line for each older spectrum that is shown.
+        while len(self.history_lines) > self.num_spectra - 1:
+            self.history_lines.pop().remove()
+        while len(self.history_lines) < self.num_spectra - 1:
+            alpha = 0.5 * (1 - len(self.history_lines) / self.num_spectra)
+            line = self.ax.plot(
+                WAVELENGTHS,
+                np.full_like(WAVELENGTHS, np.nan, dtype=float),
+                color="gray",
+                linewidth=1,
+                alpha=alpha,
+                animated=True,
+            )[0]
+            self.history_lines.append(line)
+        for i, line in enumerate(self.history_lines):
+            line.set_alpha(0.5 * (1 - i / self.num_spectra))
+
+        if len(self.data):
+            self.update()
+
     def stale_type_update(self, event=None):
+        self._set_spectrum_type()
+        if len(self.data):
+            self.update()
+
+    def _set_spectrum_type(self):
         self.spec_type = self.spectrum_type_var.get()
         if self.spec_type == "Ambient":
             self.band_prefix = "A"
         elif self.spec_type == "Backscatter":
             self.band_prefix = "B"
-
-        if self.data_memory:
-            self.update(self.data_memory)
-
-    def update(self, data: list[dict]):
-        self.data_memory = data[-1]  # Just take the last data entry.
-        # Clear all existing lines on axes
-        for line in self.ax.lines:
-            line.remove()
-
-        self.plot_spectrum(data, self.band_prefix)
-        self.ax.set_title(f"{self.spec_type} Light Spectrum")
-        self.canvas.draw()
-
-    def plot_spectrum(self, data, band_prefix):
-        values = []
-        for b in self.bands:
-            values.append(
-                data[f"{band_prefix}{b}"] / 100
-            )  # Convert from uW/cm2 to W/m2
-
-        fwhm = 30.0
-        sigma = fwhm / (2 * np.sqrt(2 * np.log(2)))
-        lambda_plot = np.arange(350, 1000, step=1)
-        full_spectrum = np.zeros_like(lambda_plot, dtype=float)
-
-        for band, color, amplitude in zip(self.bands, self.colors, values):
-            channel_contribution = amplitude * np.exp(
-                -((lambda_plot - band) ** 2) / (2 * sigma**2)
-            )
-            full_spectrum += channel_contribution
-            self.ax.plot(
-                lambda_plot, channel_contribution, color=color, linewidth=2, alpha=0.7
-            )
-
-        self.ax.plot(lambda_plot, full_spectrum, color="black", linewidth=2)
+        self.band_indices = None
+
+    def update(self):
+        if self.columns != self.data.columns:
+            self.columns = list(self.data.columns)
+            self.band_indices = None
+
+        redraw = False
+        if self.band_indices is None:
+            self.band_indices = [
+                self.data.index(f"{self.band_prefix}{b}") for b in self.bands
+            ]
+            self.ax.set_title(f"{self.spec_type} Light Spectrum")
+            redraw = True
+
+        # Newest spectrum last; convert from uW/cm2 to W/m2
+        amplitudes = self.data.view(self.num_spectra)[self.band_indices].T / 100
+        if len(amplitudes) == 0:
+            return
+        spectra = amplitudes @ self.basis
+
+        contributions = amplitudes[-1][:, np.newaxis] * self.basis
+        for line, contribution in zip(self.band_lines, contributions):
+            line.set_ydata(contribution)
+        self.spectrum_line.set_ydata(spectra[-1])
+
+        older = spectra[-2::-1]  # Most recent first
+        for i, line in enumerate(self.history_lines):
+            line.set_ydata(older[i] if i < len(older) else np.nan)
+
+        redraw |= self._update_limits(spectra)
+        self._redraw(full=redraw)
+
+    def _update_limits(self, spectra: np.ndarray) -> bool:
+        """Rescales the y-axis when the spectra leave it or use less than half."""
+        ymin = min(0.0, np.nanmin(spectra))
+        ymax = np.nanmax(spectra)
+        if not np.isfinite(ymax):
+            return False
+        lo, hi = self.ax.get_ylim()
+        if ymin < lo or ymax > hi or (ymax - ymin) < 0.5 * (hi - lo):
+            pad = (ymax - ymin) * 0.1 if ymax > ymin else 1
+            self.ax.set_ylim(ymin, ymax + pad)
+            return True
+        return False
 
 
 def wavelength_to_rgb(wavelength):
@@ -1,26 +1,41 @@
 from ._base_plot import BasePlot
+from ._time_window import SampleTimes, WINDOW_UNITS, parse_window
 import tkinter as tk
 from tkinter import ttk, messagebox
-import pandas as pd
+import numpy as np
 
 
 class ScatterPlot(BasePlot):
-    _valid_sensors = "any"
     _name = "Scatter"
 
     def __init__(self, *args):
-        self.df = pd.DataFrame()
+        self.columns = []
         self.max_time_steps = 30
         self.num_samples_var = tk.StringVar(
             value=str(self.max_time_steps)
         )  # Default value for number of samples
-        self.lines = []  # Store line objects for updates
+        self.window_unit_var = tk.StringVar(value="samples")
+        self.window_unit = "samples"
+        self.window_seconds = None  # Window length when given as a time span
+        self.color_mode_var = tk.StringVar(value="None")
+        self.color_mode = None
+        self.x_extent = RunningExtent()
+        self.y_extent = RunningExtent()
+        self.plotted_vars = None  # (x, y) variables currently shown
+        self.samples_seen = 0  # Value of data.total when last updated
 
         super().__init__(*args)
+        self.times = SampleTimes(self.data)
+        # One collection is reused for every frame and only its offsets change.
+        self.scatter = self.ax.scatter(
+            [], [], s=10, linewidths=0, alpha=0.7, animated=True
+        )
+        self._enable_blitting()
 
     def _update_variable_choices(self):
         # Update the options for the X and Y variable dropdowns
-        variable_choices = list(self.df.columns)
+        self.columns = list(self.data.columns)
+        variable_choices = self.columns
         self.x_var.set(variable_choices[0] if variable_choices else "")
         self.y_var.set(variable_choices[1] if len(variable_choices) > 1 else "")
 
@@ -36,19 +51,27 @@ class ScatterPlot(BasePlot):
             )
 
     def _get_num_samples(self):
+        """Reads the window length, as a number of samples or a time span."""
+        unit = self.window_unit_var.get()
         try:
-            num_samples = int(self.num_samples_var.get())
-            if num_samples <= 0:
-                raise ValueError("Number of samples must be positive.")
-            self.max_time_steps = num_samples
-            if len(self.df) > self.max_time_steps:
-                self.df = self.df.iloc[
-                    -self.max_time_steps :
-                ]  # Trim to the last `max_time_steps` rows
+            value = parse_window(self.num_samples_var.get(), unit)
         except ValueError:
             messagebox.showerror(
-                "Input Error", "Invalid input. Please enter a positive integer."
+                "Input Error", "Invalid input. Please enter a positive number."
             )
+            return
+        if WINDOW_UNITS[unit] is None:
+            self.max_time_steps = value
+            self.window_seconds = None
+        else:
+            self.window_seconds = value * WINDOW_UNITS[unit]
+        self.window_unit = unit
+
+    def _window_length(self) -> int:
+        """Number of newest samples in the window."""
+        if self.window_seconds is not None and self.times.available:
+            return self.times.count_since(self.window_seconds)
+        return min(self.max_time_steps, len(self.data))
 
     def _setup_controls(self):
         # Dropdowns for selecting X and Y variables
@@ -66,61 +89,208 @@ class ScatterPlot(BasePlot):
         # Frame for number of samples input
         n_samples_frame = ttk.Frame(self.controls_frame)
         n_samples_frame.grid(row=0, column=2, padx=5)
-        tk.Label(n_samples_frame, text="# of samples:").grid(row=0, column=0)
-        num_samples_entry = tk.Entry(n_samples_frame, textvariable=self.num_samples_var)
-        num_samples_entry.grid(row=1, column=2)
+        tk.Label(n_samples_frame, text="Window:").grid(row=0, column=0, columnspan=2)
+        num_samples_entry = tk.Entry(
+            n_samples_frame, textvariable=self.num_samples_var, width=10
+        )
+        num_samples_entry.grid(row=1, column=0)
+        ttk.Combobox(
+            n_samples_frame,
+            textvariable=self.window_unit_var,
+            state="readonly",
+            values=list(WINDOW_UNITS),
+            width=8,
+        ).grid(row=1, column=1)
         tk.Button(n_samples_frame, text="Submit", command=self._get_num_samples).grid(
-            row=2, column=2
+            row=2, column=0, columnspan=2
         )
         self._get_num_samples()
 
+        tk.Label(self.controls_frame, text="Colour:").grid(row=0, column=3)
+        color_menu = ttk.Combobox(
+            self.controls_frame,
+            textvariable=self.color_mode_var,
+            state="readonly",
+            values=["None", "Time", "Density"],
+            width=8,
+        )
+        color_menu.grid(row=0, column=4)
+        color_menu.bind("<<ComboboxSelected>>", lambda event: self.update())
+
+    def _animated_artists(self):
+        return [self.scatter]
+
     def _setup_axes(self):
         """Set up the axes with titles, labels, and grid."""
-        self.ax.set_title("Time Series")
-        self.ax.set_xlabel("Sample #")
+        self.ax.set_title("Scatter Plot")  # Labelled once variables are chosen
         self.ax.grid(True, linestyle=":", alpha=0.6)
 
-    def update(self, data: list[dict]):
-        """Update the scatter plot."""
-        if data:
-            new_df = pd.DataFrame(data, index=range(len(data)))
-            if len(self.df) == 0:
-                self.df = new_df
-                self._update_variable_choices()
-            else:
-                self.df = pd.concat([self.df, new_df], ignore_index=True)
-                if len(self.df) > self.max_time_steps:
-                    # Trim to the last `max_time_steps` rows
-                    self.df = self.df.iloc[-self.max_time_steps :]
-
-        # Clear all existing scatter plots on axes
-        for collection in self.ax.collections:
-            collection.remove()
-
-        # Reset the color cycle
-        self.ax.set_prop_cycle(None)
+    def update(self):
+        """Update the scatter plot.
+
+        The offsets of the single scatter collection are replaced each frame
+        and blitted. The axis limits follow a running min/max of the window and
+        only change, with a full redraw, when the data leaves them.
+        """
+        if self.columns != self.data.columns:
+            self._update_variable_choices()
 
         # Get selected X and Y variables
         x_var = self.x_var.get()
         y_var = self.y_var.get()
+        if x_var not in self.data or y_var not in self.data or not len(self.data):
+            return
 
-        if x_var in self.df.columns and y_var in self.df.columns:
-            # Plot the scatter plot
-            x = self.df[x_var]
-            y = self.df[y_var]
-            self.ax.scatter(x, y, alpha=0.7)
-
-            self.ax.set_xlim(get_lims(x))
-            self.ax.set_ylim(get_lims(y))
+        redraw = False
+        if self.plotted_vars != (x_var, y_var):
+            self.plotted_vars = (x_var, y_var)
+            self.x_extent.reset()
+            self.y_extent.reset()
             self.ax.set_xlabel(x_var)
             self.ax.set_ylabel(y_var)
             self.ax.set_title(f"Scatter Plot: {x_var} vs {y_var}")
-            self.canvas.draw()
+            redraw = True
+
+        self.times.update()
+        window = self.data.view(self._window_length())
+        if not window.shape[1]:
+            return
+        new_samples = self.data.since(self.samples_seen)[:, -window.shape[1] :]
+        self.samples_seen = self.data.total
+        x = window[self.data.index(x_var)]
+        y = window[self.data.index(y_var)]
+
+        self.x_extent.update(new_samples[self.data.index(x_var)], x, self.data.total)
+        self.y_extent.update(new_samples[self.data.index(y_var)], y, self.data.total)
+        redraw |= self._update_limits()
+
+        # Density is counted from every point before overlapping ones are merged.
+        density = self._point_density(x, y)
+        order = np.arange(len(x), dtype=float)
+        keep = self._visible_points(x, y)
+        if keep is not None:
+            x, y, order = x[keep], y[keep], order[keep]
+            density = density[keep] if density is not None else None
+
+        self.scatter.set_offsets(np.column_stack((x, y)))
+        redraw |= self._update_colors(order, density)
+        self._redraw(full=redraw)
+
+    def _visible_points(self, x: np.ndarray, y: np.ndarray):
+        """Indices of the newest point in each occupied pixel, or None to keep all.
+
+        Points that land on the same pixel look identical, so long windows
+        are reduced to at most one point per pixel. Outliers always have a
+        pixel of their own and are kept.
+        """
+        bbox = self.ax.get_window_extent()
+        width, height = max(1, int(bbox.width)), max(1, int(bbox.height))
+        if len(x) <= 2 * width:
+            return None
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        finite = np.isfinite(x) & np.isfinite(y)
+        x = np.where(finite, x, x0)
+        y = np.where(finite, y, y0)
+        ix = np.clip(((x - x0) / (x1 - x0) * width), 0, width - 1)
+        iy = np.clip(((y - y0) / (y1 - y0) * height), 0, height - 1)
+        cell = np.where(finite, ix.astype(int) * height + iy.astype(int), -1)
+        # np.unique gives the first of each cell, so search from the newest end.
+        _, last = np.unique(cell[::-1], return_index=True)
+        keep = np.sort(len(x) - 1 - last)
+        return keep[finite[keep]]
+
+    def _point_density(self, x: np.ndarray, y: np.ndarray):
+        if self.color_mode_var.get() != "Density":
+            return None
+        return point_density(x, y, self.ax.get_xlim(), self.ax.get_ylim())
+
+    def _update_limits(self) -> bool:
+        """Sets new limits if the data left them or uses less than half of them."""
+        changed = False
+        for extent, get_lim, set_lim in (
+            (self.x_extent, self.ax.get_xlim, self.ax.set_xlim),
+            (self.y_extent, self.ax.get_ylim, self.ax.set_ylim),
+        ):
+            if not extent.is_valid:
+                continue
+            lo, hi = get_lim()
+            if (
+                extent.min < lo
+                or extent.max > hi
+                or (extent.max - extent.min) < 0.5 * (hi - lo)
+            ):
+                set_lim(get_lims(extent.min, extent.max))
+                changed = True
+        return changed
+
+    def _update_colors(self, order: np.ndarray, density=None) -> bool:
+        """Applies the selected colouring. Returns True if the mode changed.
+
+        `order` is each shown point's position in the window and `density` the
+        number of window points sharing its cell.
+        """
+        mode = self.color_mode_var.get()
+        changed = mode != self.color_mode
+        self.color_mode = mode
+
+        if mode == "Time":
+            # Older samples are darker, the newest is brightest.
+            self.scatter.set_array(order)
+            self.scatter.set_clim(0, max(1, order.max(initial=0)))
+        elif mode == "Density":
+            counts = density
+            self.scatter.set_array(counts)
+            self.scatter.set_clim(0, max(1, counts.max(initial=0)))
+        elif changed:
+            self.scatter.set_array(None)
+            self.scatter.set_facecolor("C0")
+        return changed
+
+
+class RunningExtent:
+    """Min/max of a sliding window, updated from the new samples only.
+
+    Samples leaving the window are not removed from the extent, so it can
+    only grow. Once the whole window has been replaced since the last full
+    pass, the extent is recomputed from the window so it can shrink again.
+    This keeps the amortized cost per sample constant.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.min = np.inf
+        self.max = -np.inf
+        self.recompute_at = None  # data.total at which the extent goes stale
+
+    @property
+    def is_valid(self) -> bool:
+        return bool(np.isfinite(self.min) and np.isfinite(self.max))
+
+    def update(self, new_values: np.ndarray, window: np.ndarray, total: int):
+        if self.recompute_at is None or total >= self.recompute_at:
+            values = window
+            self.min, self.max = np.inf, -np.inf
+            self.recompute_at = total + len(window)
+        else:
+            values = new_values
+
+        finite = values[np.isfinite(values)]
+        if finite.size:
+            self.min = min(self.min, finite.min())
+            self.max = max(self.max, finite.max())
+
+
+def point_density(x, y, xlim, ylim, bins: int = 64) -> np.ndarray:
+    """Number of points sharing each point's cell of a bins x bins grid."""
+    counts, _, _ = np.histogram2d(x, y, bins=bins, range=(xlim, ylim))
+    ix = np.clip(((x - xlim[0]) / (xlim[1] - xlim[0]) * bins).astype(int), 0, bins - 1)
+    iy = np.clip(((y - ylim[0]) / (ylim[1] - ylim[0]) * bins).astype(int), 0, bins - 1)
+    return counts[ix, iy]
 
 
-def get_lims(x: pd.Series):
-    xmin = x.min(axis=None)
-    xmax = x.max(axis=None)
+def get_lims(xmin: float, xmax: float):
     pad = (xmax - xmin) * 0.05 if xmax > xmin else 1
 
     return (xmin - pad), (xmax + pad)
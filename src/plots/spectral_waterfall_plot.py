@@ -0,0 +1,172 @@
+from ._base_plot import BasePlot
+from .real_time_spectrum_plot import BANDS
+import tkinter as tk
+from tkinter import ttk, messagebox
+import numpy as np
+
+from util.ring_buffer import RingBuffer
+
+
+class SpectralWaterfallPlot(BasePlot):
+    """Rolling image of the AS7265X bands over time, newest samples on top.
+
+    The image has at most one row per screen pixel of the axes. When the window
+    holds more samples than that, consecutive samples are averaged into a row.
+    Only rows built from newly arrived samples are written each update.
+    """
+
+    _name = "Spectral Waterfall"
+
+    def __init__(self, *args):
+        self.bands = BANDS
+        self.spec_type = ""
+        self.band_prefix = ""
+        self.columns = []
+        self.max_time_steps = 3600
+        self.num_samples_var = tk.StringVar(value=str(self.max_time_steps))
+        self.band_indices = None  # Buffer columns of the selected bands
+        self.samples_per_row = 1
+        self.rows = None  # Image rows, as a ring buffer with one column per band
+        self.pending = np.empty((0, len(self.bands)))  # Samples not yet in a row
+        self.samples_seen = 0  # Value of data.total when last updated
+
+        super().__init__(*args)
+
+        self.image = self.ax.imshow(
+            np.full((1, len(self.bands)), np.nan),
+            aspect="auto",
+            origin="lower",
+            interpolation="nearest",
+            cmap="viridis",
+            animated=True,
+        )
+        self.colorbar = self.fig.colorbar(self.image, ax=self.ax)
+        self.colorbar.set_label("Irradiance W/m²")
+        self._enable_blitting()
+
+    def _setup_controls(self):
+        self.spectrum_type_var = tk.StringVar(value="Ambient")
+        spectrum_type_menu = ttk.Combobox(
+            self.controls_frame,
+            textvariable=self.spectrum_type_var,
+            state="readonly",
+            values=["Ambient", "Backscatter"],
+        )
+        spectrum_type_menu.grid(row=0, column=0, padx=5)
+        spectrum_type_menu.bind("<<ComboboxSelected>>", lambda event: self._reset())
+
+        n_samples_frame = ttk.Frame(self.controls_frame)
+        n_samples_frame.grid(row=0, column=1, padx=5)
+        tk.Label(n_samples_frame, text="# of samples:").grid(row=0, column=0)
+        num_samples_entry = tk.Entry(n_samples_frame, textvariable=self.num_samples_var)
+        num_samples_entry.grid(row=1, column=0)
+        tk.Button(n_samples_frame, text="Submit", command=self._get_num_samples).grid(
+            row=2, column=0
+        )
+
+    def _setup_axes(self):
+        """Set up the axes with labels and band ticks."""
+        self.ax.set_xlabel("Wavelength (nm)")
+        self.ax.set_ylabel("Samples ago")
+        self.ax.set_xticks(range(len(self.bands)))
+        self.ax.set_xticklabels(self.bands, rotation=90)
+
+    def _animated_artists(self):
+        return [self.image]
+
+    def _get_num_samples(self):
+        try:
+            num_samples = int(self.num_samples_var.get())
+            if num_samples <= 0:
+                raise ValueError("Number of samples must be positive.")
+            self.max_time_steps = num_samples
+        except ValueError:
+            messagebox.showerror(
+                "Input Error", "Invalid input. Please enter a positive integer."
+            )
+            return
+        self._reset()
+
+    def _reset(self):
+        """Rebuilds the image for the current type, window and axes size."""
+        self.band_indices = None
+        if len(self.data):
+            self.update()
+
+    def _rebuild(self):
+        self.columns = list(self.data.columns)
+        self.spec_type = self.spectrum_type_var.get()
+        self.band_prefix = "A" if self.spec_type == "Ambient" else "B"
+        self.band_indices = [
+            self.data.index(f"{self.band_prefix}{b}") for b in self.bands
+        ]
+
+        # Never keep more rows than the axes has pixels.
+        height = int(self.ax.get_window_extent().height)
+        max_rows = max(50, height)
+        self.samples_per_row = int(np.ceil(self.max_time_steps / max_rows))
+        n_rows = int(np.ceil(self.max_time_steps / self.samples_per_row))
+        self.rows = RingBuffer(
+            [f"{self.band_prefix}{b}" for b in self.bands], capacity=n_rows
+        )
+        self.pending = np.empty((0, len(self.bands)))
+
+        # Seed the image with the history that is already buffered.
+        history = self.data.view(self.max_time_steps)[self.band_indices].T
+        self._add_samples(history)
+        self.samples_seen = self.data.total
+
+        self.ax.set_ylim(n_rows * self.samples_per_row, 0)
+        self.ax.set_xlim(-0.5, len(self.bands) - 0.5)
+        self.ax.set_title(f"{self.spec_type} Spectral Waterfall")
+
+    def _add_samples(self, samples: np.ndarray):
+        """Averages complete groups of samples into image rows."""
+        samples = np.concatenate((self.pending, samples / 100))  # uW/cm2 to W/m2
+        n_complete = len(samples) // self.samples_per_row * self.samples_per_row
+        if n_complete:
+            groups = samples[:n_complete].reshape(
+                -1, self.samples_per_row, len(self.bands)
+            )
+            self.rows.append(groups.mean(axis=1))
+        self.pending = samples[n_complete:]
+
+    def update(self):
+        redraw = False
+        if self.band_indices is None or self.columns != self.data.columns:
+            self._rebuild()
+            redraw = True
+        else:
+            new_samples = self.data.since(self.samples_seen)[self.band_indices].T
+            self.samples_seen = self.data.total
+            self._add_samples(new_samples)
+
+        if not len(self.rows):
+            return
+
+        # Oldest row at the bottom, newest at the top (0 samples ago).
+        image = self.rows.view().T
+        self.image.set_data(image)
+        self.image.set_extent(
+            (-0.5, len(self.bands) - 0.5, len(image) * self.samples_per_row, 0)
+        )
+
+        redraw |= self._update_color_limits(image)
+        self._redraw(full=redraw)
+
+    def _update_color_limits(self, image: np.ndarray) -> bool:
+        """Rescales the colours when the image leaves them or uses less than half."""
+        vmin = np.nanmin(image)
+        vmax = np.nanmax(image)
+        if not np.isfinite(vmin) or not np.isfinite(vmax):
+            return False
+        lo, hi = self.image.get_clim()
+        if vmin < lo or vmax > hi or (vmax - vmin) < 0.5 * (hi - lo):
+            pad = (vmax - vmin) * 0.1 if vmax > vmin else 1
+            self.image.set_clim(vmin - pad, vmax + pad)
+            return True
+        return False
+
+    def close(self):
+        self.colorbar.remove()
+        super().close()
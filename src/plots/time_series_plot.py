@@ -1,44 +1,66 @@
 from ._base_plot import BasePlot
+from ._decimation import MinMaxLevels, interleave, lttb_indices
+from ._time_window import SampleTimes, WINDOW_UNITS, break_gaps, parse_window
 import tkinter as tk
 from tkinter import ttk, messagebox
-import pandas as pd
+import numpy as np
 
 
 class TimeSeriesPlot(BasePlot):
-    _valid_sensors = "any"
     _name = "Time Series"
 
     def __init__(self, *args):
-        self.df = pd.DataFrame()
+        self.columns = []
         self.max_time_steps = 30
         self.num_samples_var = tk.StringVar(
             value=str(self.max_time_steps)
         )  # Default value for number of samples
-        self.lines = []  # Store line objects for updates
+        self.window_unit_var = tk.StringVar(value="samples")
+        self.window_unit = "samples"
+        self.window_seconds = None  # Window length when given as a time span
+        self.lines = {}  # Persistent line for each selected column
+        self.decimation_var = tk.StringVar(value="Min/Max")
 
         super().__init__(*args)
+        self.levels = MinMaxLevels(self.data)
+        self.times = SampleTimes(self.data)
+        self._enable_blitting()
 
     def _update_variable_choices(self):
-        self.time_series_listbox["height"] = min(10, len(self.df.columns))
+        for line in self.lines.values():
+            line.remove()
+        self.lines = {}
+        if self.ax.get_legend():
+            self.ax.get_legend().remove()
+        self.columns = list(self.data.columns)
+        self.time_series_listbox["height"] = min(10, len(self.columns))
         # Clear existing options and add new ones.
         self.time_series_listbox.delete(0, tk.END)
-        for col in self.df.columns:
+        for col in self.columns:
             self.time_series_listbox.insert(tk.END, col)
 
     def _get_num_samples(self):
+        """Reads the window length, as a number of samples or a time span."""
+        unit = self.window_unit_var.get()
         try:
-            num_samples = int(self.num_samples_var.get())
-            if num_samples <= 0:
-                raise ValueError("Number of samples must be positive.")
-            self.max_time_steps = num_samples
-            if len(self.df) > self.max_time_steps:
-                self.df = self.df.iloc[
-                    -self.max_time_steps :
-                ]  # Trim to the last `max_time_steps` rows
+            value = parse_window(self.num_samples_var.get(), unit)
         except ValueError:
             messagebox.showerror(
-                "Input Error", "Invalid input. Please enter a positive integer."
+                "Input Error", "Invalid input. Please enter a positive number."
             )
+            return
+        if WINDOW_UNITS[unit] is None:
+            self.max_time_steps = value
+            self.window_seconds = None
+        else:
+            self.window_seconds = value * WINDOW_UNITS[unit]
+        self.window_unit = unit
+
+    def _window_length(self) -> int:
+        """Number of newest samples in the window."""
+        if self.window_seconds is not None and self.times.available:
+            return self.times.count_since(self.window_seconds)
+        return min(self.max_time_steps, len(self.data))
 
     def _setup_controls(self):
         self.time_series_listbox = tk.Listbox(
@@ -47,9 +69,7 @@ class TimeSeriesPlot(BasePlot):
         self.time_series_listbox.grid(row=0, column=0)
 
         # Bind the selection change event to the update function using a lambda
-        self.time_series_listbox.bind(
-            "<<ListboxSelect>>", lambda event: self.update(None)
-        )
+        self.time_series_listbox.bind("<<ListboxSelect>>", lambda event: self.update())
 
         # Clear selections button
         ttk.Button(
@@ -60,60 +80,183 @@ class TimeSeriesPlot(BasePlot):
 
         n_samples_frame = ttk.Frame(self.controls_frame)
         n_samples_frame.grid(row=0, column=1, padx=5)
-        tk.Label(n_samples_frame, text="# of samples:").grid(row=0, column=0)
-        num_samples_entry = tk.Entry(n_samples_frame, textvariable=self.num_samples_var)
+        tk.Label(n_samples_frame, text="Window:").grid(row=0, column=0, columnspan=2)
+        num_samples_entry = tk.Entry(
+            n_samples_frame, textvariable=self.num_samples_var, width=10
+        )
         num_samples_entry.grid(row=1, column=0)
+        ttk.Combobox(
+            n_samples_frame,
+            textvariable=self.window_unit_var,
+            state="readonly",
+            values=list(WINDOW_UNITS),
+            width=8,
+        ).grid(row=1, column=1)
         tk.Button(n_samples_frame, text="Submit", command=self._get_num_samples).grid(
-            row=2, column=0
+            row=2, column=0, columnspan=2
         )
         self._get_num_samples()
 
+        # Long windows are reduced to about two points per pixel
+        decimation_frame = ttk.Frame(self.controls_frame)
+        decimation_frame.grid(row=0, column=2, padx=5)
+        tk.Label(decimation_frame, text="Decimation:").grid(row=0, column=0)
+        decimation_menu = ttk.Combobox(
+            decimation_frame,
+            textvariable=self.decimation_var,
+            state="readonly",
+            values=["Min/Max", "LTTB", "Off"],
+            width=8,
+        )
+        decimation_menu.grid(row=1, column=0)
+        decimation_menu.bind("<<ComboboxSelected>>", lambda event: self.update())
+
     def _setup_axes(self):
         """Set up the axes with titles, labels, and grid."""
         self.ax.set_title("Time Series")
         self.ax.set_xlabel("Sample #")
         self.ax.grid(True, linestyle=":", alpha=0.6)
 
-    def update(self, data: list[dict]):
-        """Update the time series plot."""
-        if data:
-            new_df = pd.DataFrame(data, index=range(len(data)))
-            if len(self.df) == 0:
-                self.df = new_df
-                self._update_variable_choices()
-                self.lines = [
-                    self.ax.plot([], [], linewidth=2, label=col)[0]
-                    for col in self.df.columns
-                ]
-            else:
-                self.df = pd.concat([self.df, new_df], ignore_index=True)
-                if len(self.df) > self.max_time_steps:
-                    # Trim to the last `max_time_steps` rows
-                    self.df = self.df.iloc[-self.max_time_steps :]
-
-        # Clear all existing lines on axes
-        for line in self.ax.lines:
-            line.remove()
-        # Clear the existing legend
-        if self.ax.get_legend():
-            self.ax.get_legend().remove()
+    def update(self):
+        """Update the time series plot.
 
-        # Reset the color cycle
-        self.ax.set_prop_cycle(None)
+        Each selected column keeps one persistent line that is updated with
+        set_data. The axes, ticks and legend are only redrawn when the
+        selection or the axis limits change; otherwise the lines are blitted
+        over the cached background.
+        """
+        redraw = self.columns != self.data.columns
+        if redraw:
+            self._update_variable_choices()
 
         # Get selected columns from the Listbox
         selected_indices = self.time_series_listbox.curselection()
-        selected_columns = [self.df.columns[i] for i in selected_indices]
+        selected_columns = [self.columns[i] for i in selected_indices]
+        redraw |= self._sync_lines(selected_columns)
+
+        self.levels.update()
+        self.times.update()
+        time_axis = self.window_seconds is not None and self.times.available
+        redraw |= self._update_xlabel(time_axis)
+
+        n = self._window_length()
+        if self.lines and n > 1:
+            ymin, ymax = np.inf, -np.inf
+            for line, (samples, values) in zip(self.lines.values(), self._line_data(n)):
+                if time_axis:
+                    # Time before the newest sample, in the chosen unit
+                    x = self.times.at(samples) - self.times.last_time
+                    x /= WINDOW_UNITS[self.window_unit]
+                else:
+                    x = samples
+                if self.times.available:
+                    x, values = break_gaps(samples, self.times.gaps, x, values)
+                line.set_data(x, values)
+                if np.isfinite(values).any():
+                    ymin = min(ymin, np.nanmin(values))
+                    ymax = max(ymax, np.nanmax(values))
+            redraw |= self._update_limits(
+                self.data.total - n, self.data.total - 1, ymin, ymax
+            )
 
-        if len(selected_columns) > 0 and len(self.df) > 1:
-            tmp_df = self.df[selected_columns]
-            tmp_df.plot(ax=self.ax)
+        self._redraw(full=redraw)
 
-            ymin = tmp_df.min(axis=None)
-            ymax = tmp_df.max(axis=None)
-            ypad = (ymax - ymin) * 0.05 if ymax > ymin else 1
+    def _update_xlabel(self, time_axis: bool) -> bool:
+        """Labels the x-axis for the window type. Returns True if it changed."""
+        label = f"Time ({self.window_unit}) before latest" if time_axis else "Sample #"
+        if self.ax.get_xlabel() == label:
+            return False
+        self.ax.set_xlabel(label)
+        return True
 
+    def _line_data(self, n: int) -> list[tuple[np.ndarray, np.ndarray]]:
+        """(sample numbers, y) of each selected line over the newest n samples.
+
+        Windows longer than about two points per pixel are decimated, either to
+        the min/max envelope of each pixel or by LTTB on that envelope, using
+        the cached levels so the cost does not grow with the window.
+        """
+        rows = [self.data.index(col) for col in self.lines]
+        n_pixels = max(100, int(self.ax.get_window_extent().width))
+        mode = self.decimation_var.get()
+        if mode == "Off" or n <= 2 * n_pixels:
+            x = self.data.sample_numbers(n)
+            window = self.data.view(n)
+            return [(x, window[r]) for r in rows]
+
+        if mode == "LTTB":
+            # Min/max candidates at twice the output density, then LTTB.
+            starts, mins, maxs = self.levels.envelope(n, 2 * n_pixels, rows)
+            x = np.repeat(starts, 2)
+            lines = []
+            for y in interleave(mins, maxs):
+                keep = lttb_indices(x, y, 2 * n_pixels)
+                lines.append((x[keep], y[keep]))
+            return lines
+
+        starts, mins, maxs = self.levels.envelope(n, n_pixels, rows)
+        x = np.repeat(starts, 2)
+        return [(x, y) for y in interleave(mins, maxs)]
+
+    def _sync_lines(self, selected_columns: list[str]) -> bool:
+        """Creates and removes lines to match the selection.
+
+        Returns True if the selection changed.
+        """
+        if list(self.lines) == selected_columns:
+            return False
+
+        for col in list(self.lines):
+            if col not in selected_columns:
+                self.lines.pop(col).remove()
+        self.lines = {
+            col: self.lines.get(col)
+            or self.ax.plot(
+                [],
+                [],
+                label=col,
+                color=f"C{self.columns.index(col) % 10}",
+                animated=True,
+            )[0]
+            for col in selected_columns
+        }
+
+        if self.ax.get_legend():
+            self.ax.get_legend().remove()
+        if self.lines:
+            self.ax.legend(handles=list(self.lines.values()), loc="upper left")
+        return True
+
+    def _update_limits(self, xmin, xmax, ymin, ymax) -> bool:
+        """Moves the axis limits only when the data leaves them.
+
+        The x-axis is given some headroom past the newest sample so that it
+        only has to jump forward occasionally. The y-axis expands immediately
+        but only shrinks once the data uses less than half of it. Returns True
+        if the limits changed.
+        """
+        changed = False
+        x_lo, x_hi = self.ax.get_xlim()
+        if self.window_seconds is not None and self.times.available:
+            # Times are relative to the newest sample, so the axis stays put.
+            span = self.window_seconds / WINDOW_UNITS[self.window_unit]
+            if (x_lo, x_hi) != (-span, 0.02 * span):
+                self.ax.set_xlim(-span, 0.02 * span)
+                changed = True
+        else:
+            span = self.max_time_steps + max(1, self.max_time_steps // 4)
+            if xmin < x_lo or xmax > x_hi or x_hi - x_lo != span:
+                self.ax.set_xlim(xmin, xmin + span)
+                changed = True
+
+        if not np.isfinite(ymin) or not np.isfinite(ymax):
+            return changed
+        y_lo, y_hi = self.ax.get_ylim()
+        if ymin < y_lo or ymax > y_hi or (ymax - ymin) < 0.5 * (y_hi - y_lo):
+            ypad = (ymax - ymin) * 0.1 if ymax > ymin else 1
             self.ax.set_ylim(ymin - ypad, ymax + ypad)
-            self.ax.set_xlim(tmp_df.index.min(), tmp_df.index.max())
-            self.ax.legend(loc="upper left")
-            self.canvas.draw()
+            changed = True
+        return changed
+
+    def _animated_artists(self):
+        return list(self.lines.values())
@@ -1,14 +1,28 @@
-from .vcnl4010_sensor import VCNL4010Sensor
-from .as7265x_sensor import AS7265XSensor
+import importlib
+
+# Module and class of each sensor's settings panel. They are imported only
+# when that sensor connects, and never without a display.
+SENSORS = {
+    "VCNL4010": ("vcnl4010_sensor", "VCNL4010Sensor"),
+    "AS7265X": ("as7265x_sensor", "AS7265XSensor"),
+}
+
+
+def __getattr__(name: str):
+    # Keeps `from sensors import VCNL4010Sensor` working lazily
+    for module_name, class_name in SENSORS.values():
+        if name == class_name:
+            module = importlib.import_module(f".{module_name}", __name__)
+            return getattr(module, class_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def make_sensor_obj(sensor_name: str, parent_frame):
     """
     Factory function to get the appropriate sensor class based on the sensor name.
     """
-    if sensor_name == "VCNL4010":
-        return VCNL4010Sensor(parent_frame)
-    elif sensor_name == "AS7265X":
-        return AS7265XSensor(parent_frame)
-    else:
+    if sensor_name not in SENSORS:
         raise ValueError(f"Unknown sensor name: {sensor_name}")
+    module_name, class_name = SENSORS[sensor_name]
+    module = importlib.import_module(f".{module_name}", __name__)
+    return getattr(module, class_name)(parent_frame)
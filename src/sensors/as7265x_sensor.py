@@ -1,4 +1,5 @@
 from ._base_sensor import BaseSensor
+from .settings import DEFAULTS, settings_words
 import tkinter as tk
 from tkinter import ttk
 
@@ -9,13 +10,16 @@ class AS7265XSensor(BaseSensor):
 
     def configure_gui(self, parent_frame):
         """Add GUI elements specific to AS7265X."""
-        self.cb_ambient_light_var = tk.BooleanVar(value=True)
-        self.cb_backscatter_var = tk.BooleanVar(value=True)
-        self.cb_pressure_var = tk.BooleanVar(value=True)
-        self.cb_temperature_var = tk.BooleanVar(value=True)
-        self.led_current_var = tk.StringVar(value="25")
-        self.gain_var = tk.StringVar(value="1")
-        self.integration_cycles_var = tk.StringVar(value="16")
+        defaults = DEFAULTS[self.name]
+        self.cb_ambient_light_var = tk.BooleanVar(value=defaults["ambient_light"])
+        self.cb_backscatter_var = tk.BooleanVar(value=defaults["backscatter"])
+        self.cb_pressure_var = tk.BooleanVar(value=defaults["pressure"])
+        self.cb_temperature_var = tk.BooleanVar(value=defaults["temperature"])
+        self.led_current_var = tk.StringVar(value=defaults["led_current"])
+        self.gain_var = tk.StringVar(value=defaults["gain"])
+        self.integration_cycles_var = tk.StringVar(
+            value=defaults["integration_cycles"]
+        )
 
         meas_frame = ttk.LabelFrame(parent_frame, text="Measurements", padding=(10, 5))
         meas_frame.pack(fill="x", padx=5, pady=5)
@@ -55,20 +59,13 @@ class AS7265XSensor(BaseSensor):
 
     def get_settings_words(self):
         """Build the settings string for AS7265X."""
-        meas_bit_flags = 0
-        if self.cb_ambient_light_var.get():
-            meas_bit_flags |= 1  # Bit 0
-        if self.cb_backscatter_var.get():
-            meas_bit_flags |= 2  # Bit 1
-        if self.cb_pressure_var.get():
-            meas_bit_flags |= 4  # Bit 2
-        if self.cb_temperature_var.get():
-            meas_bit_flags |= 8  # Bit 3
-
-        words = [
-            str(meas_bit_flags),
-            self.led_current_var.get(),
-            self.gain_var.get(),
-            self.integration_cycles_var.get(),
-        ]
-        return words
+        settings = {
+            "ambient_light": self.cb_ambient_light_var.get(),
+            "backscatter": self.cb_backscatter_var.get(),
+            "pressure": self.cb_pressure_var.get(),
+            "temperature": self.cb_temperature_var.get(),
+            "led_current": self.led_current_var.get(),
+            "gain": self.gain_var.get(),
+            "integration_cycles": self.integration_cycles_var.get(),
+        }
+        return settings_words(self.name, settings)
@@ -0,0 +1,59 @@
+"""The sensor settings sent in the SET sentence, without any GUI."""
+
+# Every setting of each sensor, with the default shown in the GUI
+DEFAULTS = {
+    "VCNL4010": {"led_current": 50},
+    "AS7265X": {
+        "ambient_light": True,
+        "backscatter": True,
+        "pressure": True,
+        "temperature": True,
+        "led_current": "25",
+        "gain": "1",
+        "integration_cycles": "16",
+    },
+}
+# Measurements of the AS7265X, in the order of their bits in the flags word
+AS7265X_MEASUREMENTS = ["ambient_light", "backscatter", "pressure", "temperature"]
+
+
+def parse_setting(value, default):
+    """Converts a value given as text to the type of its default."""
+    if not isinstance(value, str):
+        return value
+    if isinstance(default, bool):
+        if value.lower() in ("1", "true", "yes", "on"):
+            return True
+        if value.lower() in ("0", "false", "no", "off"):
+            return False
+        raise ValueError(f"Not a true/false value: {value}")
+    return type(default)(value)
+
+
+def resolve_settings(sensor_name: str, settings: dict) -> dict:
+    """The defaults of `sensor_name`, updated with `settings`."""
+    if sensor_name not in DEFAULTS:
+        raise ValueError(f"Unknown sensor name: {sensor_name}")
+    resolved = dict(DEFAULTS[sensor_name])
+    for name, value in settings.items():
+        if name not in resolved:
+            raise ValueError(f"{sensor_name} has no setting named {name!r}")
+        resolved[name] = parse_setting(value, resolved[name])
+    return resolved
+
+
+def settings_words(sensor_name: str, settings: dict) -> list[str]:
+    """The words after the interval and delay in the SET sentence."""
+    settings = resolve_settings(sensor_name, settings)
+    if sensor_name == "AS7265X":
+        meas_bit_flags = 0
+        for bit, name in enumerate(AS7265X_MEASUREMENTS):
+            if settings[name]:
+                meas_bit_flags |= 1 << bit
+        return [
+            str(meas_bit_flags),
+            str(settings["led_current"]),
+            str(settings["gain"]),
+            str(settings["integration_cycles"]),
+        ]
+    return [str(settings["led_current"])]
@@ -1,4 +1,5 @@
 from ._base_sensor import BaseSensor
+from .settings import DEFAULTS, settings_words
 import tkinter as tk
 from tkinter import ttk
 
@@ -14,7 +15,7 @@ class VCNL4010Sensor(BaseSensor):
         self.cb_pressure_var = tk.BooleanVar(value=True)
         self.cb_temperature_var = tk.BooleanVar(value=True)
 
-        self.led_current_var = tk.IntVar(value=50)
+        self.led_current_var = tk.IntVar(value=DEFAULTS[self.name]["led_current"])
 
         meas_frame = ttk.LabelFrame(parent_frame, text="Measurements", padding=(10, 5))
         meas_frame.pack(fill="x", padx=5, pady=5)
@@ -42,4 +43,4 @@ class VCNL4010Sensor(BaseSensor):
 
     def get_settings_words(self):
         """Build the settings string for VCNL4010."""
-        return [str(self.led_current_var.get())]
+        return settings_words(self.name, {"led_current": self.led_current_var.get()})
@@ -0,0 +1,129 @@
+import collections
+import threading
+
+import numpy as np
+
+# What put() does when the queue already holds max_rows rows
+BLOCK = "block"  # Wait for the consumer, pushing back on the reader
+DROP_OLDEST = "drop-oldest"  # Discard the oldest queued rows
+DECIMATE = "decimate"  # Thin the queued rows, keeping the time span
+POLICIES = [BLOCK, DROP_OLDEST, DECIMATE]
+
+
+class BatchQueue:
+    """Bounded queue of (n_samples, n_columns) blocks from the reader thread.
+
+    The bound is in rows rather than blocks, since a block can hold one sample
+    or thousands. `tap`, if set, is called with every block on the producer
+    thread before the policy is applied, so a consumer such as the file writer
+    sees every row even when the display copy is dropped or decimated.
+    """
+
+    def __init__(self, max_rows: int = 20000, policy: str = DROP_OLDEST, tap=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy}")
+        self.max_rows = max_rows
+        self.policy = policy
+        self.tap = tap
+        self._blocks = collections.deque()
+        self._rows = 0
+        self._cond = threading.Condition()
+
+        self.rows_in = 0  # Rows put on the queue
+        self.rows_dropped = 0  # Rows discarded by DROP_OLDEST or a width change
+        self.rows_decimated = 0  # Rows thinned out by DECIMATE
+        self.high_water = 0  # Most rows ever waiting at once
+
+    def put(self, block: np.ndarray):
+        tap = self.tap
+        if tap is not None:
+            tap(block)
+
+        with self._cond:
+            self.rows_in += len(block)
+            if self.policy == BLOCK:
+                # Always accept into an empty queue so oversized blocks pass.
+                while self._rows and self._rows + len(block) > self.max_rows:
+                    self._cond.wait()
+            elif self.policy == DROP_OLDEST:
+                block = self._drop_oldest(block)
+            else:
+                block = self._decimate(block)
+
+            self._blocks.append(block)
+            self._rows += len(block)
+            self.high_water = max(self.high_water, self._rows)
+
+    def _drop_oldest(self, block: np.ndarray) -> np.ndarray:
+        while self._blocks and self._rows + len(block) > self.max_rows:
+            oldest = self._blocks.popleft()
+            self._rows -= len(oldest)
+            self.rows_dropped += len(oldest)
+        if len(block) > self.max_rows:
+            self.rows_dropped += len(block) - self.max_rows
+            block = block[-self.max_rows :]
+        return block
+
+    def _decimate(self, block: np.ndarray) -> np.ndarray:
+        if self._rows + len(block) <= self.max_rows:
+            return block
+        width = block.shape[1]
+        if any(queued.shape[1] != width for queued in self._blocks):
+            # Rows from before a HEADERS change cannot be merged with the new
+            # ones, and the consumer drops them anyway.
+            stale = [queued for queued in self._blocks if queued.shape[1] != width]
+            self.rows_dropped += sum(len(queued) for queued in stale)
+            self._blocks = collections.deque(
+                queued for queued in self._blocks if queued.shape[1] == width
+            )
+            self._rows = sum(len(queued) for queued in self._blocks)
+            if self._rows + len(block) <= self.max_rows:
+                return block
+        # Merge everything waiting and keep every other row until it fits.
+        merged = np.concatenate(list(self._blocks) + [block])
+        n_before = len(merged)
+        while len(merged) > self.max_rows:
+            merged = merged[::2]
+        self.rows_decimated += n_before - len(merged)
+        self._blocks.clear()
+        self._rows = 0
+        return merged
+
+    def get_all(self, max_rows: int = None) -> list[np.ndarray]:
+        """Takes queued blocks, oldest first, up to about `max_rows` rows.
+
+        At least one block is returned if any are waiting, even if it is
+        larger than `max_rows`.
+        """
+        blocks = []
+        n_rows = 0
+        with self._cond:
+            while self._blocks:
+                if max_rows is not None and blocks and n_rows + len(self._blocks[0]) > max_rows:
+                    break
+                block = self._blocks.popleft()
+                blocks.append(block)
+                n_rows += len(block)
+            self._rows -= n_rows
+            self._cond.notify_all()
+        return blocks
+
+    def clear(self):
+        with self._cond:
+            self._blocks.clear()
+            self._rows = 0
+            self._cond.notify_all()
+
+    def reset_stats(self):
+        with self._cond:
+            self.rows_in = 0
+            self.rows_dropped = 0
+            self.rows_decimated = 0
+            self.high_water = self._rows
+
+    def empty(self) -> bool:
+        return not self._blocks
+
+    def __len__(self) -> int:
+        """Number of rows waiting."""
+        return self._rows
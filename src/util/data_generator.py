@@ -0,0 +1,141 @@
+import time
+
+import numpy as np
+
+from .data_parser import LEGACY_HEADERS
+
+AS7265X_BANDS = [410,435,460,485,510,535,560,585,610,645,680,705,730,760,810,860,900,940]  # fmt: skip
+
+# Columns each sensor sends after HEADERS
+SCHEMAS = {
+    "VCNL4010": list(LEGACY_HEADERS),
+    "AS7265X": ["time", "millis"]
+    + [f"A{band}" for band in AS7265X_BANDS]
+    + [f"B{band}" for band in AS7265X_BANDS]
+    + ["pressure", "water_temp", "battery"],
+}
+
+
+class DataGenerator:
+    """Synthetic sensor samples, generated in vectorized blocks.
+
+    Samples are spaced at `rate_hz` on a simulated clock starting at
+    `start_time`. Every value comes from a seeded RNG, so a run can be
+    repeated exactly. Faults can be injected:
+        - gap_rate: expected gaps per second, each skipping `gap_seconds`
+        - corrupt_rate: fraction of lines that are truncated or garbled
+        - bad_checksum_rate: fraction of framed messages with a wrong checksum
+    """
+
+    def __init__(
+        self,
+        sensor: str = "VCNL4010",
+        rate_hz: float = 100.0,
+        seed: int = None,
+        gap_rate: float = 0.0,
+        gap_seconds: float = 5.0,
+        corrupt_rate: float = 0.0,
+        bad_checksum_rate: float = 0.0,
+        start_time: float = None,
+    ):
+        if sensor not in SCHEMAS:
+            raise ValueError(f"Unknown sensor name: {sensor}")
+        if rate_hz <= 0:
+            raise ValueError("Sample rate must be positive.")
+        self.sensor = sensor
+        self.headers = SCHEMAS[sensor]
+        self.rate_hz = rate_hz
+        self.gap_rate = gap_rate
+        self.gap_seconds = gap_seconds
+        self.corrupt_rate = corrupt_rate
+        self.bad_checksum_rate = bad_checksum_rate
+        self.rng = np.random.default_rng(seed)
+
+        self.start_time = time.time() if start_time is None else start_time
+        self.t = self.start_time  # Simulated time of the next sample
+        self.samples_generated = 0
+        self.gaps_injected = 0
+        self.lines_corrupted = 0
+        self.checksums_corrupted = 0
+
+        # A smooth made-up spectrum for the AS7265X bands (uW/cm2)
+        bands = np.array(AS7265X_BANDS, dtype=float)
+        self._spectrum = 2000 * np.exp(-(((bands - 560) / 180) ** 2)) + 200
+
+    def block(self, n: int) -> np.ndarray:
+        """Returns the next `n` samples as a (n, len(headers)) array."""
+        t = self.t + np.arange(n) / self.rate_hz
+        if self.gap_rate > 0 and n:
+            starts_gap = self.rng.random(n) < self.gap_rate / self.rate_hz
+            t += np.cumsum(starts_gap) * self.gap_seconds
+            self.gaps_injected += int(starts_gap.sum())
+        if n:
+            self.t = t[-1] + 1 / self.rate_hz
+        self.samples_generated += n
+
+        elapsed = t - self.start_time
+        columns = {
+            "time": np.floor(t),
+            "millis": np.round(elapsed * 1000),
+            "pressure": self._noisy_sinusoid(elapsed, 1000, 100, 0.1),
+            "water_temp": self._noisy_sinusoid(elapsed, 1000, 100, 0.1),
+            "battery": np.round(100 + self.rng.normal(5, 1, n)),
+            "ambient_light": self._noisy_sinusoid(elapsed, 1000, 100, 0.1),
+            "backscatter": self._noisy_sinusoid(elapsed, 1000, 100, 0.1),
+        }
+        if self.sensor == "AS7265X":
+            # Ambient follows a slow "cloud" cycle; backscatter is steadier.
+            cloud = 1 + 0.3 * np.sin(2 * np.pi * 0.05 * elapsed)[:, None]
+            ambient = self._spectrum * cloud
+            backscatter = 0.2 * self._spectrum * np.ones((n, 1))
+            noise = self.rng.normal(0, 10, (n, 2 * len(AS7265X_BANDS)))
+            bands = np.round(np.hstack((ambient, backscatter)) + noise)
+            for i, band in enumerate(AS7265X_BANDS):
+                columns[f"A{band}"] = bands[:, i]
+                columns[f"B{band}"] = bands[:, len(AS7265X_BANDS) + i]
+
+        return np.column_stack([columns[h] for h in self.headers])
+
+    def _noisy_sinusoid(self, t, mu, amp, freq):
+        sinusoid = amp * np.sin(2 * np.pi * freq * t)
+        noise = self.rng.normal(0, amp / 2, len(t))
+        return np.round(mu + sinusoid + noise)
+
+    def lines(self, n: int) -> list[str]:
+        """The next `n` samples as DATA sentences, with any injected corruption."""
+        # Every value is a whole number, as the firmware prints them.
+        fmt = "DATA," + ",".join(["%d"] * len(self.headers))
+        lines = [fmt % tuple(row) for row in self.block(n).astype(np.int64).tolist()]
+
+        if self.corrupt_rate > 0 and lines:
+            for i in np.flatnonzero(self.rng.random(len(lines)) < self.corrupt_rate):
+                line = lines[i]
+                if self.rng.random() < 0.5:
+                    lines[i] = line[: max(6, len(line) // 2)]  # Cut off mid-line
+                else:
+                    lines[i] = line.replace(",", ",x", 1)  # Unreadable value
+                self.lines_corrupted += 1
+        return lines
+
+    def messages(self, n: int) -> list[str]:
+        """The next `n` samples framed as `$DATA,...*XX` messages.
+
+        Checksums are computed for all lines at once by XOR-reducing their
+        bytes. Some are replaced with wrong ones at `bad_checksum_rate`.
+        """
+        lines = self.lines(n)
+        if not lines:
+            return []
+        raw = np.frombuffer("".join(lines).encode("ascii"), dtype=np.uint8)
+        lengths = np.fromiter(map(len, lines), dtype=np.int64, count=len(lines))
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        checksums = np.bitwise_xor.reduceat(raw, starts)
+        if self.bad_checksum_rate > 0:
+            bad = self.rng.random(len(lines)) < self.bad_checksum_rate
+            flips = self.rng.integers(1, 256, len(lines), dtype=np.uint8)
+            checksums = np.where(bad, checksums ^ flips, checksums)
+            self.checksums_corrupted += int(bad.sum())
+        return [f"${line}*{cs:02X}" for line, cs in zip(lines, checksums.tolist())]
+
+    def headers_sentence(self) -> str:
+        return "HEADERS," + ",".join(self.headers)
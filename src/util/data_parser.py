@@ -0,0 +1,66 @@
+import numpy as np
+
+# Headers assumed for old firmware that sends READY instead of HEADERS
+LEGACY_HEADERS = [
+    "time",
+    "millis",
+    "ambient_light",
+    "backscatter",
+    "pressure",
+    "water_temp",
+    "battery",
+]
+
+
+class DataParser:
+    """Converts DATA sentences into (n_samples, n_columns) float arrays.
+
+    The column layout is compiled once from the HEADERS sentence. A batch of
+    lines is joined and converted in a single NumPy call, so the per-line
+    cost is little more than a comma count.
+    """
+
+    def __init__(self, headers=()):
+        self.set_headers(headers)
+
+    def set_headers(self, headers):
+        self.headers = list(headers)
+        self.column_index = {name: i for i, name in enumerate(self.headers)}
+        self.n_columns = len(self.headers)
+
+    def parse(self, payloads: list[str]) -> tuple[np.ndarray, list[str]]:
+        """Parses the values of DATA sentences (without the leading "DATA,").
+
+        Returns the parsed block and the payloads that did not match the
+        headers or contained non-numeric values.
+        """
+        n_commas = self.n_columns - 1
+        if n_commas < 0:
+            return np.empty((0, 0)), list(payloads)
+
+        rows = []
+        rejected = []
+        for payload in payloads:
+            if payload.count(",") == n_commas:
+                rows.append(payload)
+            else:
+                rejected.append(payload)
+
+        if not rows:
+            return np.empty((0, self.n_columns)), rejected
+
+        try:
+            values = np.array(",".join(rows).split(","), dtype=float)
+            return values.reshape(len(rows), self.n_columns), rejected
+        except ValueError:
+            pass
+
+        # Something in the batch is not a number; find it row by row.
+        good = []
+        for payload in rows:
+            try:
+                good.append([float(v) for v in payload.split(",")])
+            except ValueError:
+                rejected.append(payload)
+        block = np.array(good, dtype=float).reshape(len(good), self.n_columns)
+        return block, rejected
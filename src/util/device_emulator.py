@@ -0,0 +1,220 @@
+import argparse
+import os
+import select
+import threading
+import time
+import tty
+
+from .data_generator import DataGenerator, SCHEMAS
+from .line_framer import LineFramer
+from .xor_checksum import calculate_checksum, validate_checksum
+
+TICK = 0.005  # Seconds between writes to the port
+TX_BUFFER_BYTES = 65536  # Samples are dropped once this much is waiting to be sent
+HANDSHAKE_INTERVAL = 1.0  # Seconds between OPENOBS sentences until the host answers
+
+
+class DeviceEmulator:
+    """A sensor's firmware on the far end of a pseudo-terminal (POSIX only).
+
+    `port` is the path of the pty's slave end, which SerialCommunicator
+    opens like any serial port, so framing, checksums and the reader thread
+    are all exercised. The emulator speaks the same protocol as the logger:
+        -> $OPENOBS,<serial>*XX          when started or on reset(), then
+                                         every second until acknowledged
+        <- $OPENOBS*XX                   the GUI's acknowledgement
+        -> $SENSOR,<sensor>*XX
+        <- $SET,...*XX                   settings
+        -> $SET,SUCCESS*XX, then HEADERS,... and DATA,... lines
+
+    Bytes leave at most as fast as `baudrate` allows (10 bits per byte).
+    When samples are generated faster than that, they wait in a transmit
+    buffer like the firmware's, and are dropped once it is full. Other
+    keyword arguments (seed, gap_rate, corrupt_rate, bad_checksum_rate) go
+    to the DataGenerator; with bad checksums, data is sent as $DATA,...*XX.
+    """
+
+    def __init__(
+        self,
+        sensor: str = "VCNL4010",
+        rate_hz: float = 100.0,
+        baudrate: int = 250000,
+        serial_number: str = "000",
+        **generator_options,
+    ):
+        self.generator_options = dict(sensor=sensor, rate_hz=rate_hz, **generator_options)
+        self.generator = DataGenerator(**self.generator_options)
+        self.baudrate = baudrate
+        self.serial_number = serial_number
+        self.port = None
+        self.streaming = False
+        self.acknowledged = False  # The host has answered the handshake
+        self.samples_dropped = 0  # Samples lost to a full transmit buffer
+        self.bytes_sent = 0
+        self.received = []  # Sentences received from the host, in order
+        self.invalid_messages = 0  # Received messages with a bad checksum
+        self._master = None
+        self._slave = None
+        self._pending = bytearray()
+        self._last_written = 0  # Bytes written on the latest tick
+        self._lock = threading.Lock()  # Guards _pending
+        self._last_handshake = 0.0
+        self._stream_start = None  # When the current run's clock started
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> str:
+        """Opens the pty, starts the device thread and returns the port path."""
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)  # No echo or newline translation
+        os.set_blocking(self._master, False)
+        self.port = os.ttyname(self._slave)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.reset()
+        return self.port
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+
+    def reset(self):
+        """Restarts the handshake as the board does after a reset."""
+        self.streaming = False
+        self.acknowledged = False
+        self._send_handshake()
+
+    def _send_handshake(self):
+        # A host that opens the port later flushes what was sent before, so
+        # this is repeated from the device thread until it is answered.
+        self._last_handshake = time.perf_counter()
+        self.send_sentence(f"OPENOBS,{self.serial_number}")
+
+    def send_sentence(self, sentence: str):
+        """Queues a sentence framed with `$` and its checksum."""
+        self._send_lines([f"${sentence}*{calculate_checksum(sentence)}"])
+
+    def _send_lines(self, lines: list[str]) -> bool:
+        """Queues lines for the port. Returns False if the buffer was full."""
+        data = "".join(line + "\r\n" for line in lines).encode("ascii")
+        with self._lock:
+            if len(self._pending) + len(data) > TX_BUFFER_BYTES:
+                return False
+            self._pending += data
+        return True
+
+    def _run(self):
+        framer = LineFramer()
+        last = time.perf_counter()
+        credit = 0.0  # Bytes the link could have carried so far
+        while not self._stop.is_set():
+            readable, _, _ = select.select([self._master], [], [], TICK)
+            if readable:
+                try:
+                    data = os.read(self._master, 4096)
+                except (BlockingIOError, OSError):
+                    data = b""
+                for message in framer.feed(data):
+                    self._handle_message(message)
+
+            now = time.perf_counter()
+            handshake_due = now - self._last_handshake >= HANDSHAKE_INTERVAL
+            if not self.acknowledged and handshake_due:
+                self._send_handshake()
+            if self.streaming:
+                if self._stream_start is None:
+                    self._stream_start = now
+                due = int((now - self._stream_start) * self.generator.rate_hz)
+                n = due - self.generator.samples_generated
+                if n > 0:
+                    self._send_samples(n)
+            else:
+                self._stream_start = None
+
+            credit = min(credit + (now - last) * self.baudrate / 10, TX_BUFFER_BYTES)
+            last = now
+            self._write(credit)
+            credit -= self._last_written
+
+    def _send_samples(self, n: int):
+        generator = self.generator
+        if generator.bad_checksum_rate > 0:
+            lines = generator.messages(n)
+        else:
+            lines = generator.lines(n)
+        if not self._send_lines(lines):
+            self.samples_dropped += n
+
+    def _write(self, credit: float):
+        self._last_written = 0
+        with self._lock:
+            n = min(int(credit), len(self._pending))
+            if not n:
+                return
+            try:
+                written = os.write(self._master, self._pending[:n])
+            except (BlockingIOError, OSError):
+                return  # The host is not reading; try again next tick
+            del self._pending[:written]
+        self._last_written = written
+        self.bytes_sent += written
+
+    def _handle_message(self, message: str):
+        if not validate_checksum(message):
+            self.invalid_messages += 1  # The firmware ignores these
+            return
+        sentence = message[message.index("$") + 1 : message.rindex("*")]
+        self.received.append(sentence)
+        command = sentence.split(",", 1)[0].upper()
+        if command == "OPENOBS":
+            self.acknowledged = True
+            self.send_sentence(f"SENSOR,{self.generator.sensor}")
+        elif command == "SET":
+            self.send_sentence("SET,SUCCESS")
+            # Each run starts from the same seed and a fresh clock.
+            self.generator = DataGenerator(**self.generator_options)
+            self._stream_start = None  # No catch-up burst after a re-SET
+            self._send_lines([self.generator.headers_sentence()])
+            self.streaming = True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Emulate an OpenOBS logger on a pseudo-terminal."
+    )
+    parser.add_argument("--sensor", choices=list(SCHEMAS), default="VCNL4010")
+    parser.add_argument("--rate", type=float, default=100.0, help="samples per second")
+    parser.add_argument("--baudrate", type=int, default=250000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--gap-rate", type=float, default=0.0)
+    parser.add_argument("--corrupt-rate", type=float, default=0.0)
+    parser.add_argument("--bad-checksum-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    emulator = DeviceEmulator(
+        sensor=args.sensor,
+        rate_hz=args.rate,
+        baudrate=args.baudrate,
+        seed=args.seed,
+        gap_rate=args.gap_rate,
+        corrupt_rate=args.corrupt_rate,
+        bad_checksum_rate=args.bad_checksum_rate,
+    )
+    print(f"Emulating {args.sensor} on {emulator.start()} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator.stop()
+
+
+if __name__ == "__main__":
+    main()
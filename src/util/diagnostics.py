@@ -0,0 +1,194 @@
+import bisect
+import csv
+import functools
+import json
+import threading
+import time
+
+import numpy as np
+
+# Histogram bins from 1 us to 100 s, ten per decade
+BIN_EDGES = np.logspace(-6, 2, 81).tolist()
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """Durations in seconds, counted in fixed log-spaced bins.
+
+    Recording is one bisect and an increment, and the memory used does not
+    grow with the number of samples. Percentiles are read as the upper edge
+    of the bin they fall in, so they are accurate to within one bin (26%).
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(BIN_EDGES) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect.bisect_left(BIN_EDGES, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        counts = list(self.counts)  # May be recorded into from another thread
+        n = sum(counts)
+        if not n:
+            return float("nan")
+        i = int(np.searchsorted(np.cumsum(counts), q / 100 * n))
+        return min(BIN_EDGES[i] if i < len(BIN_EDGES) else np.inf, self.max)
+
+    def summary(self) -> dict:
+        summary = {"count": self.count}
+        for q in PERCENTILES:
+            summary[f"p{q}"] = self.percentile(q)
+        summary["mean"] = self.total / self.count if self.count else float("nan")
+        summary["max"] = self.max
+        return summary
+
+
+class Timer:
+    """Context manager that records the time spent in its block."""
+
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.record(time.perf_counter() - self.start)
+
+
+class Diagnostics:
+    """Latency histograms, event counters and gauges for each pipeline stage.
+
+    Stages are created on first use, from any thread. Counters only ever
+    increase; `snapshot` turns them into rates over the time since the
+    previous snapshot. Gauges are functions read at snapshot time, such as
+    the depth of the data queue.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self._lock = threading.Lock()  # Guards creating stages and counters
+        self._last_totals = {}
+        self._last_snapshot = time.perf_counter()
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(stage, LatencyHistogram())
+        return histogram
+
+    def timer(self, stage: str) -> Timer:
+        return Timer(self.histogram(stage))
+
+    def record(self, stage: str, seconds: float):
+        self.histogram(stage).record(seconds)
+
+    def count(self, counter: str, n: int = 1):
+        # Lock-free; an increment racing with another thread can be lost.
+        try:
+            self.counters[counter] += n
+        except KeyError:
+            with self._lock:
+                self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def add_gauge(self, name: str, read):
+        self.gauges[name] = read
+
+    def reset(self):
+        with self._lock:
+            for histogram in self.histograms.values():
+                histogram.reset()
+            self.counters = {}
+            self._last_totals = {}
+            self._last_snapshot = time.perf_counter()
+
+    def snapshot(self) -> dict:
+        """Current values of every stage, counter and gauge."""
+        now = time.perf_counter()
+        elapsed = max(now - self._last_snapshot, 1e-9)
+        counters = {}
+        for name, total in list(self.counters.items()):
+            rate = (total - self._last_totals.get(name, 0)) / elapsed
+            counters[name] = {"total": total, "per_second": rate}
+        self._last_totals = {name: c["total"] for name, c in counters.items()}
+        self._last_snapshot = now
+
+        gauges = {}
+        for name, read in list(self.gauges.items()):
+            try:
+                gauges[name] = read()
+            except Exception:
+                gauges[name] = None  # Its source went away, e.g. a closed port
+        return {
+            "time": time.time(),
+            "stages": {
+                name: histogram.summary()
+                for name, histogram in sorted(self.histograms.items())
+            },
+            "counters": counters,
+            "gauges": gauges,
+        }
+
+    def export_json(self, file_path: str, snapshot: dict = None):
+        snapshot = snapshot or self.snapshot()
+        snapshot["bin_edges"] = BIN_EDGES
+        snapshot["histograms"] = {
+            name: list(h.counts) for name, h in sorted(self.histograms.items())
+        }
+        with open(file_path, "w") as json_file:
+            json.dump(snapshot, json_file, indent=4)
+
+    def export_csv(self, file_path: str, snapshot: dict = None):
+        """Writes one row per stage, counter and gauge, with times in seconds."""
+        snapshot = snapshot or self.snapshot()
+        stats = ["count"] + [f"p{q}" for q in PERCENTILES] + ["mean", "max"]
+        with open(file_path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["kind", "name"] + stats + ["total", "per_second", "value"])
+            for name, summary in snapshot["stages"].items():
+                row = [summary[s] for s in stats]
+                writer.writerow(["stage", name] + row + ["", "", ""])
+            for name, counter in snapshot["counters"].items():
+                row = [""] * len(stats) + [counter["total"], counter["per_second"], ""]
+                writer.writerow(["counter", name] + row)
+            for name, value in snapshot["gauges"].items():
+                writer.writerow(["gauge", name] + [""] * (len(stats) + 2) + [value])
+
+
+# Shared by the reader thread, the GUI and the plots
+diagnostics = Diagnostics()
+
+
+def timed(stage: str):
+    """Decorator recording the duration of every call under `stage`."""
+
+    def decorate(function):
+        histogram = diagnostics.histogram(stage)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.record(time.perf_counter() - start)
+
+        return wrapper
+
+    return decorate
@@ -0,0 +1,200 @@
+import io
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+
+class DataFileWriter:
+    """Writes log rows to disk from a background thread.
+
+    Rows are handed over through a bounded queue so the caller never waits on
+    disk I/O. The writer thread batches everything that is waiting into a
+    single write and flushes (optionally with fsync) every `flush_rows` rows or
+    `flush_interval` seconds, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        error_callback=None,
+        max_queue: int = 1000,
+        flush_rows: int = 1000,
+        flush_interval: float = 5.0,
+        fsync: bool = False,
+        buffer_size: int = 1 << 20,
+    ):
+        self.file_path = file_path
+        self.error_callback = error_callback
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+
+        self._file = open(file_path, "w", buffering=buffer_size)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._pending_rows = 0
+        self._lock = threading.Lock()
+        self.rows_written = 0  # Sample rows from write_block; not header lines
+        self.rows_dropped = 0
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write_line(self, line: str) -> bool:
+        """Queues a single line. See write_lines."""
+        return self.write_lines([line])
+
+    def write_block(self, block: np.ndarray) -> bool:
+        """Queues a (n_samples, n_columns) array of samples.
+
+        The array is formatted on the writer thread, so it must not be modified
+        after it is queued.
+        """
+        return self.write_lines(block)
+
+    def write_lines(self, lines) -> bool:
+        """Queues rows for writing without blocking.
+
+        `lines` is a list of strings or a 2D array of samples. Returns False if
+        the queue is full and the rows had to be dropped.
+        """
+        if len(lines) == 0:
+            return True
+        try:
+            self._queue.put_nowait(lines)
+        except queue.Full:
+            with self._lock:
+                self.rows_dropped += len(lines)
+            return False
+        with self._lock:
+            self._pending_rows += len(lines)
+        return True
+
+    def count_dropped(self, n_rows: int):
+        """Counts rows the caller had to discard, so they show in rows_dropped."""
+        with self._lock:
+            self.rows_dropped += n_rows
+
+    @property
+    def backlog(self) -> int:
+        """Number of rows queued but not yet written."""
+        return self._pending_rows
+
+    @property
+    def closed(self) -> bool:
+        """True once the writer thread has written everything and closed the file."""
+        return not self._thread.is_alive()
+
+    def close(self, timeout: float = 5.0):
+        """Writes out everything that is queued, then closes the file.
+
+        Waits up to `timeout` seconds for the writer thread, so don't call this
+        from a GUI thread; see `closed` for whether it finished.
+        """
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+
+    def _run(self):
+        rows_since_flush = 0
+        last_flush = time.monotonic()
+        running = True
+
+        while running:
+            wait = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                batches = [self._queue.get(timeout=wait)]
+            except queue.Empty:
+                batches = []
+
+            # Take whatever else is waiting so it goes out in one write.
+            while True:
+                try:
+                    batches.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if any(b is None for b in batches):
+                running = False
+                batches = [b for b in batches if b is not None]
+
+            n_rows = 0
+            n_samples = 0
+            try:
+                if batches:
+                    chunk = []
+                    for lines in batches:
+                        chunk.extend(format_rows(lines))
+                        n_rows += len(lines)
+                        if isinstance(lines, np.ndarray):
+                            n_samples += len(lines)
+                    chunk.append("")  # Trailing newline after the final row
+                    self._file.write("\n".join(chunk))
+
+                rows_since_flush += n_rows
+                now = time.monotonic()
+                if rows_since_flush and (
+                    not running
+                    or rows_since_flush >= self.flush_rows
+                    or now - last_flush >= self.flush_interval
+                ):
+                    self._file.flush()
+                    if self.fsync:
+                        os.fsync(self._file.fileno())
+                    rows_since_flush = 0
+                    last_flush = now
+                elif not rows_since_flush:
+                    last_flush = now
+            except (IOError, OSError) as e:
+                self._report_error(f"File logging error: {e}")
+
+            with self._lock:
+                self._pending_rows -= n_rows
+                self.rows_written += n_samples
+
+        try:
+            self._file.close()
+        except (IOError, OSError) as e:
+            self._report_error(f"Error closing log file: {e}")
+
+    def _report_error(self, message: str):
+        if self.error_callback:
+            self.error_callback(message)
+
+
+def check_log_file(file_path: str, max_problems: int = 10) -> list[str]:
+    """Reads a log file back and lists what is wrong with it: rows before the
+    first header line, or rows whose width differs from the header above them.
+
+    A header line is one whose first value is not a number.
+    """
+    problems = []
+    n_columns = None
+    with open(file_path) as log_file:
+        for number, line in enumerate(log_file, 1):
+            values = line.rstrip("\n").split(",")
+            try:
+                float(values[0])
+            except ValueError:
+                n_columns = len(values)  # A header starts a new section
+                continue
+            if n_columns is None:
+                problems.append(f"Line {number}: data before the first header")
+            elif len(values) != n_columns:
+                problems.append(
+                    f"Line {number}: {len(values)} values under a header of "
+                    f"{n_columns} columns"
+                )
+            if len(problems) >= max_problems:
+                break
+    return problems
+
+
+def format_rows(lines) -> list[str]:
+    """Returns text rows, formatting arrays of samples as comma-separated values."""
+    if isinstance(lines, np.ndarray):
+        text = io.StringIO()
+        np.savetxt(text, lines, fmt="%.15g", delimiter=",")
+        return text.getvalue().splitlines()
+    return lines
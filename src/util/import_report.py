@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+# "import time: <self us> | <cumulative us> | <indent><module>"
+LINE_PATTERN = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module: str) -> list[dict]:
+    """What `python -X importtime` reports for importing `module`, one entry
+    per module in import order. Runs a fresh interpreter in the src directory,
+    so nothing is cached from this process."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1:]
+        raise ImportError(f"Could not import {module}: {''.join(error)}")
+
+    times = []
+    for line in completed.stderr.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            times.append(
+                {
+                    "module": name,
+                    "depth": len(indent) // 2,
+                    "self": int(self_us) / 1e6,
+                    "cumulative": int(cumulative_us) / 1e6,
+                }
+            )
+    return times
+
+
+def total_time(times: list[dict]) -> float:
+    """Seconds spent importing, counting each top-level import once."""
+    return sum(entry["cumulative"] for entry in times if entry["depth"] == 0)
+
+
+def format_report(module: str, times: list[dict], top: int = 20) -> str:
+    lines = [f"Importing {module} took {total_time(times) * 1000:.1f} ms"]
+    lines.append(f"{len(times)} modules were imported.")
+    for title, key in (("Cumulative", "cumulative"), ("Self", "self")):
+        lines.append(f"\n{title} time (ms), largest first:")
+        for entry in sorted(times, key=lambda e: e[key], reverse=True)[:top]:
+            lines.append(f"{entry[key] * 1000:10.1f}  {entry['module']}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report what importing a module costs (python -X importtime)."
+    )
+    parser.add_argument("modules", nargs="*", default=["main"])
+    parser.add_argument("--top", type=int, default=20, help="modules listed")
+    parser.add_argument("--json", help="also write every module's times here")
+    args = parser.parse_args()
+
+    report = {}
+    for module in args.modules:
+        times = import_times(module)
+        report[module] = {"total": total_time(times), "modules": times}
+        print(format_report(module, times, args.top) + "\n")
+
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(report, json_file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+class LineFramer:
+    """Splits a raw byte stream into newline-terminated lines.
+
+    Incoming bytes are copied into a preallocated bytearray and scanned once for
+    line endings, so framing cost is proportional to the bytes received rather
+    than to the size of the pending buffer.
+    """
+
+    def __init__(self, size: int = 65536):
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+        self._end = 0  # Number of valid bytes in the buffer
+        self._scanned = 0  # Bytes already searched for a newline
+        self.overflows = 0  # Lines discarded because they exceeded the buffer
+
+    def feed(self, data: bytes) -> list[str]:
+        """Appends received bytes and returns any complete lines."""
+        lines = []
+        offset = 0
+        while offset < len(data):
+            free = len(self._buffer) - self._end
+            if free == 0:
+                # A single line larger than the buffer is garbage; drop it.
+                self._end = 0
+                self._scanned = 0
+                self.overflows += 1
+                free = len(self._buffer)
+            n = min(free, len(data) - offset)
+            self._view[self._end : self._end + n] = data[offset : offset + n]
+            self._end += n
+            offset += n
+            self._extract_lines(lines)
+        return lines
+
+    def _extract_lines(self, lines: list[str]):
+        start = 0
+        find = self._buffer.find
+        idx = find(b"\n", self._scanned, self._end)
+        while idx != -1:
+            line = self._buffer[start:idx].decode("ascii", errors="ignore").strip()
+            if line:
+                lines.append(line)
+            start = idx + 1
+            idx = find(b"\n", start, self._end)
+
+        # Move the incomplete tail to the front of the buffer.
+        remaining = self._end - start
+        if start and remaining:
+            self._view[:remaining] = self._view[start : self._end]
+        self._end = remaining
+        self._scanned = remaining
+
+    def clear(self):
+        """Discards any partially received line."""
+        self._end = 0
+        self._scanned = 0
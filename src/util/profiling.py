@@ -0,0 +1,240 @@
+import cProfile
+import datetime
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+
+REPORT_LINES = 40  # Functions or allocation sites listed in each report
+DETACH_TIMEOUT = 2.0  # Seconds to wait for other threads to stop profiling
+# From Python 3.12 cProfile hooks every thread and only one can be enabled
+PROCESS_WIDE = sys.version_info >= (3, 12)
+TRACEMALLOC_FRAMES = 25  # Stack depth kept for each allocation
+# Allocations made by the tools themselves are left out of memory reports
+MEMORY_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+def _timestamp() -> str:
+    return datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+class ProfileSession:
+    """cProfile over several threads, started and stopped on demand.
+
+    Up to Python 3.11 a cProfile.Profile only sees the thread that enabled
+    it, so each thread taking part calls `attach` from its own loop and gets
+    its own profile. From 3.12 on, cProfile is process-wide and only one can
+    be enabled at a time, so a single profile covers every thread and
+    `attach` does nothing. Outside a session `attach` is a single attribute
+    check. When the session stops, every profile is saved as a .prof file,
+    plus a text report of them all.
+    """
+
+    def __init__(self):
+        self.active = False
+        self.started = None
+        self._session = 0  # Incremented for every session
+        self._profiles = []  # (thread name, profile) of the current session
+        self._threads = {}  # id of each per-thread profile -> its thread
+        self._enabled = set()  # ids of profiles not yet disabled by their thread
+        self._errors = []  # Threads that could not be profiled, for the report
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Starts a session and profiles the calling thread, or every thread.
+
+        Raises ValueError if another profiler or debugger is already active.
+        """
+        if self.active:
+            return
+        with self._lock:
+            self._session += 1
+            self._profiles = []
+            self._threads = {}
+            self._errors = []
+        if PROCESS_WIDE:
+            profile = cProfile.Profile()
+            profile.enable()  # Raises if another tool holds the hook
+            self._profiles.append(("All threads", profile))
+            self._enabled.add(id(profile))
+        self.started = datetime.datetime.now()
+        self.active = True
+        self.attach()
+
+    def attach(self):
+        """Starts or stops profiling the calling thread to match the session.
+
+        Never raises, since it runs in the loops of worker threads; a thread
+        that cannot be profiled is noted in the report instead.
+        """
+        if PROCESS_WIDE:
+            return
+        current = getattr(self._local, "profile", None)
+        if current is None and not self.active:
+            return
+        if current is not None and (not self.active or current[0] != self._session):
+            if current[1] is not None:
+                current[1].disable()
+                with self._lock:
+                    self._enabled.discard(id(current[1]))
+            self._local.profile = current = None
+        if current is None and self.active:
+            thread = threading.current_thread()
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as e:
+                with self._lock:
+                    self._errors.append(f"{thread.name} could not be profiled: {e}")
+                self._local.profile = (self._session, None)  # Don't retry
+                return
+            with self._lock:
+                self._profiles.append((thread.name, profile))
+                self._threads[id(profile)] = thread
+                self._enabled.add(id(profile))
+            self._local.profile = (self._session, profile)
+
+    def _still_running(self) -> list:
+        """Per-thread profiles whose live thread has not detached yet."""
+        with self._lock:
+            return [
+                id(profile)
+                for _, profile in self._profiles
+                if id(profile) in self._enabled
+                and id(profile) in self._threads
+                and self._threads[id(profile)].is_alive()
+            ]
+
+    def stop(self, directory: str) -> list[str]:
+        """Ends the session and saves the results. Returns the files written."""
+        if not self.active:
+            return []
+        self.active = False
+        if PROCESS_WIDE:
+            for _, profile in self._profiles:
+                profile.disable()
+                self._enabled.discard(id(profile))
+        self.attach()
+        # Other threads detach on their next loop; a finished one is done anyway.
+        deadline = time.perf_counter() + DETACH_TIMEOUT
+        while self._still_running() and time.perf_counter() < deadline:
+            time.sleep(0.05)
+
+        os.makedirs(directory, exist_ok=True)
+        stamp = _timestamp()
+        stopped = datetime.datetime.now()
+        report = io.StringIO()
+        report.write(f"Profiled from {self.started:%Y-%m-%d %H:%M:%S} ")
+        report.write(f"to {stopped:%Y-%m-%d %H:%M:%S} ")
+        report.write(f"({(stopped - self.started).total_seconds():.1f} s)\n")
+
+        paths = []
+        still_running = self._still_running()
+        with self._lock:
+            profiles = list(self._profiles)
+            errors = list(self._errors)
+        for error in errors:
+            report.write(f"\n{error}\n")
+        for thread_name, profile in profiles:
+            if id(profile) in still_running:
+                report.write(f"\n{thread_name} was still running and is left out.\n")
+                continue
+            if not profile.getstats():
+                report.write(f"\n{thread_name} recorded no calls.\n")
+                continue
+            safe_name = re.sub(r"[^\w-]+", "_", thread_name).strip("_")
+            path = os.path.join(directory, f"profile_{stamp}_{safe_name}.prof")
+            stats = pstats.Stats(profile, stream=report)
+            stats.dump_stats(path)
+            paths.append(path)
+            report.write(f"\n===== {thread_name} =====\n")
+            stats.sort_stats("cumulative").print_stats(REPORT_LINES)
+
+        path = os.path.join(directory, f"profile_{stamp}.txt")
+        with open(path, "w") as report_file:
+            report_file.write(report.getvalue())
+        paths.append(path)
+        return paths
+
+
+class MemorySnapshots:
+    """tracemalloc snapshots, each compared with the previous and the first.
+
+    Tracing starts with the first snapshot, so only memory allocated after
+    it is counted. Each snapshot is dumped next to its text report and can
+    be loaded again with tracemalloc.Snapshot.load.
+    """
+
+    def __init__(self):
+        self.first = None
+        self.previous = None
+        self.count = 0
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def take(self, directory: str) -> list[str]:
+        """Saves a snapshot and its report. Returns the files written."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self.first = self.previous = None
+        snapshot = tracemalloc.take_snapshot().filter_traces(MEMORY_FILTERS)
+        current, peak = tracemalloc.get_traced_memory()
+        self.count += 1
+
+        os.makedirs(directory, exist_ok=True)
+        stamp = _timestamp()
+        dump_path = os.path.join(directory, f"memory_{stamp}.tracemalloc")
+        snapshot.dump(dump_path)
+
+        report = io.StringIO()
+        report.write(f"Memory snapshot {self.count} at {datetime.datetime.now()}\n")
+        report.write(f"Traced: {current / 2**20:.1f} MiB ")
+        report.write(f"(peak {peak / 2**20:.1f} MiB)\n")
+        top = snapshot.statistics("lineno")
+        self._write_top(report, "Largest allocation sites", top)
+        if self.previous is not None:
+            diff = snapshot.compare_to(self.previous, "lineno")
+            self._write_top(report, "Change since the previous snapshot", diff)
+        if self.first is not None and self.first is not self.previous:
+            diff = snapshot.compare_to(self.first, "traceback")
+            title = "Change since the first snapshot"
+            self._write_top(report, title, diff, REPORT_LINES // 4)
+            # Full stack of the site that grew the most, the likeliest leak
+            if diff:
+                report.write("\nTraceback of the largest growth:\n")
+                report.write("\n".join(diff[0].traceback.format()) + "\n")
+
+        report_path = os.path.join(directory, f"memory_{stamp}.txt")
+        with open(report_path, "w") as report_file:
+            report_file.write(report.getvalue())
+
+        self.previous = snapshot
+        if self.first is None:
+            self.first = snapshot
+        return [report_path, dump_path]
+
+    def stop(self):
+        """Stops tracing and forgets the snapshots."""
+        tracemalloc.stop()
+        self.first = self.previous = None
+
+    @staticmethod
+    def _write_top(report, title: str, statistics: list, n: int = REPORT_LINES):
+        report.write(f"\n{title}:\n")
+        for statistic in statistics[:n]:
+            report.write(f"{statistic}\n")
+
+
+# Shared so the reader thread can join a session started from the GUI
+profiler = ProfileSession()
@@ -0,0 +1,52 @@
+import time
+from tkinter import ttk
+
+
+class RenderScheduler:
+    """Draws the figure on the visible notebook tab, at most `max_fps` times a second.
+
+    Plots and calibrators keep ingesting data whether or not they are shown.
+    When their artists change they only mark themselves dirty and call
+    `request`; the scheduler renders the dirty view on the selected tab once
+    the frame interval has passed. Views on hidden tabs are drawn when their
+    tab is selected.
+    """
+
+    def __init__(self, notebook: ttk.Notebook, max_fps: float = 10.0):
+        self.notebook = notebook
+        self.max_fps = max_fps
+        self.frames = 0  # Renders done, for diagnostics
+        self._views = {}  # Tab widget path -> function returning its current view
+        self._job = None  # Pending after() call for _render
+        self._last_frame = 0.0
+        notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed, add="+")
+
+    def add(self, tab, get_view):
+        """Registers the view shown on `tab`. `get_view` returns the current one."""
+        self._views[str(tab)] = get_view
+
+    def visible_view(self):
+        get_view = self._views.get(self.notebook.select())
+        return get_view() if get_view else None
+
+    def request(self):
+        """Schedules a render of the visible view at the next allowed frame."""
+        if self._job is not None:
+            return
+        next_frame = self._last_frame + 1 / self.max_fps
+        delay_ms = max(0, int((next_frame - time.perf_counter()) * 1000))
+        self._job = self.notebook.after(delay_ms, self._render)
+
+    def _render(self):
+        self._job = None
+        view = self.visible_view()
+        if view is None or not view.dirty:
+            return
+        self._last_frame = time.perf_counter()
+        view.render()
+        self.frames += 1
+
+    def _on_tab_changed(self, event):
+        view = self.visible_view()
+        if view is not None and view.dirty:
+            self.request()
@@ -0,0 +1,89 @@
+import numpy as np
+
+
+class RingBuffer:
+    """Preallocated columnar store for the most recent sensor samples.
+
+    Each column is a contiguous row of a (n_columns, 2 * capacity) array. New
+    samples are appended after the newest one and, once the spare half is used
+    up, the last `capacity` samples are moved back to the start. Every window
+    of recent samples is therefore a contiguous slice that can be handed out as
+    a view without copying, and appending costs O(new samples) amortized.
+
+    Views are only valid until the next append; consumers should request fresh
+    views each time they run.
+    """
+
+    def __init__(self, columns: list[str] = (), capacity: int = 50000):
+        self.capacity = capacity
+        self.reset(columns)
+
+    def reset(self, columns: list[str], capacity: int = None):
+        """Discards all samples and sets up storage for a new set of columns."""
+        if capacity is not None:
+            self.capacity = capacity
+        self.columns = list(columns)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        # Left uninitialized: only [_start, _end) is ever read, and untouched
+        # pages cost no memory until samples reach them.
+        self._data = np.empty((len(self.columns), 2 * self.capacity))
+        self._start = 0
+        self._end = 0
+        self.total = 0  # Samples appended since the last reset
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __contains__(self, name: str):
+        return name in self._index
+
+    def index(self, name: str) -> int:
+        """Position of a column in the buffer."""
+        return self._index[name]
+
+    def append(self, block: np.ndarray):
+        """Appends a (n_samples, n_columns) block of samples."""
+        block = np.asarray(block, dtype=float)
+        if block.ndim != 2 or block.shape[1] != len(self.columns):
+            raise ValueError(
+                f"Expected samples with {len(self.columns)} columns, got {block.shape}"
+            )
+
+        n = len(block)
+        if n == 0:
+            return
+        self.total += n
+        if n >= self.capacity:
+            block = block[-self.capacity :]
+            n = self.capacity
+            self._start = self._end = 0
+
+        if self._end + n > self._data.shape[1]:
+            keep = min(len(self), self.capacity - n)
+            self._data[:, :keep] = self._data[:, self._end - keep : self._end]
+            self._start, self._end = 0, keep
+
+        self._data[:, self._end : self._end + n] = block.T
+        self._end += n
+        self._start = max(self._start, self._end - self.capacity)
+
+    def view(self, n: int = None) -> np.ndarray:
+        """(n_columns, n) view of the newest n samples (all samples if None)."""
+        start = self._start if n is None else max(self._start, self._end - n)
+        return self._data[:, start : self._end]
+
+    def column(self, name: str, n: int = None) -> np.ndarray:
+        """View of the newest n samples of a single column."""
+        return self.view(n)[self._index[name]]
+
+    def since(self, total: int) -> np.ndarray:
+        """View of the samples appended after the buffer held `total` samples.
+
+        Samples that have already been overwritten are not included.
+        """
+        return self.view(max(0, self.total - total))
+
+    def sample_numbers(self, n: int = None) -> np.ndarray:
+        """Running sample numbers matching `view(n)`."""
+        count = self.view(n).shape[1]
+        return np.arange(self.total - count, self.total)
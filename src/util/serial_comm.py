@@ -1,9 +1,14 @@
 import serial
 import threading
 import queue
-from tkinter import messagebox
+import time
 
 from .xor_checksum import calculate_checksum, validate_checksum
+from .line_framer import LineFramer
+from .data_parser import DataParser, LEGACY_HEADERS
+from .batch_queue import BatchQueue
+from .diagnostics import diagnostics
+from .profiling import profiler
 
 
 class SerialCommunicator:
@@ -13,21 +18,33 @@ class SerialCommunicator:
         - sentence: The message after removing the leading $ and trailing checksum
         - words: List of commands and values that comprise the sentence.
 
+    Nothing here needs a display. Errors the user has to act on, such as a
+    port that will not open, go to `error_callback(title, message)` when one
+    is given (the GUI shows a dialog) and are otherwise only logged.
     """
 
-    def __init__(self, log_callback, sentence_callback):
+    def __init__(self, log_callback, notify_callback, error_callback=None):
         self.serial_port = serial.Serial()
         self.serial_thread = None
         self.stop_thread = False
         self.log_callback = log_callback  # Function to log messages
-        self.sentence_callback = (
-            sentence_callback  # Function to process received messages
-        )
-        self.data_queue = queue.Queue()  # Thread-safe queue for incoming data
+        self.debug = False  # Only build and log raw traffic when True
+        # Called from the reader thread after a sentence is put on control_queue
+        self.notify_callback = notify_callback
+        self.error_callback = error_callback
+        self.data_queue = BatchQueue()  # Parsed (n_samples, n_columns) arrays
+        self.parser = DataParser()  # Compiled from HEADERS by the reader thread
+        # Calibrated columns appended to each parsed block (a DerivedChannels),
+        # so the log file and the GUI both get them from one computation
+        self.derived_channels = None
+        # Called on the reader thread with the headers of a HEADERS or READY
+        # sentence, before any data in the new layout is parsed
+        self.headers_callback = None
+        self.control_queue = queue.SimpleQueue()  # Non-data sentences
 
     def open_connection(self, port, baudrate=250000, timeout=0.1):
         if self.is_open:
-            messagebox.showerror("Connection Error", "Already connected to a port.")
+            self.show_error("Connection Error", "Already connected to a port.")
             return
 
         try:
@@ -44,7 +61,7 @@ class SerialCommunicator:
             self.log_callback("Attempting connection...", "center")
 
         except serial.SerialException as e:
-            messagebox.showerror("Connection Error", f"Failed to connect to {port}:{e}")
+            self.show_error("Connection Error", f"Failed to connect to {port}:{e}")
             self.log_callback(f"Failed to connect to {port}", "center", "error")
             if self.is_open:
                 self.serial_port.close()
@@ -52,11 +69,16 @@ class SerialCommunicator:
     def close_connection(self):
         """Closes the serial connection and stops the reading thread."""
         if not self.is_open:
-            messagebox.showerror("Connection Error", "Not connected to any port.")
+            self.show_error("Connection Error", "Not connected to any port.")
             return
 
         self.stop_thread = True
-        if self.serial_thread and self.serial_thread.is_alive():
+        self.data_queue.clear()  # Release a reader blocked on a full queue
+        if (
+            self.serial_thread
+            and self.serial_thread.is_alive()
+            and self.serial_thread is not threading.current_thread()
+        ):
             self.serial_thread.join(timeout=1)
         if self.is_open:
             try:
@@ -75,57 +97,133 @@ class SerialCommunicator:
         message = f"${sentence}*{calculate_checksum(sentence)}\r\n"
         try:
             self.serial_port.write(message.encode("ascii"))
-            self.log_callback(f"Sent: {message.strip()}", "right", "debug")
+            if self.debug:
+                self.log_callback(f"Sent: {message.strip()}", "right", "debug")
         except serial.SerialException as e:
             self.log_callback(f"Serial Write Error: {e}", "center", "error")
         except Exception as e:
             self.log_callback(f"Unexpected Send Error: {e}", "center", "error")
 
+    def send_settings(self, measure_interval: int, delay_start: int, sensor_words):
+        """Sends the SET sentence: the current time, the sample interval and
+        start delay in seconds, then the sensor's own settings."""
+        sentence = f"SET,{int(time.time())},{measure_interval},{int(delay_start)},"
+        self.send_serial_message(sentence + ",".join(sensor_words))
+
+    def show_error(self, title: str, message: str):
+        if self.error_callback is not None:
+            self.error_callback(title, message)
+        else:
+            self.log_callback(message, "center", "error")
+
     def read_serial_data(self):
-        """Runs in a separate thread to read data from serial port."""
-        buffer = ""
+        """Runs in a separate thread to read data from serial port.
+
+        The read blocks until at least one byte arrives or the port timeout
+        expires, so an idle connection does not spin the CPU.
+        """
+        framer = LineFramer()
         while not self.stop_thread:
             try:
+                profiler.attach()  # Join or leave a profiling session
                 if not self.serial_port.is_open:
                     break
 
-                if self.serial_port.in_waiting > 0:
-                    try:
-                        data = self.serial_port.read(
-                            self.serial_port.in_waiting
-                        ).decode("ascii", errors="ignore")
-                        buffer += data
-                    except serial.SerialException as read_err:
-                        self.log_callback(
-                            f"Serial Read Error: {read_err}", "center", "error"
-                        )
-                        self.close_connection()
-                        break
-
-                    # Process complete messages (terminated by newline)
-                    for line in buffer.split("\n")[:-1]:
-                        message = line.strip()
-                        if message:
-                            self.log_callback(message, "left", "debug")
-                            sentence = self.get_sentence(message)
-                            if sentence:
-                                if sentence.startswith("DATA"):
-                                    self.data_queue.put(sentence)
-                                elif sentence.split(',')[0].isdigit(): 
-                                    # Backwards compatibility
-                                    # If the first word is a number, treat it as a data message
-                                    self.data_queue.put("DATA," + sentence)
-                                else:
-                                    self.sentence_callback(sentence)
-
-                    buffer = buffer.split("\n")[
-                        -1
-                    ]  # Keep the remaining incomplete part
+                try:
+                    data = self.serial_port.read(max(1, self.serial_port.in_waiting))
+                except serial.SerialException as read_err:
+                    self.log_callback(
+                        f"Serial Read Error: {read_err}", "center", "error"
+                    )
+                    self.close_connection()
+                    break
+
+                if not data:
+                    continue  # Timed out with nothing received
+
+                diagnostics.count("serial.bytes", len(data))
+                # Process complete messages (terminated by newline)
+                with diagnostics.timer("serial.framing"):
+                    messages = framer.feed(data)
+                payloads = []
+                with diagnostics.timer("serial.routing"):
+                    for message in messages:
+                        payload = self.handle_message(message)
+                        if payload is not None:
+                            payloads.append(payload)
+                diagnostics.count("serial.messages", len(messages))
+                if payloads:
+                    self.queue_data(payloads)
 
             except (serial.SerialException, Exception) as e:
                 self.log_callback(f"Unexpected Read Error: {e}", "center", "error")
                 break
 
+    def handle_message(self, message: str):
+        """Routes a single framed message.
+
+        Returns the values of a data message so they can be parsed together
+        with the rest of the read. Other sentences go to the control queue.
+        """
+        if self.debug:
+            self.log_callback(message, "left", "debug")
+        sentence = self.get_sentence(message)
+        if sentence:
+            if sentence.startswith("DATA,"):
+                return sentence[5:]
+            elif sentence.split(",", 1)[0].isdigit():
+                # Backwards compatibility
+                # If the first word is a number, treat it as a data message
+                return sentence
+            else:
+                command = sentence.split(",", 1)[0].upper()
+                headers = None
+                if command == "HEADERS":
+                    headers = sentence.split(",")[1:]
+                elif command == "READY":
+                    headers = list(LEGACY_HEADERS)
+                if headers is not None:
+                    # Data after this line uses the new layout
+                    self.parser.set_headers(headers)
+                    if self.headers_callback is not None:
+                        self.headers_callback(headers)
+                # Only queue it; the GUI thread handles it when notified.
+                self.control_queue.put(sentence)
+                self.notify_callback()
+        return None
+
+    def queue_data(self, payloads: list[str]):
+        """Parses data messages into one array and queues it for the GUI."""
+        with diagnostics.timer("serial.parse"):
+            block, rejected = self.parser.parse(payloads)
+        for payload in rejected:
+            self.log_callback(f"Data does not match headers: {payload}", "center", "error")
+        diagnostics.count("serial.rows", len(block))
+        diagnostics.count("serial.rejected", len(rejected))
+        if len(block) and self.derived_channels is not None:
+            try:
+                with diagnostics.timer("serial.derive"):
+                    block = self.derived_channels.apply(block)
+            except ValueError:
+                # Calibrations were rebound to other headers; nothing matches
+                self.log_callback(
+                    f"Dropped {len(block)} samples that do not match the "
+                    "calibrated columns.",
+                    "center",
+                    "error",
+                )
+                diagnostics.count("serial.rejected", len(block))
+                block = block[:0]
+        if len(block):
+            # Includes writing to the log file and waiting on a full queue
+            with diagnostics.timer("queue.put"):
+                self.data_queue.put(block)
+        # One line per read, not per row; debug mode logs every raw message.
+        if len(payloads) > 1:
+            self.log_callback(f"{payloads[-1]} (+{len(payloads) - 1} more)", "left")
+        elif payloads:
+            self.log_callback(payloads[0], "left")
+
     def get_sentence(self, message: str) -> list[str]:
         sentence = []
         try:
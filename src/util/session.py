@@ -0,0 +1,206 @@
+import threading
+
+from .file_writer import DataFileWriter
+from calibrators.derived_channels import DerivedChannels
+
+
+class LoggerSession:
+    """The device protocol and file logging of one connection, without a GUI.
+
+    Answers the control sentences, keeps track of the sensor and its columns,
+    sends settings and logs every parsed row to the open file. OpenOBSApp and
+    the headless runner share it and react to events through the callbacks
+    below, which run on whichever thread calls `process_control_queue`.
+
+    New headers take effect on the reader thread, so the file's header line
+    is always written before the first row in the new layout.
+    """
+
+    def __init__(self, ser_com, log_callback):
+        self.log_callback = log_callback  # log_callback(message, justification, tag)
+        # Handlers for control sentences, keyed by their first word
+        self.control_handlers = {
+            "OPENOBS": self.on_openobs,
+            "SENSOR": self.on_sensor,
+            "READY": self.on_sensor,
+            "SET": self.on_set,
+            "FILE": self.on_file,
+            "HEADERS": self.on_headers,
+            "SDINIT": self.on_sd_init,
+            "CLKINIT": self.on_clock_init,
+        }
+        self.connected = False  # Set once the device handshake is received
+        self.serial_number = None
+        self.sensor_type = None
+        self.data_headers = []
+        self.columns = []  # The headers plus the calibrated columns derived from them
+        self.derived_channels = DerivedChannels()  # Loaded calibration models
+
+        self.log_file_writer = None
+        # Held while the file columns change, since rows are written from the reader
+        self.file_lock = threading.Lock()
+
+        # Called with the serial number, the sensor type, nothing and the new
+        # columns respectively
+        self.handshake_callback = lambda serial_number: None
+        self.sensor_callback = lambda sensor_type: None
+        self.settings_callback = lambda: None
+        self.columns_callback = lambda columns: None
+
+        self.attach(ser_com)
+
+    def attach(self, ser_com):
+        """Uses `ser_com` from now on and logs the rows its reader parses,
+        with the calibrated columns it appends."""
+        self.ser_com = ser_com
+        ser_com.derived_channels = self.derived_channels
+        ser_com.headers_callback = self.switch_headers
+        ser_com.data_queue.tap = self.write_rows_to_file
+
+    def log_text(self, message: str, justification: str = "left", tag: str = None):
+        self.log_callback(message, justification, tag)
+
+    def log_error(self, message):
+        self.log_text(message, "center", "error")
+
+    def process_control_queue(self):
+        """Handles every control sentence queued by the reader thread."""
+        control_queue = self.ser_com.control_queue
+        while not control_queue.empty():
+            self.process_received_sentence(control_queue.get())
+
+    def process_received_sentence(self, sentence: str):
+        """Processes a complete message received from the serial port."""
+        parts = sentence.split(",")
+
+        command = parts[0].upper()  # Make comparison case-insensitive
+        handler = self.control_handlers.get(command)
+        if handler is not None:
+            handler(command, parts)
+        else:
+            self.log_error(f"Unknown serial message {sentence}")
+
+    def on_openobs(self, command, parts):
+        # Send acknowledgment back to the datalogger immediately
+        self.ser_com.send_serial_message("OPENOBS")
+
+        # Device sends serial number as handshake (Ex. $OPENOBS,446*50)
+        self.connected = True  # Confirm connection on valid OPENOBS
+        self.serial_number = parts[1].strip() if len(parts) > 1 else None
+        self.log_text("Device handshake received.", "center")
+        self.handshake_callback(self.serial_number)
+
+    def on_sensor(self, command, parts):
+        # Device sends sensor configuration type after handshake.
+        if command == "READY":
+            # For backwards compatibility
+            # The reader has switched to the legacy headers already
+            self.sensor_type = "VCNL4010"
+            self.columns_callback(self.columns)
+        else:
+            self.sensor_type = parts[1].strip()
+
+        self.log_text(f"Sensor configured: {self.sensor_type}", "center")
+        self.sensor_callback(self.sensor_type)
+
+    def on_set(self, command, parts):
+        if len(parts) > 1 and parts[1].upper() == "SUCCESS":
+            # Device sends $SET,SUCCESS*2D after receiving valid settings
+            self.log_text("Settings Received Successfully", "center")
+            self.settings_callback()
+        else:
+            self.log_error(f"Unknown serial message {','.join(parts)}")
+
+    def on_file(self, command, parts):
+        if len(parts) > 1 and parts[1].upper() == "OPEN":
+            # Device sends $FILE,OPEN,FILENAME.TXT*XX
+            filename = parts[2] if len(parts) > 2 else "UNKNOWN"
+            self.log_text(f"Logging to ({filename}) ", "center")
+            self.log_text("--- Sample Readings ---", "center")
+        else:
+            self.log_error(f"Unknown serial message {','.join(parts)}")
+
+    def on_headers(self, command, parts):
+        # The reader has switched to these headers already
+        self.log_text(f"Headers: {', '.join(parts[1:])}", "center")
+        self.columns_callback(self.columns)
+
+    # Handle potential error messages
+    def on_sd_init(self, command, parts):
+        if len(parts) > 1 and parts[1] == "0":
+            self.log_error("SD Card Error: Initialization failed!")
+            self.log_error("Check for missing or corrupted SD card.")
+        else:
+            self.log_error(f"Unknown serial message {','.join(parts)}")
+
+    def on_clock_init(self, command, parts):
+        if len(parts) > 1 and parts[1] == "0":
+            self.log_error("RTC Error: Clock initialization failed!")
+        else:
+            self.log_error(f"Unknown serial message {','.join(parts)}")
+
+    def send_settings(self, measure_interval: int, delay_start: int, sensor_words):
+        self.ser_com.send_settings(measure_interval, delay_start, sensor_words)
+        self.log_text("Settings sent, awaiting confirmation...", "center")
+
+    def switch_headers(self, headers: list[str]):
+        """Uses new sensor headers. Runs on the reader thread, before it
+        parses any data in the new layout."""
+        with self.file_lock:
+            self.data_headers = list(headers)
+            self._bind_columns()
+
+    def set_data_columns(self):
+        """Starts a new section of the log file after the calibrations change."""
+        with self.file_lock:
+            self._bind_columns()
+        self.columns_callback(self.columns)
+
+    def _bind_columns(self):
+        """Sets the columns from the headers and calibrations, and writes them
+        to the log file. Call with file_lock held."""
+        derived = self.derived_channels.bind(self.data_headers)
+        self.columns = self.data_headers + derived
+        if self.log_file_writer:
+            self.log_file_writer.write_line(",".join(self.columns))
+
+    def start_file_logging(self, file_path: str, **options) -> DataFileWriter:
+        """Logs every row to `file_path` from now on, after the current columns.
+
+        `options` are passed to DataFileWriter. Raises IOError if the file
+        cannot be opened.
+        """
+        writer = DataFileWriter(file_path, self.log_error, **options)
+        with self.file_lock:
+            if self.columns:
+                writer.write_line(",".join(self.columns))
+            self.log_file_writer = writer
+        return writer
+
+    def stop_file_logging(self) -> DataFileWriter:
+        """Stops logging to the file and returns its writer, if any, for the
+        caller to close."""
+        with self.file_lock:
+            writer = self.log_file_writer
+            self.log_file_writer = None
+        return writer
+
+    def write_rows_to_file(self, block):
+        """Logs every parsed row, before any are dropped or decimated for display.
+
+        Runs on the reader thread.
+        """
+        with self.file_lock:
+            writer = self.log_file_writer
+            if writer is None:
+                return
+            if block.shape[1] != len(self.columns):
+                # Derived from calibrations that were rebound meanwhile
+                writer.count_dropped(len(block))
+                self.log_error(
+                    f"File logging error: {len(block)} rows do not match the "
+                    "file columns, rows dropped."
+                )
+                return
+            if not writer.write_block(block):
+                self.log_error("File logging error: writer queue full, rows dropped.")
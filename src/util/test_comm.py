@@ -1,46 +1,73 @@
 import threading
-import queue
 import time
+
 import numpy as np
-from tkinter import messagebox
 
+from .serial_comm import SerialCommunicator
+from .data_generator import DataGenerator
+from .xor_checksum import calculate_checksum
+from .profiling import profiler
+
+SEND_INTERVAL = 0.01  # Seconds between blocks sent by the background thread
 
-class TestCommunicator:
-    """This class is used for serial comms using NMEA-style messages.
-    Throughout this class, the following definitions are used:
-        - message: Complete string sent through serial
-        - sentence: The message without the leading $ and trailing checksum
-        - words: List of commands and values that comprise the sentence.
 
+class TestCommunicator(SerialCommunicator):
+    """Stands in for a sensor, answering the handshake and generating data.
+
+    Everything it "receives" goes through the same handle_message and
+    queue_data path as bytes read from a serial port. Data comes from a
+    DataGenerator in blocks of however many samples are due, so rates of
+    tens of kHz are possible. Besides the generator's gaps and corrupt
+    lines, the sender can stall for `burst_seconds` at `burst_rate` stalls
+    per second and then deliver everything it held back at once.
     """
 
-    def __init__(self, log_callback, sentence_callback):
-        self.is_open = False
-        self.log_callback = log_callback  # Function to log messages
-        self.sentence_callback = (
-            sentence_callback  # Function to process received messages
+    def __init__(
+        self,
+        log_callback,
+        notify_callback,
+        error_callback=None,
+        sensor: str = "VCNL4010",
+        rate_hz: float = 100.0,
+        seed: int = None,
+        gap_rate: float = 0.0,
+        corrupt_rate: float = 0.0,
+        bad_checksum_rate: float = 0.0,
+        burst_rate: float = 0.0,
+        burst_seconds: float = 1.0,
+    ):
+        super().__init__(log_callback, notify_callback, error_callback)
+        self._is_open = False
+        self.generator_options = dict(
+            sensor=sensor,
+            rate_hz=rate_hz,
+            seed=seed,
+            gap_rate=gap_rate,
+            corrupt_rate=corrupt_rate,
+            bad_checksum_rate=bad_checksum_rate,
         )
-        self.data_queue = queue.Queue()  # Thread-safe queue for incoming data
+        self.generator = DataGenerator(**self.generator_options)
+        self.burst_rate = burst_rate
+        self.burst_seconds = burst_seconds
         self._stop_thread = threading.Event()  # Event to stop the background thread
         self._background_thread = None  # Thread for sending periodic messages
 
     def open_connection(self, *args):
         if self.is_open:
-            messagebox.showerror("Connection Error", "Already connected to a port.")
+            self.show_error("Connection Error", "Already connected to a port.")
             return
 
-        self.is_open = True
-        self.sentence_callback("OPENOBS,000")  # Initial handshake from sensor
-        self.log_callback("OPENOBS,000", "left", "debug")
+        self._is_open = True
+        self._receive("OPENOBS,000")  # Initial handshake from sensor
         self.log_callback("Attempting connection...", "center")
 
     def close_connection(self):
         """Closes the serial connection and stops the reading thread."""
         if not self.is_open:
-            messagebox.showerror("Connection Error", "Not connected to any port.")
+            self.show_error("Connection Error", "Not connected to any port.")
             return
 
-        self.is_open = False
+        self._is_open = False
         self.stop_sending_data()  # Ensure the background thread is stopped when closing the connection
         self.log_callback("Disconnected", "center")
 
@@ -49,16 +76,15 @@ class TestCommunicator:
         if not self.is_open:
             self.log_callback("Error: Cannot send, not connected.", "center", "error")
 
-        self.log_callback(f"Sent: {sentence.strip()}", "right", "debug")
+        if self.debug:
+            self.log_callback(f"Sent: {sentence.strip()}", "right", "debug")
 
         # GUI acknowledgement in response to "OPENOBS,000" handshake
         if sentence.startswith("OPENOBS"):
-            self.sentence_callback("SENSOR,VCNL4010")
-            self.log_callback("SENSOR,VCNL4010", "left", "debug")
+            self._receive(f"SENSOR,{self.generator.sensor}")
 
         elif sentence.startswith("SET"):
-            self.sentence_callback("SET,SUCCESS")
-            self.log_callback("SET,SUCCESS", "left", "debug")
+            self._receive("SET,SUCCESS")
             time.sleep(0.1)
             self.start_sending_data()
 
@@ -68,44 +94,39 @@ class TestCommunicator:
             self.log_callback("Background thread already running.", "center", "info")
             return
 
-        start_time = time.time()  # Record the start time
-
-        def noisy_sinusoid(mu, amp, freq, t):
-            sinusoid = amp * np.sin(2 * np.pi * freq * t)
-            noise = np.random.normal(0, amp / 2)
-            return int(mu + sinusoid + noise)
-
-        def send_data():
-            # Send data headers first
-            self.sentence_callback(
-                "HEADERS,time,millis,ambient_light,backscatter,pressure,water_temp,battery"
-            )
-            while not self._stop_thread.is_set():
-                current_time = time.time()
-                elapsed_time = current_time - start_time
-                millis = int(elapsed_time * 1000)
-
-                # Generate noisy sinusoidal data for ambient_light, backscatter, pressure, and water_temp
-                ambient_light = noisy_sinusoid(1000, 100, 0.1, elapsed_time)
-                backscatter = noisy_sinusoid(1000, 100, 0.1, elapsed_time)
-                pressure = noisy_sinusoid(1000, 100, 0.1, elapsed_time)
-                water_temp = noisy_sinusoid(1000, 100, 0.1, elapsed_time)
-
-                # Generate noisy data for battery
-                battery = int(100 + np.random.normal(5))
-
-                # Format the data string
-                data_string = f"DATA,{int(current_time)},{millis},{ambient_light},{backscatter},{pressure},{water_temp},{battery}"
-
-                # Send the data string
-                self.data_queue.put(data_string)
-                time.sleep(0.01)  # Wait for 0.1 seconds
-
+        # Every run starts from the same seed and a fresh clock.
+        self.generator = DataGenerator(**self.generator_options)
         self._stop_thread.clear()
-        self._background_thread = threading.Thread(target=send_data, daemon=True)
+        self._background_thread = threading.Thread(target=self._send_data, daemon=True)
         self._background_thread.start()
         self.log_callback("Started sending data.", "center", "info")
 
+    def _send_data(self):
+        generator = self.generator
+        framed = generator.bad_checksum_rate > 0
+        rng = np.random.default_rng(generator.rng.integers(2**32))
+        self._receive(generator.headers_sentence())
+
+        start = time.perf_counter()
+        while not self._stop_thread.is_set():
+            profiler.attach()  # Join or leave a profiling session
+            if self.burst_rate and rng.random() < self.burst_rate * SEND_INTERVAL:
+                # Hold everything back, then send it in one go
+                self._stop_thread.wait(self.burst_seconds)
+
+            due = int((time.perf_counter() - start) * generator.rate_hz)
+            n = due - generator.samples_generated
+            if n > 0:
+                messages = generator.messages(n) if framed else generator.lines(n)
+                payloads = []
+                for message in messages:
+                    payload = self.handle_message(message)
+                    if payload is not None:
+                        payloads.append(payload)
+                if payloads:
+                    self.queue_data(payloads)
+            self._stop_thread.wait(SEND_INTERVAL)
+
     def stop_sending_data(self):
         """Stops the background thread that sends periodic messages."""
         if not self._background_thread or not self._background_thread.is_alive():
@@ -113,5 +134,14 @@ class TestCommunicator:
             return
 
         self._stop_thread.set()
+        self.data_queue.clear()  # Release a generator blocked on a full queue
         self._background_thread.join()
         self.log_callback("Stopped sending data.", "center", "info")
+
+    def _receive(self, sentence: str):
+        """Handles a control sentence as if the sensor had sent it."""
+        self.handle_message(f"${sentence}*{calculate_checksum(sentence)}")
+
+    @property
+    def is_open(self):
+        return self._is_open
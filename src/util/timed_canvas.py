@@ -0,0 +1,21 @@
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+from .diagnostics import diagnostics
+
+
+class TimedCanvas(FigureCanvasTkAgg):
+    """Records how long each full draw of the figure takes."""
+
+    def draw(self):
+        with diagnostics.timer("canvas.draw"):
+            super().draw()
+
+
+def make_figure(master) -> tuple[Figure, object, TimedCanvas]:
+    """Creates a figure with one axis on a canvas packed into `master`."""
+    fig = Figure()
+    ax = fig.add_subplot()
+    canvas = TimedCanvas(fig, master=master)
+    canvas.get_tk_widget().pack(fill="both", expand=True, padx=5, pady=5)
+    return fig, ax, canvas